@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+End-to-end latency benchmark
+Starts the server on each transport with the scripted UI and drives the tools
+through a real fastmcp.Client, measuring per-call latency, throughput and
+cold start time. Also reports where the startup time of a command goes.
+"""
+
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, List, Optional
+
+# Entry script of the server (not used when frozen)
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+# Seconds to wait for a server to answer its first call
+STARTUP_TIMEOUT = 60
+
+# Tools are called alternately with these arguments
+BENCH_CALLS = (
+    ("select_option", lambda i: {
+        "options": ["Option A", {"title": "Option B", "description": "With description"}, "Option C"],
+        "prompt": f"Benchmark question {i}"
+    }),
+    ("request_additional_info", lambda i: {"prompt": f"Benchmark request {i}"}),
+)
+
+
+def _server_command(transport: str, port: int) -> List[str]:
+    """Command line starting the server with the scripted UI"""
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, MAIN_SCRIPT]
+    return command + [
+        "run",
+        "--transport", transport,
+        "--ui", "scripted",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--log-level", "warning"
+    ]
+
+
+def _server_env(think_time: float) -> Dict[str, str]:
+    """Environment of the server process"""
+    env = dict(os.environ)
+    env["MCP_SCRIPTED_THINK_TIME"] = str(think_time)
+    env["MCP_SCRIPTED_THINK_TIME_JITTER"] = "0"
+    return env
+
+
+def _free_port() -> int:
+    """Ask the OS for an unused port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        values: Samples
+        p: Percentile between 0 and 100
+
+    Returns:
+        Percentile value, 0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds"""
+    return {
+        "p50": round(percentile(latencies, 50) * 1000, 3),
+        "p95": round(percentile(latencies, 95) * 1000, 3),
+        "p99": round(percentile(latencies, 99) * 1000, 3),
+        "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "max": round(max(latencies) * 1000, 3) if latencies else 0.0
+    }
+
+
+class TransportBench:
+    """Server under test for one transport"""
+
+    def __init__(self, transport: str, port: int, think_time: float):
+        """
+        Args:
+            transport: stdio, sse or streamable-http
+            port: Port for HTTP transports
+            think_time: Scripted UI think time in seconds
+        """
+        self.transport = transport
+        self.port = port
+        self.env = _server_env(think_time)
+        self.process = None
+
+    @property
+    def shared_session(self) -> bool:
+        """A stdio server serves a single session, concurrent calls share it"""
+        return self.transport == "stdio"
+
+    def client(self):
+        """New client for the server"""
+        from fastmcp import Client
+        from fastmcp.client.transports import SSETransport, StdioTransport, StreamableHttpTransport
+
+        if self.transport == "stdio":
+            command = _server_command("stdio", self.port)
+            return Client(StdioTransport(command[0], command[1:], env=self.env))
+        if self.transport == "sse":
+            return Client(SSETransport(f"http://127.0.0.1:{self.port}/sse"))
+        return Client(StreamableHttpTransport(f"http://127.0.0.1:{self.port}/mcp"))
+
+    def start(self):
+        """Start the server process (HTTP transports, the stdio client starts its own)"""
+        if self.shared_session:
+            return
+        self.process = subprocess.Popen(
+            _server_command(self.transport, self.port),
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+    def stop(self):
+        """Stop the server process"""
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    async def cold_start(self) -> float:
+        """
+        Start the server and time it until the first tool call has been answered
+
+        Returns:
+            Seconds from process start to the first answer
+        """
+        started = time.perf_counter()
+        self.start()
+        name, arguments = BENCH_CALLS[0]
+        deadline = started + STARTUP_TIMEOUT
+        while True:
+            try:
+                async with self.client() as client:
+                    await client.call_tool(name, arguments(0))
+                return time.perf_counter() - started
+            except Exception:
+                if self.process is not None and self.process.poll() is not None:
+                    raise RuntimeError(f"{self.transport} server exited with code {self.process.returncode}")
+                if time.perf_counter() > deadline:
+                    raise
+                await asyncio.sleep(0.05)
+
+    async def measure(self, calls: int, concurrency: int) -> Dict[str, Any]:
+        """
+        Run calls tool calls from concurrency workers and time each of them
+
+        Args:
+            calls: Number of tool calls
+            concurrency: Concurrent clients (concurrent calls on one session with stdio)
+
+        Returns:
+            Run statistics
+        """
+        latencies = {name: [] for name, _ in BENCH_CALLS}
+        errors = []
+        next_call = iter(range(calls))
+
+        async def worker(client):
+            for i in next_call:
+                name, arguments = BENCH_CALLS[i % len(BENCH_CALLS)]
+                call_started = time.perf_counter()
+                try:
+                    await client.call_tool(name, arguments(i))
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+                    continue
+                latencies[name].append(time.perf_counter() - call_started)
+
+        async with AsyncExitStack() as stack:
+            # Connections are set up before timing starts
+            if self.shared_session:
+                clients = [await stack.enter_async_context(self.client())] * concurrency
+            else:
+                clients = [await stack.enter_async_context(self.client()) for _ in range(concurrency)]
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(client) for client in clients))
+            wall = time.perf_counter() - started
+
+        all_latencies = [latency for values in latencies.values() for latency in values]
+        return {
+            "concurrency": concurrency,
+            "calls": calls,
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+            "wall_s": round(wall, 4),
+            "throughput_per_s": round(len(all_latencies) / wall, 2) if wall else 0.0,
+            "latency_ms": summarize(all_latencies),
+            "tools": {name: summarize(values) for name, values in latencies.items()}
+        }
+
+
+async def bench_transport(
+    transport: str,
+    calls: int,
+    concurrency: List[int],
+    think_time: float,
+    port: int = 0
+) -> Dict[str, Any]:
+    """
+    Benchmark one transport
+
+    Args:
+        transport: stdio, sse or streamable-http
+        calls: Tool calls per concurrency level
+        concurrency: Concurrency levels to run
+        think_time: Scripted UI think time in seconds
+        port: Port for HTTP transports, 0 picks a free one
+
+    Returns:
+        Cold start time and one result per concurrency level
+    """
+    bench = TransportBench(transport, port or _free_port(), think_time)
+    try:
+        cold_start = await bench.cold_start()
+        runs = [await bench.measure(calls, level) for level in concurrency]
+    finally:
+        bench.stop()
+    return {"cold_start_s": round(cold_start, 4), "runs": runs}
+
+
+def run_benchmark(
+    transports: List[str],
+    calls: int = 200,
+    concurrency: Optional[List[int]] = None,
+    think_time: float = 0.0,
+    port: int = 0,
+    label: str = "",
+    progress: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Benchmark the given transports one after another
+
+    Args:
+        transports: Transports to benchmark
+        calls: Tool calls per concurrency level
+        concurrency: Concurrency levels, [1] by default
+        think_time: Scripted UI think time in seconds
+        port: Port for HTTP transports, 0 picks a free one
+        label: Free text stored with the results, e.g. a version
+        progress: Called with a message before each transport
+
+    Returns:
+        Results, ready to be saved as JSON
+    """
+    import fastmcp
+
+    concurrency = concurrency or [1]
+    results = {
+        "label": label,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fastmcp": getattr(fastmcp, "__version__", "unknown"),
+        "params": {"calls": calls, "concurrency": concurrency, "think_time": think_time},
+        "transports": {}
+    }
+    for transport in transports:
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unsupported transport: {transport}, available: {', '.join(TRANSPORTS)}")
+        if progress:
+            progress(f"Benchmarking {transport}...")
+        results["transports"][transport] = asyncio.run(
+            bench_transport(transport, calls, concurrency, think_time, port)
+        )
+    return results
+
+
+def save_results(results: Dict[str, Any], path: str):
+    """Write results to a JSON file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Read results written by save_results"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    """Relative change, empty without a previous value"""
+    if not previous:
+        return ""
+    return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+
+def print_results(console, results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """
+    Print results as a table, with changes against an earlier run if given
+
+    Args:
+        console: Rich console
+        results: Results of run_benchmark
+        baseline: Earlier results to compare against
+    """
+    from rich.table import Table
+
+    table = Table(title=f"Benchmark {results.get('label') or ''}".strip())
+    for column in ("Transport", "Cold start (s)", "Clients", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Calls/s", "Errors"):
+        table.add_column(column, justify="left" if column == "Transport" else "right")
+
+    previous_transports = (baseline or {}).get("transports", {})
+    for transport, data in results["transports"].items():
+        previous = previous_transports.get(transport, {})
+        previous_runs = {run["concurrency"]: run for run in previous.get("runs", [])}
+        for index, run in enumerate(data["runs"]):
+            previous_run = previous_runs.get(run["concurrency"], {})
+            previous_latency = previous_run.get("latency_ms", {})
+            cold_start = ""
+            if index == 0:
+                cold_start = f"{data['cold_start_s']:.2f}{_delta(data['cold_start_s'], previous.get('cold_start_s'))}"
+            table.add_row(
+                transport if index == 0 else "",
+                cold_start,
+                str(run["concurrency"]),
+                *(f"{run['latency_ms'][p]:.2f}{_delta(run['latency_ms'][p], previous_latency.get(p))}"
+                  for p in ("p50", "p95", "p99")),
+                f"{run['throughput_per_s']:.1f}{_delta(run['throughput_per_s'], previous_run.get('throughput_per_s'))}",
+                str(run["errors"])
+            )
+    console.print(table)
+
+
+# Line written by python -X importtime: self [us] | cumulative [us] | module
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_startup(args: List[str], timeout: float = 60) -> Dict[str, Any]:
+    """
+    Run main.py with -X importtime and collect where the startup time goes.
+    stdin is closed, so run --transport stdio exits right after starting.
+
+    Args:
+        args: main.py arguments, e.g. ["run", "--transport", "stdio"]
+        timeout: Seconds after which the command is stopped
+
+    Returns:
+        Wall time, total import time, and import time per package and per
+        module imported directly by main.py, all in milliseconds
+    """
+    if getattr(sys, 'frozen', False):
+        raise RuntimeError("Import times are not available in the packaged executable")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", MAIN_SCRIPT] + args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        _, stderr = process.communicate()
+    wall = time.perf_counter() - started
+
+    packages = Counter()
+    direct = Counter()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        packages[module.split(".")[0]] += int(self_us)
+        if len(indent) == 1:
+            # Imported by main.py itself (or the interpreter startup)
+            direct[module] += int(cumulative_us)
+
+    return {
+        "args": args,
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round(sum(packages.values()) / 1000, 1),
+        "packages": {name: round(us / 1000, 1) for name, us in packages.most_common()},
+        "direct_imports": {name: round(us / 1000, 1) for name, us in direct.most_common()}
+    }
+
+
+def print_startup_report(console, report: Dict[str, Any], top: int = 15):
+    """
+    Print the result of profile_startup
+
+    Args:
+        console: Rich console
+        report: Result of profile_startup
+        top: Rows per table
+    """
+    from rich.table import Table
+
+    console.print(
+        f"[bold]main.py {' '.join(report['args'])}[/bold]: "
+        f"{report['wall_ms']:.0f} ms wall time, {report['import_ms']:.0f} ms importing modules"
+    )
+    for title, key, column in (
+        ("Import time by package (self)", "packages", "Package"),
+        ("Imports made by main.py (cumulative)", "direct_imports", "Module")
+    ):
+        table = Table(title=title)
+        table.add_column(column)
+        table.add_column("ms", justify="right")
+        table.add_column("Share", justify="right")
+        for name, ms in list(report[key].items())[:top]:
+            share = ms / report["import_ms"] * 100 if report["import_ms"] else 0
+            table.add_row(name, f"{ms:.1f}", f"{share:.0f}%")
+        console.print(table)
@@ -23,6 +23,95 @@ DEFAULT_CONFIG = {
     "ui": {
         "default_ui_type": "pyqt"
     },
+    "cli": {
+        "attach_socket": "",
+        "attach_host": "127.0.0.1",
+        "attach_port": 7889
+    },
+    "scripted": {
+        "rules_file": "",
+        "handler": "",
+        "think_time": 0.0,
+        "think_time_jitter": 0.0
+    },
+    "zygote": {
+        "socket_path": ""
+    },
+    "scheduler": {
+        "max_concurrent": 1,
+        "max_queue": 32,
+        "max_queue_per_session": 8,
+        "coalesce_identical": True
+    },
+    "broker": {
+        "ui": "pyqt",
+        "socket_path": "",
+        "host": "127.0.0.1",
+        "port": 7890,
+        "autostart": True,
+        "connect_timeout": 15.0
+    },
+    "answer_cache": {
+        "enabled": False,
+        "ttl_seconds": 86400,
+        "max_entries": 200,
+        "path": ""
+    },
+    "auto_respond": {
+        "enabled": False,
+        "rules": []
+    },
+    "web": {
+        "max_pending": 256,
+        "pending_ttl": 86400,
+        "closed_ttl": 300,
+        "max_closed": 1024
+    },
+    "deadline": {
+        "seconds": 0,
+        "policy": "error",
+        "default_option": 0,
+        "text": "The user did not answer in time, continue with your best judgement",
+        "tools": {}
+    },
+    "metrics": {
+        "enabled": True
+    },
+    "pending_store": {
+        "enabled": False,
+        "path": "",
+        "max_age": 86400,
+        "flush_interval": 0.05,
+        "reshow": True,
+        "claim_ttl": 300
+    },
+    "answer_history": {
+        "enabled": False,
+        "path": "",
+        "max_entries": 200000,
+        "suggestions": 8
+    },
+    "journal": {
+        "enabled": False,
+        "path": "",
+        "max_bytes": 10485760,
+        "backups": 3,
+        "preview_chars": 200,
+        "flush_interval": 1.0
+    },
+    "profiling": {
+        "enabled": False,
+        "directory": "",
+        "keep": 50,
+        "slow_threshold": 0.5,
+        "keep_slow": 200
+    },
+    "fanout": {
+        "channels": [
+            {"ui": "pyqt"},
+            {"ui": "web", "after": 30}
+        ]
+    },
     "logging": {
         "level": "warning"
     }
@@ -31,6 +120,22 @@ DEFAULT_CONFIG = {
 # 全局配置变量
 _config: Optional[Dict[str, Any]] = None
 
+# 加载时配置文件的版本（inode、修改时间、大小），用于检测文件被修改
+_config_version = None
+
+def _get_config_version(config_path: str):
+    """
+    获取配置文件的版本
+    
+    Returns:
+        (inode, 修改时间, 大小)，文件不存在时为 None
+    """
+    try:
+        stat = os.stat(config_path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
 def get_config_path() -> str:
     """
     获取配置文件路径
@@ -49,12 +154,13 @@ def load_config() -> Dict[str, Any]:
     Returns:
         配置字典
     """
-    global _config
+    global _config, _config_version
     
     if _config is not None:
         return _config
     
     config_path = get_config_path()
+    _config_version = _get_config_version(config_path)
     
     try:
         if os.path.exists(config_path):
@@ -77,15 +183,17 @@ def save_config(config: Dict[str, Any]) -> bool:
     
     Args:
         config: 要保存的配置字典
-        
+    
     Returns:
         是否保存成功
     """
+    global _config_version
     config_path = get_config_path()
     
     try:
         with open(config_path, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
+        _config_version = _get_config_version(config_path)
         logger.info(f"配置文件保存成功: {config_path}")
         return True
     except Exception as e:
@@ -132,6 +240,226 @@ def get_ui_config() -> Dict[str, Any]:
     config = load_config()
     return config.get("ui", DEFAULT_CONFIG["ui"])
 
+def get_cli_config() -> Dict[str, Any]:
+    """
+    获取命令行界面相关配置
+    
+    Returns:
+        命令行界面配置字典：attach 终端连接的 Unix 套接字 attach_socket（为空时使用私有目录下的默认路径），
+        不支持 Unix 套接字的平台（Windows）上改为监听 attach_host:attach_port 并校验私有目录中的密钥
+    """
+    config = load_config()
+    cli_config = dict(DEFAULT_CONFIG["cli"])
+    cli_config.update(config.get("cli", {}))
+    return cli_config
+
+# 脚本界面配置可通过环境变量覆盖，方便在 CI 和基准测试中启动的服务使用
+SCRIPTED_ENV_OVERRIDES = {
+    "rules_file": ("MCP_SCRIPTED_RULES", str),
+    "handler": ("MCP_SCRIPTED_HANDLER", str),
+    "think_time": ("MCP_SCRIPTED_THINK_TIME", float),
+    "think_time_jitter": ("MCP_SCRIPTED_THINK_TIME_JITTER", float)
+}
+
+def get_scripted_config() -> Dict[str, Any]:
+    """
+    获取脚本界面（scripted）相关配置，环境变量优先于配置文件
+    
+    Returns:
+        脚本界面配置字典
+    """
+    config = load_config()
+    scripted_config = dict(DEFAULT_CONFIG["scripted"])
+    scripted_config.update(config.get("scripted", {}))
+    for key, (env_name, convert) in SCRIPTED_ENV_OVERRIDES.items():
+        value = os.environ.get(env_name)
+        if value:
+            try:
+                scripted_config[key] = convert(value)
+            except ValueError:
+                logger.warning(f"环境变量 {env_name} 的值无效: {value}")
+    return scripted_config
+
+def get_zygote_config() -> Dict[str, Any]:
+    """
+    获取预派生守护进程（zygote）相关配置
+    
+    Returns:
+        zygote 配置字典，socket_path 为空时使用默认路径
+    """
+    config = load_config()
+    zygote_config = dict(DEFAULT_CONFIG["zygote"])
+    zygote_config.update(config.get("zygote", {}))
+    return zygote_config
+
+def get_scheduler_config() -> Dict[str, Any]:
+    """
+    获取交互调度相关配置
+    
+    Returns:
+        调度配置字典：同时显示的交互数量、等待队列总长度及每个会话的等待上限，0 表示不限制；
+        coalesce_identical 为真时，同时进行中的相同问题共用一个交互
+    """
+    config = load_config()
+    scheduler_config = dict(DEFAULT_CONFIG["scheduler"])
+    scheduler_config.update(config.get("scheduler", {}))
+    return scheduler_config
+
+def get_broker_config() -> Dict[str, Any]:
+    """
+    获取共享界面代理（broker）相关配置
+    
+    Returns:
+        broker 配置字典，socket_path 为空时使用默认路径；
+        不支持 Unix 套接字的平台（Windows）使用 host/port
+    """
+    config = load_config()
+    broker_config = dict(DEFAULT_CONFIG["broker"])
+    broker_config.update(config.get("broker", {}))
+    return broker_config
+
+def get_answer_cache_config() -> Dict[str, Any]:
+    """
+    获取回答缓存相关配置
+    
+    Returns:
+        回答缓存配置字典：启用后界面提供“记住此回答”选项，记住的回答在 ttl_seconds 内
+        直接返回给相同的问题（0 表示不过期），最多保留 max_entries 条（0 表示不限制），
+        path 为空时使用默认路径
+    """
+    config = load_config()
+    answer_cache_config = dict(DEFAULT_CONFIG["answer_cache"])
+    answer_cache_config.update(config.get("answer_cache", {}))
+    return answer_cache_config
+
+def get_auto_respond_config() -> Dict[str, Any]:
+    """
+    获取自动应答相关配置
+    
+    Returns:
+        自动应答配置字典：启用后按顺序匹配 rules，第一条适用的规则直接回答问题，不再显示界面
+    """
+    config = load_config()
+    auto_respond_config = dict(DEFAULT_CONFIG["auto_respond"])
+    auto_respond_config.update(config.get("auto_respond", {}))
+    return auto_respond_config
+
+def get_web_config() -> Dict[str, Any]:
+    """
+    获取 Web 界面请求管理相关配置
+    
+    Returns:
+        Web 配置字典：最多 max_pending 个请求同时等待（0 表示不限制），等待超过 pending_ttl 秒
+        的请求过期（0 表示不过期），已结束的请求保留 closed_ttl 秒、最多 max_closed 个，
+        用于答复迟到的提交
+    """
+    config = load_config()
+    web_config = dict(DEFAULT_CONFIG["web"])
+    web_config.update(config.get("web", {}))
+    return web_config
+
+def get_deadline_config(tool: Optional[str] = None) -> Dict[str, Any]:
+    """
+    获取回答期限相关配置
+    
+    Args:
+        tool: 工具名称，tools 中该工具的设置覆盖通用设置
+    
+    Returns:
+        期限配置字典：seconds 秒内没有回答时按 policy 结束交互（0 表示不限时）。
+        policy 为 default（选择第 default_option 个选项，文本问题返回 text）、
+        text（返回 text）或 error（返回错误）
+    """
+    config = load_config()
+    deadline_config = dict(DEFAULT_CONFIG["deadline"])
+    deadline_config.update(config.get("deadline", {}))
+    tools = deadline_config.pop("tools", {}) or {}
+    if tool is not None:
+        deadline_config.update(tools.get(tool, {}))
+    return deadline_config
+
+def get_metrics_config() -> Dict[str, Any]:
+    """
+    获取指标统计相关配置
+    
+    Returns:
+        指标配置字典：启用后记录工具调用的耗时和结果，通过 HTTP 传输的 /metrics 和 server_stats 工具提供
+    """
+    config = load_config()
+    metrics_config = dict(DEFAULT_CONFIG["metrics"])
+    metrics_config.update(config.get("metrics", {}))
+    return metrics_config
+
+def get_pending_store_config() -> Dict[str, Any]:
+    """
+    获取待处理请求存储相关配置
+    
+    Returns:
+        待处理请求存储配置字典：启用后正在显示的问题和尚未交给客户端的回答保存在 SQLite 数据库 path
+        （为空时使用默认路径）中，写入每隔 flush_interval 秒批量提交。服务重启后接管已退出进程留下的
+        记录（超过 max_age 秒的丢弃），reshow 为 true 时重新显示未回答的问题；提出该问题的同一客户端
+        在回答后 claim_ttl 秒内再次提出相同问题时直接返回其回答
+    """
+    config = load_config()
+    pending_store_config = dict(DEFAULT_CONFIG["pending_store"])
+    pending_store_config.update(config.get("pending_store", {}))
+    return pending_store_config
+
+def get_answer_history_config() -> Dict[str, Any]:
+    """
+    获取回答历史相关配置
+    
+    Returns:
+        回答历史配置字典：启用后 request_additional_info 的每组问题和回答保存在 SQLite 数据库 path
+        （为空时使用默认路径）中并建立 FTS5 全文索引，最多保留 max_entries 条（0 表示不限制），
+        PyQt、Web 和命令行界面在输入时显示最多 suggestions 条匹配的历史回答供直接使用
+    """
+    config = load_config()
+    answer_history_config = dict(DEFAULT_CONFIG["answer_history"])
+    answer_history_config.update(config.get("answer_history", {}))
+    return answer_history_config
+
+def get_journal_config() -> Dict[str, Any]:
+    """
+    获取交互日志相关配置
+    
+    Returns:
+        交互日志配置字典（默认关闭）：启用后问题、回答和界面请求以 JSONL 格式由后台线程每隔 flush_interval 秒
+        批量写入 path（为空时使用默认路径），文件超过 max_bytes 时轮转并保留 backups 个旧文件，
+        每项内容最多记录 preview_chars 个字符（0 表示不截断）
+    """
+    config = load_config()
+    journal_config = dict(DEFAULT_CONFIG["journal"])
+    journal_config.update(config.get("journal", {}))
+    return journal_config
+
+def get_profiling_config() -> Dict[str, Any]:
+    """
+    获取工具调用性能分析相关配置
+    
+    Returns:
+        性能分析配置字典：启用后（或使用 run --profile）用 cProfile 分析每次工具调用，
+        分析结果写入 directory（为空时使用默认路径），保留最新的 keep 个；事件循环线程
+        忙碌超过 slow_threshold 秒的调用写入 slow 子目录，保留 keep_slow 个
+    """
+    config = load_config()
+    profiling_config = dict(DEFAULT_CONFIG["profiling"])
+    profiling_config.update(config.get("profiling", {}))
+    return profiling_config
+
+def get_fanout_config() -> Dict[str, Any]:
+    """
+    获取多界面同时显示（fanout 界面）相关配置
+    
+    Returns:
+        fanout 配置字典：channels 中每个界面（ui）同时显示问题，第一个回答生效，
+        after 为问题仍未回答时该界面延迟加入的秒数
+    """
+    config = load_config()
+    fanout_config = dict(DEFAULT_CONFIG["fanout"])
+    fanout_config.update(config.get("fanout", {}))
+    return fanout_config
+
 def get_logging_config() -> Dict[str, Any]:
     """
     获取日志相关配置
@@ -152,3 +480,15 @@ def reload_config() -> Dict[str, Any]:
     global _config
     _config = None
     return load_config()
+
+def reload_config_if_changed() -> bool:
+    """
+    配置文件在加载后被修改时重新加载，未修改时只检查文件状态
+    
+    Returns:
+        是否重新加载了配置
+    """
+    if _config is not None and _get_config_version(get_config_path()) == _config_version:
+        return False
+    reload_config()
+    return True
@@ -5,58 +5,134 @@
 FastMCP service main program, creates server and registers tool functions
 """
 
-import asyncio
-import typer
 import enum
-import signal
 import sys
-import os
-import logging
-from fastmcp import FastMCP
-from rich.console import Console
-from rich.panel import Panel
-from dotenv import load_dotenv
-
-# Import UI modules
-from ui.ui import select_option, request_additional_info, set_ui_type
-# Import language management module
-from lang_manager import set_language
 
 # Define language type enum
 class LangType(str, enum.Enum):
     ZH_CN = "zh_CN"
     EN_US = "en_US"
 
-# Load environment variables
-load_dotenv()
+# Tools registered on the server, listed without creating it
+TOOLS_INFO = [
+    {"name": "select_option", "description": "Display a list of options to the user and let them choose by inputting numbers or providing custom answers"},
+    {"name": "ask_questions", "description": "Ask several independent selection and free text questions in one interaction and return all answers together"},
+    {"name": "request_additional_info", "description": "Request additional information from the user"},
+    {"name": "server_stats", "description": "Report tool call counts, latencies per stage and queue depth of this server (when metrics are enabled)"}
+]
+
+def print_tools():
+    """Print the available tools, uses no third-party modules so list-tools starts fast"""
+    print(f"可用工具 ({len(TOOLS_INFO)})")
+    for tool in TOOLS_INFO:
+        print(f"  {tool['name']}: {tool['description']}")
 
-# 设置FastMCP内部日志系统
-logging.basicConfig(level=logging.WARNING)
-logging.getLogger('FastMCP').setLevel(logging.WARNING)
-logging.getLogger('UI').setLevel(logging.WARNING)
+if __name__ == "__main__" and sys.argv[1:] == ["list-tools"]:
+    # Answered before the command line framework is imported
+    print_tools()
+    sys.exit(0)
+
+if __name__ == "__main__" and sys.argv[1:2] == ["stdio-shim"]:
+    # IDE entry point for stdio sessions, handed to the zygote if one is running
+    from zygote import run_shim
+    sys.exit(run_shim(sys.argv[2:]))
+
+# Every other command goes through typer, heavier modules are imported by the commands that use them
+import asyncio
+import typer
+import signal
+import os
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from rich.console import Console
+from rich.panel import Panel
 
 # Create Rich console object
 console = Console()
 
-# Create FastMCP server instance - 仅传递必要的属性，避免警告
-mcp = FastMCP(
-    name="Cursor-MCP Interaction Service",
-    description="Provides MCP service for interaction with AI tools",
-    version="1.0.0"
-)
+@asynccontextmanager
+async def lifespan(server):
+    """
+    Load the UI and start its background services on the server's event loop, and show
+    the questions an earlier server process left unanswered again.
+    Runs as tasks, so initialize is answered without waiting for the UI toolkit to be imported.
+    """
+    from ui.ui import start_ui, resume_pending, close_pending_store
+    
+    tasks = [asyncio.create_task(start_ui()), asyncio.create_task(resume_pending())]
+    try:
+        yield {}
+    finally:
+        # Questions still shown stay in the pending store, cancelling them below must not remove them
+        close_pending_store()
+        for task in tasks:
+            task.cancel()
 
-# Register tool functions
-mcp.tool()(select_option)
-mcp.tool()(request_additional_info)
+def create_server():
+    """
+    Create the FastMCP server instance and register the tool functions
+    
+    Returns:
+        FastMCP server
+    """
+    from fastmcp import FastMCP
+    from ui.ui import select_option, ask_questions, request_additional_info, server_stats, metrics_enabled
+    
+    # Create FastMCP server instance - 仅传递必要的属性，避免警告
+    mcp = FastMCP(
+        name="Cursor-MCP Interaction Service",
+        description="Provides MCP service for interaction with AI tools",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    
+    # Register tool functions
+    mcp.tool()(select_option)
+    mcp.tool()(ask_questions)
+    mcp.tool()(request_additional_info)
+    
+    # Metrics: a tool for stdio clients, /metrics (Prometheus text format) on the HTTP transports
+    if metrics_enabled():
+        from starlette.responses import PlainTextResponse
+        from ui.metrics import registry
+        
+        mcp.tool()(server_stats)
+        
+        @mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+        async def metrics_endpoint(request):
+            return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+    return mcp
 
 # Create command line application
 app = typer.Typer(help="MCPInteractive")
 
+@app.callback()
+def setup():
+    """MCPInteractive"""
+    from dotenv import load_dotenv
+    
+    # Load environment variables
+    load_dotenv()
+    
+    # 设置FastMCP内部日志系统
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('FastMCP').setLevel(logging.WARNING)
+    logging.getLogger('UI').setLevel(logging.WARNING)
+
 # For storing server instance
 server_instance = None
 
 def signal_handler(sig, frame):
     """Handle termination signals"""
+    # Write out the interaction journal and the pending store first, exit handlers may not get to run.
+    # Questions still open stay in the store, the next server process shows them again.
+    from ui import journal
+    from ui.ui import close_pending_store
+    journal.close()
+    close_pending_store()
+    
     console.print("\n[bold red]Received termination signal, shutting down service...[/bold red]")
     # If FastMCP is running, try to shut it down
     if server_instance and hasattr(server_instance, "shutdown"):
@@ -68,25 +144,55 @@ def signal_handler(sig, frame):
     # Force exit program
     sys.exit(0)
 
+def prewarm_in_background(ui: str, transport: str):
+    """
+    Initialise the UI backend in a background thread while the server starts
+    
+    Args:
+        ui: UI type, used in the readiness message
+        transport: Transport protocol, stdout is reserved for the protocol with stdio
+    """
+    from ui.ui import prewarm_ui
+    
+    # stdout carries the MCP protocol with stdio, report on stderr instead
+    report_console = Console(stderr=True) if transport == "stdio" else console
+    
+    def prewarm():
+        try:
+            elapsed = prewarm_ui()
+        except Exception as e:
+            report_console.print(f"Failed to prewarm {ui} UI: {e}", style="bold red")
+            return
+        report_console.print(f"[bold green]{ui} UI ready[/bold green] ({elapsed:.2f}s)")
+    
+    threading.Thread(target=prewarm, name="UIPrewarm", daemon=True).start()
+
 @app.command()
 def run(
     host: str = typer.Option("127.0.0.1", help="Server host address"),
     port: int = typer.Option(7888, help="Server port"),
     log_level: str = typer.Option("warning", help="Log level: debug, info, warning, error, critical"),
     transport: str = typer.Option("stdio", help="Transport protocol: simple, stdio, sse, streamable-http"),
-    ui: str = typer.Option("pyqt", help="UI type: cli, pyqt, web"),
-    lang: LangType = typer.Option(LangType.EN_US, help="Interface language: zh_CN, en_US")
+    ui: str = typer.Option("pyqt", help="UI type: cli, pyqt, web, scripted, broker, fanout"),
+    lang: LangType = typer.Option(LangType.EN_US, help="Interface language: zh_CN, en_US"),
+    prewarm: bool = typer.Option(False, help="Initialise the UI backend in the background at startup"),
+    profile: bool = typer.Option(False, help="Profile every tool call with cProfile, see profiling in config.json")
 ):
     """
     Start MCPInteractive
     """
     global server_instance
+    from ui.ui import set_ui_type, mount_ui, enable_profiling
+    from lang_manager import set_language
     
     # Register signal handlers to capture SIGINT (Ctrl+C) and SIGTERM
     # Note: On Windows, only a subset of POSIX signals are supported
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
-        # 设置日志级别
+    
+    # Create the server first, importing fastmcp configures its loggers
+    mcp = create_server()
+    # 设置日志级别
     try:
         logging_level = getattr(logging, log_level.upper())
         logging.getLogger().setLevel(logging_level)
@@ -114,16 +220,28 @@ def run(
             )
         )
     
-
+    
     logging.info("Tip: Press Ctrl+C to terminate service")
-    # Set UI type
-    set_ui_type(ui)
+    # Set UI type, the backend is loaded once the server is up
+    set_ui_type(ui, lazy=True)
     logging.info(f"Using UI type: [bold magenta]{ui}[/bold magenta]")
     
+    # HTTP transports: serve UI pages (web) from the MCP server itself
+    if transport not in ("simple", "stdio"):
+        browser_host = "127.0.0.1" if host in ("0.0.0.0", "::", "") else host
+        mount_ui(mcp, f"http://{browser_host}:{port}")
+    
     # Set interface language
     set_language(lang)
     logging.info(f"Using interface language: [bold cyan]{lang}[/bold cyan]")
     
+    if profile:
+        enable_profiling()
+    
+    # Initialise the UI backend while the server starts, so the first question opens without delay
+    if prewarm:
+        prewarm_in_background(ui, transport)
+    
     # According to documentation, use the correct mcp.run() method and transport protocol
     try:
         server_instance = mcp  # Save server instance
@@ -185,34 +303,266 @@ def run(
         console.print("3. Try the simplest startup method: --transport=simple", style="blue")
         console.print("4. Try other transport protocols: --transport=stdio|sse|streamable-http", style="blue")
 
-@app.command("list-tools")
-def list_tools():
+@app.command()
+def attach(
+    socket_path: Optional[str] = typer.Option(None, help="Attach server Unix socket, defaults to cli.attach_socket in config.json"),
+    host: str = typer.Option(None, help="Attach server host address where Unix sockets are unavailable (Windows), defaults to cli.attach_host"),
+    port: int = typer.Option(None, help="Attach server port where Unix sockets are unavailable (Windows), defaults to cli.attach_port"),
+    token: str = typer.Option(None, hidden=True, help="Answer a single question and exit (used by the server)")
+):
     """
-    List all available tools
+    Attach a persistent terminal that answers questions of a server started with --ui cli
     """
-    # Directly list implemented tools
-    tools_info = [
-        {"name": "select_option", "description": "Display a list of options to the user and let them choose by inputting numbers or providing custom answers"},
-        {"name": "request_additional_info", "description": "Request additional information from the user"}
-    ]
+    from config_manager import get_cli_config
+    from ui.broker import format_address
+    from ui.cli_attach import attach_address, run_attach_client
+    
+    cli_config = get_cli_config()
+    if socket_path:
+        address = socket_path
+    else:
+        address = attach_address(cli_config)
+        if not isinstance(address, str):
+            address = (host or address[0], port or address[1])
+    if token is None:
+        console.print(f"Attaching to CLI interface at [bold blue]{format_address(address)}[/bold blue], press Ctrl+C to detach")
+    try:
+        asyncio.run(run_attach_client(address, token=token))
+    except (KeyboardInterrupt, EOFError):
+        console.print("\n[bold yellow]Detached[/bold yellow]")
+
+def serve_stdio_session(args: List[str]) -> int:
+    """
+    Run a stdio server in a forked zygote worker
+    
+    Args:
+        args: Arguments for run, --transport stdio is implied
+    
+    Returns:
+        Exit code
+    """
+    from config_manager import reload_config
     
-    console.print(
-        Panel.fit(
-            "\n".join([f"[bold]{tool['name']}[/bold]: {tool['description']}" for tool in tools_info]),
-            title=f"可用工具 ({len(tools_info)})",
-            border_style="blue"
+    # The configuration may have changed since the zygote started
+    reload_config()
+    try:
+        app(["run", "--transport", "stdio"] + args, prog_name="main.py")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+@app.command("zygote")
+def zygote_command(
+    preload: List[str] = typer.Option(["pyqt"], help="UI type whose backend is imported ahead, can be repeated"),
+    socket_path: Optional[str] = typer.Option(None, help="Unix socket to listen on, defaults to zygote.socket_path in config.json")
+):
+    """
+    Keep the server modules imported and fork a ready stdio server for every stdio-shim launch (Linux, macOS)
+    """
+    import importlib
+    from zygote import serve_forever, resolve_socket_path
+    from ui.ui import UI_IMPLEMENTATIONS
+    
+    # Import everything a session needs, nothing may start threads before forking
+    create_server()
+    for ui_type in preload:
+        if ui_type not in UI_IMPLEMENTATIONS:
+            console.print(f"Unknown UI type: {ui_type}", style="bold red")
+            raise typer.Exit(1)
+        try:
+            importlib.import_module(UI_IMPLEMENTATIONS[ui_type][0])
+        except ImportError as e:
+            console.print(f"Failed to preload {ui_type} UI: {e}", style="yellow")
+    
+    path = socket_path or resolve_socket_path()
+    try:
+        serve_forever(
+            path,
+            serve_stdio_session,
+            on_ready=lambda: console.print(f"Zygote listening on [bold blue]{path}[/bold blue], press Ctrl+C to stop")
         )
+    except RuntimeError as e:
+        console.print(str(e), style="bold red")
+        raise typer.Exit(1)
+
+@app.command("broker")
+def broker_command(
+    ui: Optional[str] = typer.Option(None, help="UI type owned by the broker: cli, pyqt, web, scripted, fanout, defaults to broker.ui in config.json"),
+    lang: LangType = typer.Option(LangType.EN_US, help="Interface language: zh_CN, en_US"),
+    socket_path: Optional[str] = typer.Option(None, help="Unix socket to listen on, defaults to broker.socket_path in config.json"),
+    prewarm: bool = typer.Option(True, help="Initialise the UI backend at startup")
+):
+    """
+    Own a single UI and answer the questions of every server started with --ui broker
+    """
+    from config_manager import get_broker_config
+    from lang_manager import set_language
+    from ui.ui import set_ui_type, start_ui, load_ui
+    from ui.broker import BrokerServer, broker_address, format_address
+    
+    broker_config = get_broker_config()
+    ui = ui or broker_config["ui"]
+    if ui == "broker":
+        console.print("The broker needs a UI type other than broker", style="bold red")
+        raise typer.Exit(1)
+    if socket_path:
+        broker_config["socket_path"] = socket_path
+    address = broker_address(broker_config)
+    try:
+        set_ui_type(ui, lazy=True)
+    except ValueError as e:
+        console.print(str(e), style="bold red")
+        raise typer.Exit(1)
+    set_language(lang)
+    
+    # The broker pays the GUI startup cost once for all servers
+    if prewarm:
+        prewarm_in_background(ui, "broker")
+    
+    async def serve():
+        if sys.platform != 'win32':
+            # Stop through serve_forever's cleanup so the socket file is removed
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await start_ui()
+        server = BrokerServer(await load_ui(), address)
+        await server.start()
+        console.print(f"UI broker ([bold magenta]{ui}[/bold magenta]) listening on [bold blue]{format_address(address)}[/bold blue], press Ctrl+C to stop")
+        await server.serve_forever()
+    
+    try:
+        asyncio.run(serve())
+    except RuntimeError as e:
+        console.print(str(e), style="bold red")
+        raise typer.Exit(1)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        console.print("\n[bold yellow]UI broker stopped[/bold yellow]")
+
+# Remembered answers (answer cache)
+cache_app = typer.Typer(help="List or clear the answers remembered with \"Remember this answer\"")
+app.add_typer(cache_app, name="cache")
+
+def _open_answer_cache():
+    """Answer cache at the configured path, also when it is disabled for the tools"""
+    from config_manager import get_answer_cache_config
+    from ui.answer_cache import AnswerCache, default_cache_path
+    
+    answer_cache_config = get_answer_cache_config()
+    return AnswerCache(
+        answer_cache_config["path"] or default_cache_path(),
+        ttl=float(answer_cache_config["ttl_seconds"]),
+        max_entries=int(answer_cache_config["max_entries"])
     )
 
+@cache_app.command("list")
+def cache_list():
+    """
+    List the remembered answers that have not expired
+    """
+    import time
+    from rich.table import Table
+    
+    cache = _open_answer_cache()
+    entries = cache.entries()
+    if not entries:
+        console.print(f"No remembered answers in {cache.path}", style="yellow")
+        return
+    
+    table = Table(title=f"Remembered answers ({cache.path})")
+    table.add_column("Key")
+    table.add_column("Tool")
+    table.add_column("Prompt")
+    table.add_column("Answer")
+    table.add_column("Expires in", justify="right")
+    now = time.time()
+    for entry in reversed(entries):
+        answer = entry["answer"]
+        if isinstance(answer, dict):
+            answer = answer.get("custom_input") if answer.get("is_custom") else answer.get("selected_option")
+        expires_at = entry.get("expires_at")
+        table.add_row(
+            entry["key"][:12],
+            entry["tool"],
+            str(entry["question"].get("prompt", "")),
+            str(answer),
+            "never" if expires_at is None else f"{int(expires_at - now)}s"
+        )
+    console.print(table)
+
+@cache_app.command("clear")
+def cache_clear(
+    key: str = typer.Argument("", help="Key (or key prefix) shown by cache list, all answers if omitted")
+):
+    """
+    Forget remembered answers, the questions are shown again
+    """
+    removed = _open_answer_cache().clear(key)
+    console.print(f"Removed {removed} remembered answer(s)")
+
+@app.command()
+def bench(
+    transport: List[str] = typer.Option(["stdio", "sse", "streamable-http"], help="Transport to benchmark, can be repeated"),
+    calls: int = typer.Option(200, help="Tool calls per concurrency level"),
+    concurrency: List[int] = typer.Option([1, 8], help="Number of concurrent clients, can be repeated"),
+    think_time: float = typer.Option(0.0, help="Think time of the scripted UI in seconds"),
+    port: int = typer.Option(0, help="Port for HTTP transports, 0 picks a free one"),
+    output: str = typer.Option("benchmark-results.json", help="File the results are saved to"),
+    baseline: Optional[str] = typer.Option(None, help="Earlier results file to compare against"),
+    label: str = typer.Option("", help="Label stored with the results, e.g. a version")
+):
+    """
+    Measure per-call latency, throughput and cold start of each transport
+    """
+    from benchmark import run_benchmark, save_results, load_results, print_results
+    
+    # 设置日志级别
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    results = run_benchmark(
+        transport,
+        calls=calls,
+        concurrency=concurrency,
+        think_time=think_time,
+        port=port,
+        label=label,
+        progress=lambda message: console.print(message, style="blue")
+    )
+    save_results(results, output)
+    print_results(console, results, load_results(baseline) if baseline else None)
+    console.print(f"Results saved to [bold]{output}[/bold]")
+
+@app.command("startup-report", context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def startup_report(
+    ctx: typer.Context,
+    top: int = typer.Option(15, help="Rows per table"),
+    timeout: float = typer.Option(60, help="Seconds after which the command is stopped")
+):
+    """
+    Show where the startup time of a command goes, e.g. startup-report run --transport stdio
+    """
+    from benchmark import profile_startup, print_startup_report
+    
+    args = ctx.args or ["list-tools"]
+    print_startup_report(console, profile_startup(args, timeout), top)
+
+@app.command("list-tools")
+def list_tools():
+    """
+    List all available tools
+    """
+    print_tools()
+
 @app.command()
 def test(
     tool_name: str = typer.Argument(None, help="Name of the tool to test"),
-    ui: str = typer.Option("cli", help="UI type: cli, pyqt, web"),
+    ui: str = typer.Option("cli", help="UI type: cli, pyqt, web, scripted, fanout"),
     lang: LangType = typer.Option(LangType.EN_US, help="Interface language: zh_CN, en_US")
 ):
     """
     Test tool functions
     """
+    from ui.ui import set_ui_type
+    from lang_manager import set_language
+    
     # 设置日志级别
     logging.getLogger().setLevel(logging.WARNING)
     logging.getLogger('FastMCP').setLevel(logging.WARNING)
@@ -229,7 +579,8 @@ def test(
     # Define available tool names and corresponding test functions
     available_tools = {
         "select_option": _test_select_option,
-        "request_additional_info": _test_request_additional_info
+        "request_additional_info": _test_request_additional_info,
+        "ask_questions": _test_ask_questions
     }
     
     if not tool_name:
@@ -249,6 +600,8 @@ def test(
 
 async def _test_select_option():
     """Test option selection tool"""
+    from ui.ui import select_option
+    
     options = [
         "Option 1: Using string option",
         {"title": "Option 2", "description": "Using dictionary option with description"},
@@ -259,11 +612,25 @@ async def _test_select_option():
 
 async def _test_request_additional_info():
     """Test information supplement tool"""
+    from ui.ui import request_additional_info
+    
     result = await request_additional_info(
         prompt="Please provide more information\n"*100
     )
     console.print(f"User provided information: {result}")
 
+async def _test_ask_questions():
+    """Test batched questions tool"""
+    from ui.ui import ask_questions
+    
+    questions = [
+        {"prompt": "Which database should be used?", "options": ["PostgreSQL", "SQLite", {"title": "MySQL", "description": "Existing cluster"}]},
+        {"prompt": "Run the migrations now?", "options": ["Yes", "No"]},
+        {"prompt": "Anything else the migration should take care of?"}
+    ]
+    result = await ask_questions(questions)
+    console.print(result)
+
 if __name__ == "__main__":
     try:
         app()
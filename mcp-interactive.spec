@@ -16,8 +16,26 @@ hidden_imports = [
     'fastmcp',
     'ui',
     'ui.ui_cli',
+    'ui.ipc',
+    'ui.scheduler',
+    'ui.answer_cache',
+    'ui.private_files',
+    'ui.auto_respond',
+    'ui.request_registry',
+    'ui.metrics',
+    'ui.profiling',
+    'ui.journal',
+    'ui.pending_store',
+    'ui.answer_history',
+    'ui.cli_attach',
     'ui.ui_pyqt',
     'ui.ui_web',  # Web界面模块
+    'ui.ui_scripted',  # 脚本界面（自动化测试）
+    'ui.broker',
+    'ui.ui_broker',  # 共享界面代理
+    'ui.ui_fanout',  # 多界面同时显示
+    'benchmark',  # main.py bench
+    'zygote',  # main.py zygote / stdio-shim
     'flask',  # Flask依赖
     'flask_socketio',  # Flask Socket.IO依赖
     'ui.test_ui',  # 修正：确保这是正确的模块路径
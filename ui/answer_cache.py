@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Answer Cache
+Answers the user asked to remember ("Remember this answer") are returned for
+identical questions without showing them again, until they expire. The cache
+lives in a JSON file so every server process and python main.py cache share it.
+A cache file that belongs to another user is ignored, answers planted in it
+are never returned.
+
+Every change, including the last use of an answer, is read, applied and
+written back while holding a lock file, so processes do not lose each other's
+answers and eviction stays least recently used across them.
+"""
+
+import copy
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from ui.private_files import check_private, private_directory, private_file
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: processes sharing a cache are not serialized
+    fcntl = None
+
+logger = logging.getLogger('AnswerCache')
+
+
+def default_cache_path() -> str:
+    """Cache file used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "answers.json")
+
+
+class AnswerCache:
+    """Remembered answers by question key, expiring after a TTL and evicted least recently used first"""
+
+    def __init__(self, path: str, ttl: float = 86400.0, max_entries: int = 200):
+        """
+        Initialize answer cache
+
+        Args:
+            path: JSON file the entries are kept in
+            ttl: Seconds an answer is remembered, 0 for no expiry
+            max_entries: Entries kept at most, 0 for no limit
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._version = None
+
+    def _reload_if_changed(self):
+        """Pick up changes made by other processes (remembered answers, cache clear)"""
+        try:
+            # The file is replaced on every save, a new inode marks a change
+            stat = os.stat(self.path)
+            version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            version = None
+        if version == self._version:
+            return
+        self._version = version
+        self._entries = OrderedDict()
+        if version is None:
+            return
+        try:
+            # Raises PermissionError for a file another user could have written
+            check_private(self.path)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Least recently used first, entries written before used_at count from their creation
+            entries = sorted(data.get("entries", []), key=lambda entry: entry.get("used_at", entry["created_at"]))
+            for entry in entries:
+                self._entries[entry["key"]] = entry
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable answer cache {self.path}: {e}")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cache's lock file around a read-modify-write, other processes share the file"""
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(private_file(self.path + ".lock"), os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _save(self):
+        """Write the entries, replacing the file in one step"""
+        directory = os.path.dirname(self.path) or "."
+        fd, temp_path = tempfile.mkstemp(prefix=".answers-", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"entries": list(self._entries.values())}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        stat = os.stat(self.path)
+        self._version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return entry.get("expires_at") is not None and entry["expires_at"] <= now
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Remembered answer of a question
+
+        Args:
+            key: Question key
+
+        Returns:
+            Copy of the answer, None if nothing is remembered or it expired
+        """
+        self._reload_if_changed()
+        if key not in self._entries:
+            return None
+        try:
+            with self._locked():
+                self._reload_if_changed()
+                entry = self._entries.get(key)
+                if entry is None or self._expired(entry, time.time()):
+                    return None
+                # Written back, so eviction follows the last use in every process
+                entry["used_at"] = time.time()
+                self._entries.move_to_end(key)
+                self._save()
+        except OSError as e:
+            logger.error(f"Failed to save answer cache {self.path}: {e}")
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, time.time()):
+                return None
+        return copy.deepcopy(entry["answer"])
+
+    def put(self, key: str, tool: str, question: Dict[str, Any], answer: Any):
+        """
+        Remember an answer
+
+        Args:
+            key: Question key
+            tool: Tool the question was asked with
+            question: Question data (prompt, options), shown by cache list
+            answer: Answer returned for identical questions
+        """
+        try:
+            with self._locked():
+                self._reload_if_changed()
+                now = time.time()
+                self._entries.pop(key, None)
+                self._entries[key] = {
+                    "key": key,
+                    "tool": tool,
+                    "question": question,
+                    "answer": answer,
+                    "created_at": now,
+                    "used_at": now,
+                    "expires_at": now + self.ttl if self.ttl > 0 else None
+                }
+                # Drop expired entries, then the least recently used ones
+                for stale in [k for k, entry in self._entries.items() if self._expired(entry, now)]:
+                    del self._entries[stale]
+                while self.max_entries > 0 and len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._save()
+        except OSError as e:
+            logger.error(f"Failed to save answer cache {self.path}: {e}")
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Entries that have not expired, least recently used first"""
+        self._reload_if_changed()
+        now = time.time()
+        return [copy.deepcopy(entry) for entry in self._entries.values() if not self._expired(entry, now)]
+
+    def clear(self, key_prefix: str = "") -> int:
+        """
+        Forget remembered answers
+
+        Args:
+            key_prefix: Only forget entries whose key starts with it, all if empty
+
+        Returns:
+            Number of entries removed
+        """
+        with self._locked():
+            self._reload_if_changed()
+            keys = [key for key in self._entries if key.startswith(key_prefix)]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._save()
+        return len(keys)
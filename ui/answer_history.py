@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Answer History
+Every prompt/answer pair of request_additional_info, indexed in a local SQLite
+FTS5 table so the UIs can suggest earlier answers while the user types.
+An answer given again is stored once, as the most recently used one.
+
+Lookups are prefix queries against an FTS5 prefix index, returned newest
+first with a LIMIT, so they stop after the first matches instead of ranking
+every match and stay well below a millisecond with 100k+ entries.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ui.private_files import private_directory, private_file
+
+logger = logging.getLogger('AnswerHistory')
+
+# Words of a search text used at most, each matched as a prefix
+MAX_SEARCH_TERMS = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    prompt TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    answer_hash TEXT NOT NULL UNIQUE,
+    uses INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_prompt ON history (prompt_hash);
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    prompt, answer, content='history', content_rowid='id', prefix='1 2'
+);
+CREATE TRIGGER IF NOT EXISTS history_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, prompt, answer) VALUES (new.id, new.prompt, new.answer);
+END;
+CREATE TRIGGER IF NOT EXISTS history_delete AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts (history_fts, rowid, prompt, answer) VALUES ('delete', old.id, old.prompt, old.answer);
+END;
+"""
+
+_COLUMNS = "id, prompt, answer, uses, used"
+
+
+def default_history_path() -> str:
+    """History file used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "history.sqlite3")
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def match_expression(text: str) -> Optional[str]:
+    """
+    FTS5 query matching entries that contain every word of a text, the last one
+    possibly not typed completely yet
+
+    Args:
+        text: Search text as typed
+
+    Returns:
+        Query, None when the text has no words
+    """
+    words = re.findall(r"\w+", text)[:MAX_SEARCH_TERMS]
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class AnswerHistory:
+    """Prompt/answer pairs in a SQLite database with a full-text index"""
+
+    def __init__(self, path: str, max_entries: int = 200000):
+        """
+        Open the history, creating the database when it does not exist
+
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept, the least recently used are deleted, 0 for no limit
+
+        Raises:
+            PermissionError: The database is a symbolic link or belongs to another user
+        """
+        self.path = path
+        self.max_entries = max_entries
+        # Created 0600 before SQLite opens it, its journal files get the same mode
+        private_file(path)
+        # Searched from the GUI thread, the web server and executor threads, one at a time
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def _entries(rows) -> List[Dict[str, Any]]:
+        return [
+            {"id": row[0], "prompt": row[1], "answer": row[2], "uses": row[3], "used": row[4]}
+            for row in rows
+        ]
+
+    def add(self, prompt: str, answer: str):
+        """
+        Record an answer, an answer given before becomes the most recently used one.
+        Server processes and attached terminals share the database, the entries
+        beyond max_entries are counted in the same transaction.
+
+        Args:
+            prompt: Prompt the answer was given to
+            answer: Answer text
+        """
+        answer_hash = _hash(answer)
+        with self._lock:
+            connection = self._connection
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute("SELECT uses FROM history WHERE answer_hash = ?", (answer_hash,)).fetchone()
+                if row is not None:
+                    # Re-inserted so the newest ID keeps meaning most recently used
+                    connection.execute("DELETE FROM history WHERE answer_hash = ?", (answer_hash,))
+                connection.execute(
+                    "INSERT INTO history (prompt, answer, prompt_hash, answer_hash, uses, used) VALUES (?, ?, ?, ?, ?, ?)",
+                    (prompt, answer, _hash(prompt), answer_hash, (row[0] if row else 0) + 1, time.time())
+                )
+                if self.max_entries > 0:
+                    count = connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+                    if count > self.max_entries:
+                        connection.execute(
+                            "DELETE FROM history WHERE id IN (SELECT id FROM history ORDER BY id LIMIT ?)",
+                            (count - self.max_entries,)
+                        )
+                connection.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write answer history {self.path}: {e}")
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+
+    def search(self, text: str = "", prompt: Optional[str] = None, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Earlier answers for a search text, most recently used first
+
+        Args:
+            text: Search text, every word must appear in the prompt or the answer,
+                as a prefix; empty to get suggestions for the prompt
+            prompt: Prompt being answered, without search text its earlier answers
+                come first, followed by the answers used last
+            limit: Entries returned at most
+
+        Returns:
+            Entries with id, prompt, answer, uses and used (timestamp)
+        """
+        expression = match_expression(text)
+        with self._lock:
+            try:
+                if expression is not None:
+                    rows = self._connection.execute(
+                        f"SELECT {_COLUMNS} FROM history WHERE id IN ("
+                        "SELECT rowid FROM history_fts WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+                        ") ORDER BY id DESC",
+                        (expression, limit)
+                    ).fetchall()
+                    return self._entries(rows)
+                rows = []
+                if prompt:
+                    rows = self._connection.execute(
+                        f"SELECT {_COLUMNS} FROM history WHERE prompt_hash = ? ORDER BY id DESC LIMIT ?",
+                        (_hash(prompt), limit)
+                    ).fetchall()
+                if len(rows) < limit:
+                    seen = {row[0] for row in rows}
+                    recent = self._connection.execute(
+                        f"SELECT {_COLUMNS} FROM history ORDER BY id DESC LIMIT ?", (limit + len(rows),)
+                    ).fetchall()
+                    rows += [row for row in recent if row[0] not in seen][:limit - len(rows)]
+                return self._entries(rows)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to search answer history {self.path}: {e}")
+                return []
+
+    def stats(self) -> Dict[str, int]:
+        """Entries held"""
+        with self._lock:
+            try:
+                return {"entries": self._connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]}
+            except sqlite3.Error:
+                return {}
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._connection.close()
+
+
+# History of this process, created from the answer history configuration on first use
+_history: Optional[AnswerHistory] = None
+_history_lock = threading.Lock()
+_history_disabled = False
+
+
+def get_answer_history() -> Optional[AnswerHistory]:
+    """
+    Get the answer history of this process
+
+    Returns:
+        History instance, None when the answer history is disabled
+    """
+    global _history, _history_disabled
+    if _history is None and not _history_disabled:
+        with _history_lock:
+            if _history is None and not _history_disabled:
+                from config_manager import get_answer_history_config
+
+                history_config = get_answer_history_config()
+                if not history_config["enabled"]:
+                    _history_disabled = True
+                    return None
+                try:
+                    _history = AnswerHistory(
+                        history_config["path"] or default_history_path(),
+                        max_entries=int(history_config["max_entries"])
+                    )
+                except (OSError, sqlite3.Error) as e:
+                    logger.error(f"Answer history disabled, cannot open it: {e}")
+                    _history_disabled = True
+                    return None
+                atexit.register(_history.close)
+    return _history
+
+
+def search(text: str = "", prompt: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Search the answer history of this process, nothing is found when it is disabled
+
+    Args:
+        text: Search text, empty for suggestions for the prompt
+        prompt: Prompt being answered
+        limit: Entries returned at most, None for the configured number of suggestions
+
+    Returns:
+        Entries with id, prompt, answer, uses and used
+    """
+    history = get_answer_history()
+    if history is None:
+        return []
+    if limit is None:
+        from config_manager import get_answer_history_config
+
+        limit = int(get_answer_history_config()["suggestions"])
+    return history.search(text, prompt, limit)
+
+
+def stats() -> Dict[str, int]:
+    """Statistics of the answer history of this process, empty when it was not opened"""
+    return _history.stats() if _history is not None else {}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Auto Responder
+Answers routine questions (confirmations, "continue?") from rules in the
+auto_respond section of config.json without showing them, matching the prompt,
+the option titles and the client by regular expression or glob pattern
+"""
+
+import fnmatch
+import logging
+import re
+from typing import Any, Dict, List, Optional, Pattern, Union
+
+logger = logging.getLogger('AutoResponder')
+
+# Tool names rules can be restricted to
+TOOLS = ("select_option", "request_additional_info")
+
+
+def option_title(option: Union[str, Dict[str, Any]]) -> str:
+    """Text an option is matched by"""
+    if isinstance(option, dict):
+        return str(option.get("title", option.get("name", option.get("description", ""))))
+    return str(option)
+
+
+def _compile(pattern: Optional[str], syntax: str) -> Optional[Pattern]:
+    """Compile a rule pattern, a glob has to match the whole text"""
+    if not pattern:
+        return None
+    if syntax == "glob":
+        return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+    return re.compile(pattern)
+
+
+class AutoRule:
+    """
+    One auto_respond rule, e.g.
+    {"tool": "select_option", "prompt": "^Continue\\?", "option": "^(Yes|Continue)$"}
+
+    Keys:
+        tool: select_option or request_additional_info, any tool if omitted
+        prompt: Pattern searched in the prompt, matches all prompts if omitted
+        option: Pattern an option title must match, the first matching option is selected
+            unless select is given (select_option)
+        session: Pattern the client name (e.g. "cursor") must match
+        syntax: "regex" (default, searched anywhere) or "glob" (whole text, ignoring case)
+        select: Index or title of the option to choose, the first option if nothing else is given
+        custom_input: Custom answer instead of an option (select_option)
+        answer: Text returned by request_additional_info
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.tool = data.get("tool")
+        if self.tool not in (None, "*") + TOOLS:
+            raise ValueError(f"Unknown tool in auto_respond rule: {self.tool}")
+        syntax = data.get("syntax", "regex")
+        if syntax not in ("regex", "glob"):
+            raise ValueError(f"Unknown syntax in auto_respond rule: {syntax}")
+        self.prompt = _compile(data.get("prompt"), syntax)
+        self.option = _compile(data.get("option"), syntax)
+        self.session = _compile(data.get("session"), syntax)
+        self.select = data.get("select")
+        self.custom_input = data.get("custom_input")
+        self.answer = data.get("answer")
+        if self.tool == "request_additional_info" and self.answer is None:
+            raise ValueError("auto_respond rule for request_additional_info needs an answer")
+
+    def _applies(self, tool: str, prompt: str, client: str) -> bool:
+        if self.tool not in (None, "*") and self.tool != tool:
+            return False
+        if self.session is not None and self.session.search(client) is None:
+            return False
+        return self.prompt is None or self.prompt.search(prompt) is not None
+
+    def _selection(self, options: List[Union[str, Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Selection result of the rule, None if the options do not fit it"""
+        if self.custom_input is not None:
+            return {
+                "selected_index": -1,
+                "selected_option": None,
+                "custom_input": self.custom_input,
+                "is_custom": True
+            }
+
+        titles = [option_title(option) for option in options]
+        matching = [i for i, title in enumerate(titles) if self.option is None or self.option.search(title)]
+        if isinstance(self.select, int):
+            index = self.select
+        elif self.select is not None:
+            index = titles.index(self.select) if self.select in titles else -1
+        else:
+            index = matching[0] if matching else -1
+        if not 0 <= index < len(options) or index not in matching:
+            return None
+        return {
+            "selected_index": index,
+            "selected_option": options[index],
+            "custom_input": "",
+            "is_custom": False
+        }
+
+    def respond(
+        self,
+        tool: str,
+        prompt: str,
+        options: Optional[List[Union[str, Dict[str, Any]]]] = None,
+        client: str = ""
+    ) -> Optional[Any]:
+        """
+        Answer of the rule for a question
+
+        Returns:
+            Selection result or text, None if the rule does not apply
+        """
+        if not self._applies(tool, prompt, client):
+            return None
+        if tool == "select_option":
+            return self._selection(options or [])
+        return self.answer
+
+
+class AutoResponder:
+    """Rules compiled once, the first rule that applies answers"""
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        """
+        Initialize auto responder
+
+        Args:
+            rules: Rules of the auto_respond configuration, invalid ones are skipped
+        """
+        self.rules: List[AutoRule] = []
+        for i, data in enumerate(rules):
+            try:
+                self.rules.append(AutoRule(data))
+            except (ValueError, re.error, AttributeError, TypeError) as e:
+                logger.warning(f"Skipping auto_respond rule {i + 1}: {e}")
+
+    def respond(
+        self,
+        tool: str,
+        prompt: str,
+        options: Optional[List[Union[str, Dict[str, Any]]]] = None,
+        client: str = ""
+    ) -> Optional[Any]:
+        """
+        Automatic answer to a question
+
+        Args:
+            tool: select_option or request_additional_info
+            prompt: Prompt of the question
+            options: Options of a selection
+            client: Name of the MCP client asking
+
+        Returns:
+            Selection result or text, None when the question has to be shown
+        """
+        for rule in self.rules:
+            answer = rule.respond(tool, prompt, options, client)
+            if answer is not None:
+                return answer
+        return None
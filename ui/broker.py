@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Shared UI Broker
+A single local process (python main.py broker) owns the interface, every MCP
+server instance started with --ui broker forwards its questions to it over a
+local socket instead of creating its own GUI stack
+
+The socket is a Unix socket only the user can open, and servers only talk to a
+broker running as their user. Where Unix sockets are unavailable (Windows) it
+is a loopback TCP port, and servers must present the secret kept in the user's
+private directory.
+"""
+
+import asyncio
+import hmac
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from ui.ipc import read_message, write_message
+from ui.private_files import check_peer, private_directory, private_secret
+from ui.scheduler import QueueFullError
+
+logger = logging.getLogger('Broker')
+
+# Protocol version exchanged in the hello message
+PROTOCOL_VERSION = 1
+
+# Question types the broker answers
+KINDS = ("select_option", "request_additional_info", "ask_questions")
+
+# Unix socket path, or (host, port) where Unix sockets are unavailable
+BrokerAddress = Union[str, Tuple[str, int]]
+
+
+def unix_sockets_supported() -> bool:
+    """Whether asyncio can serve Unix domain sockets on this platform"""
+    return hasattr(socket, "AF_UNIX") and hasattr(asyncio, "start_unix_server")
+
+
+def default_socket_path() -> str:
+    """Socket path used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "broker.sock")
+
+
+def broker_secret() -> str:
+    """Secret servers present over TCP, created in the user's private directory on first use"""
+    return private_secret("broker.secret")
+
+
+def broker_address(broker_config: Dict[str, Any]) -> BrokerAddress:
+    """
+    Address of the broker from the broker configuration
+
+    Args:
+        broker_config: Result of get_broker_config()
+
+    Returns:
+        Unix socket path, or (host, port) on platforms without Unix sockets (Windows)
+    """
+    if unix_sockets_supported():
+        return broker_config["socket_path"] or default_socket_path()
+    return (broker_config["host"], int(broker_config["port"]))
+
+
+def format_address(address: BrokerAddress) -> str:
+    """Human readable address"""
+    if isinstance(address, str):
+        return address
+    return f"{address[0]}:{address[1]}"
+
+
+async def _open_connection(address: BrokerAddress):
+    """Connect to the broker, raises OSError when it is not listening"""
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+class _Connection:
+    """An MCP server connected to the broker"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.tasks: Dict[str, asyncio.Task] = {}  # request_id -> task answering it
+        self._write_lock = asyncio.Lock()
+
+    async def send(self, message: Dict[str, Any]):
+        """Write a message, answers of concurrent questions may finish together"""
+        async with self._write_lock:
+            await write_message(self.writer, message)
+
+
+class BrokerServer:
+    """Local socket server answering the questions of all MCP servers with one UI"""
+
+    def __init__(self, ui, address: BrokerAddress):
+        """
+        Initialize broker server
+
+        Args:
+            ui: UI instance answering the questions
+            address: Unix socket path or (host, port) to listen on
+        """
+        self.ui = ui
+        self.address = address
+        self._server = None
+        self._connections = []
+
+    async def start(self):
+        """
+        Start listening
+
+        Raises:
+            RuntimeError: Another broker is already listening on the address
+        """
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                # Refuse to take over a live broker, remove a stale socket
+                try:
+                    _, writer = await _open_connection(self.address)
+                except OSError:
+                    os.unlink(self.address)
+                else:
+                    writer.close()
+                    raise RuntimeError(f"A broker is already listening on {self.address}")
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Bound with mode 0600, never reachable by other users even briefly
+            umask = os.umask(0o177)
+            try:
+                sock.bind(self.address)
+            except OSError:
+                sock.close()
+                raise
+            finally:
+                os.umask(umask)
+            self._server = await asyncio.start_unix_server(self._handle_client, sock=sock)
+        else:
+            broker_secret()
+            try:
+                self._server = await asyncio.start_server(self._handle_client, *self.address)
+            except OSError as e:
+                raise RuntimeError(f"Failed to listen on {format_address(self.address)}: {e}")
+        logger.info(f"UI broker listening on {format_address(self.address)}")
+
+    async def serve_forever(self):
+        """Start listening and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Stop listening, disconnect the MCP servers and remove the socket file"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for connection in list(self._connections):
+            connection.writer.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    async def _answer(self, connection: _Connection, request_id: str, kind: str, payload: Dict[str, Any]):
+        """Ask the UI once the scheduler admits the question and send the answer back"""
+        from ui.ui import ask_questions_on, normalize_questions, question_key, run_scheduled, run_shared
+
+        if kind == "select_option":
+            call = lambda: self.ui.select_option(
+                payload.get("options", []),
+                payload.get("prompt", "Please select one of the following options")
+            )
+        elif kind == "request_additional_info":
+            call = lambda: self.ui.request_additional_info(payload.get("prompt", ""))
+        elif kind == "ask_questions":
+            call = lambda: ask_questions_on(self.ui, normalize_questions(payload.get("questions", [])))
+        else:
+            call = None
+        try:
+            if call is None:
+                raise ValueError(f"Unsupported question type {kind}")
+            # Sessions of all connected servers take turns
+            session = (id(connection), payload.get("session"))
+            priority = int(payload.get("priority", 0))
+            # Servers asking the same question at once share one dialog
+            key = question_key(kind, **{name: payload[name] for name in ("prompt", "options", "questions") if name in payload})
+            result = await run_shared(key, lambda context: run_scheduled(self.ui, call, session, priority))
+            message = {"type": "response", "id": request_id, "result": result}
+        except asyncio.CancelledError:
+            # The MCP server gave up on the question or went away
+            return
+        except QueueFullError as e:
+            message = {"type": "error", "id": request_id, "error": str(e), "rejected": True}
+        except Exception as e:
+            logger.error(f"UI failed to answer {kind}: {e}")
+            message = {"type": "error", "id": request_id, "error": str(e)}
+        finally:
+            connection.tasks.pop(request_id, None)
+
+        try:
+            await connection.send(message)
+        except (ConnectionError, OSError):
+            pass
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one MCP server until it disconnects"""
+        hello = await read_message(reader)
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            writer.close()
+            return
+        if not isinstance(self.address, str) and not hmac.compare_digest(str(hello.get("secret", "")), broker_secret()):
+            # Any local user can reach a TCP port, only the owner can read the secret
+            logger.warning("Rejected an MCP server without the broker secret")
+            writer.close()
+            return
+
+        connection = _Connection(writer)
+        self._connections.append(connection)
+        logger.info(f"MCP server connected (pid {hello.get('pid')}), {len(self._connections)} connected")
+        try:
+            await connection.send({"type": "welcome", "version": PROTOCOL_VERSION, "pid": os.getpid()})
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                if message.get("type") == "request":
+                    request_id = message.get("id")
+                    connection.tasks[request_id] = asyncio.create_task(
+                        self._answer(connection, request_id, message.get("kind"), message.get("payload", {}))
+                    )
+                elif message.get("type") == "cancel":
+                    task = connection.tasks.get(message.get("id"))
+                    if task is not None:
+                        task.cancel()
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"MCP server connection error: {e}")
+        finally:
+            # Nobody is left to answer to, close the dialogs of this server
+            for task in list(connection.tasks.values()):
+                task.cancel()
+            writer.close()
+            self._connections.remove(connection)
+            logger.info(f"MCP server disconnected, {len(self._connections)} connected")
+
+
+class BrokerClient:
+    """Connection of an MCP server to the broker, shared by all its questions"""
+
+    def __init__(
+        self,
+        address: BrokerAddress,
+        connect_timeout: float = 15.0,
+        launch: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize broker client
+
+        Args:
+            address: Unix socket path or (host, port) of the broker
+            connect_timeout: Seconds to wait for a broker started by launch
+            launch: Starts the broker when none is listening, no autostart if None
+        """
+        self.address = address
+        self.connect_timeout = connect_timeout
+        self.launch = launch
+        self._writer = None
+        self._write_lock = None
+        self._connect_lock = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the connection to the broker is open"""
+        return self._writer is not None
+
+    async def _open(self):
+        """Connect to the broker, starting it first if allowed"""
+        try:
+            return await _open_connection(self.address)
+        except OSError:
+            if self.launch is None:
+                raise ConnectionError(f"No UI broker listening on {format_address(self.address)}")
+
+        logger.info(f"Starting UI broker on {format_address(self.address)}")
+        self.launch()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.connect_timeout
+        while True:
+            await asyncio.sleep(0.1)
+            try:
+                return await _open_connection(self.address)
+            except OSError:
+                if loop.time() >= deadline:
+                    raise ConnectionError(
+                        f"UI broker did not start on {format_address(self.address)} within {self.connect_timeout}s"
+                    )
+
+    async def connect(self):
+        """Open the connection if needed, does nothing if already connected"""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+            self._write_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            reader, writer = await self._open()
+            hello = {"type": "hello", "version": PROTOCOL_VERSION, "pid": os.getpid()}
+            if isinstance(self.address, str):
+                # Questions and answers only go to a broker running as this user
+                try:
+                    check_peer(writer.get_extra_info("socket"), self.address)
+                except PermissionError as e:
+                    writer.close()
+                    raise ConnectionError(str(e))
+            else:
+                hello["secret"] = broker_secret()
+            await write_message(writer, hello)
+            welcome = await read_message(reader)
+            if not isinstance(welcome, dict) or welcome.get("type") != "welcome":
+                writer.close()
+                raise ConnectionError("Unexpected handshake from UI broker")
+            self._writer = writer
+            asyncio.create_task(self._read_responses(reader, writer))
+            logger.info(f"Connected to UI broker (pid {welcome.get('pid')})")
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Resolve pending questions with the broker's answers until it goes away"""
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if message.get("type") == "response":
+                    future.set_result(message.get("result"))
+                elif message.get("type") == "error":
+                    error = QueueFullError if message.get("rejected") else RuntimeError
+                    future.set_exception(error(message.get("error", "UI broker error")))
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"UI broker connection error: {e}")
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("UI broker disconnected"))
+
+    async def ask(self, kind: str, payload: Dict[str, Any]) -> Any:
+        """
+        Forward a question to the broker and wait for the answer
+
+        Args:
+            kind: Question type, one of KINDS
+            payload: Question data
+
+        Returns:
+            Answer of the broker's UI
+
+        Raises:
+            ConnectionError: The broker is not reachable or went away before answering
+            RuntimeError: The broker's UI failed to answer
+            QueueFullError: The broker's scheduler rejected the question
+        """
+        await self.connect()
+        request_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            async with self._write_lock:
+                await write_message(self._writer, {
+                    "type": "request",
+                    "id": request_id,
+                    "kind": kind,
+                    "payload": payload
+                })
+            return await future
+        except asyncio.CancelledError:
+            # Let the broker close the dialog nobody waits for anymore
+            if self._writer is not None:
+                try:
+                    async with self._write_lock:
+                        await write_message(self._writer, {"type": "cancel", "id": request_id})
+                except (ConnectionError, OSError):
+                    pass
+            raise
+        finally:
+            self._pending.pop(request_id, None)
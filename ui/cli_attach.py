@@ -0,0 +1,751 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Attached Terminal for the Command Line Interface
+A long-lived terminal connects once to the MCP server over a local socket
+and gets questions pushed to it, instead of a new window per question
+
+The socket is a Unix socket only the user can open. Where Unix sockets are
+unavailable (Windows) it is a loopback TCP port, and terminals must present the
+secret kept in the user's private directory.
+"""
+
+import asyncio
+import collections
+import hmac
+import logging
+import os
+import select
+import socket
+import sys
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from ui.broker import format_address, unix_sockets_supported
+from ui.ipc import read_message, write_message
+from ui.private_files import private_directory, private_secret
+
+logger = logging.getLogger('CommandLineUI')
+
+# Protocol version exchanged in the hello message
+PROTOCOL_VERSION = 1
+
+# Unix socket path, or (host, port) where Unix sockets are unavailable
+AttachAddress = Union[str, Tuple[str, int]]
+
+
+def default_attach_socket_path() -> str:
+    """Socket path used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "attach.sock")
+
+
+def attach_address(cli_config: Dict[str, Any]) -> AttachAddress:
+    """
+    Address of the attach server from the CLI configuration
+
+    Args:
+        cli_config: Result of get_cli_config()
+
+    Returns:
+        Unix socket path, or (host, port) on platforms without Unix sockets (Windows)
+    """
+    if unix_sockets_supported():
+        return cli_config["attach_socket"] or default_attach_socket_path()
+    return (cli_config["attach_host"], int(cli_config["attach_port"]))
+
+
+def attach_secret() -> str:
+    """Secret terminals present over TCP, created in the user's private directory on first use"""
+    return private_secret("attach.secret")
+
+
+async def _open_connection(address: AttachAddress):
+    """Connect to the attach server, raises OSError when it is not listening"""
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+async def _is_listening(path: str) -> bool:
+    """Whether a server answers on a Unix socket path"""
+    try:
+        _, writer = await _open_connection(path)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+class _AttachedClient:
+    """A terminal connected to the attach server"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}  # request_id -> asyncio.Future
+
+
+class AttachServer:
+    """Local socket server that pushes CLI questions to attached terminals"""
+
+    def __init__(self, address: AttachAddress):
+        """
+        Initialize attach server
+
+        Args:
+            address: Unix socket path, or (host, port) on the loopback interface
+        """
+        self.address = address
+        self._server = None
+        self._socket_path = None  # Unix socket created by this server, removed on stop
+        self._start_lock = None
+        self._clients: List[_AttachedClient] = []
+        self._spawn_waiters = {}  # token -> asyncio.Future resolved with the connected client
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the server is listening"""
+        return self._server is not None
+
+    def has_clients(self) -> bool:
+        """Whether at least one terminal is attached"""
+        return bool(self._clients)
+
+    async def start(self):
+        """Start listening, does nothing if already started"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._server is not None:
+                return
+            try:
+                await self._listen()
+            except OSError as e:
+                logger.error(f"Failed to start CLI attach server on {format_address(self.address)}: {e}")
+
+    async def _listen(self):
+        """
+        Listen on the configured address. When another server instance holds it,
+        listen on an address of this process instead: attached terminals keep
+        talking to the other instance, windows opened by this one are told the
+        address explicitly.
+        """
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                if not await _is_listening(self.address):
+                    os.unlink(self.address)
+                else:
+                    taken = self.address
+                    self.address = os.path.join(os.path.dirname(self.address), f"attach-{os.getpid()}.sock")
+                    logger.warning(
+                        f"Another server is attached at {taken}, attach terminals to this one with: "
+                        f"python main.py attach --socket-path {self.address}"
+                    )
+                    if os.path.exists(self.address):
+                        os.unlink(self.address)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Bound with mode 0600, never reachable by other users even briefly
+            umask = os.umask(0o177)
+            try:
+                sock.bind(self.address)
+            except OSError:
+                sock.close()
+                raise
+            finally:
+                os.umask(umask)
+            self._socket_path = self.address
+            self._server = await asyncio.start_unix_server(self._handle_client, sock=sock)
+        else:
+            attach_secret()
+            try:
+                self._server = await asyncio.start_server(self._handle_client, *self.address)
+            except OSError as e:
+                taken = format_address(self.address)
+                self._server = await asyncio.start_server(self._handle_client, self.address[0], 0)
+                self.address = (self.address[0], self._server.sockets[0].getsockname()[1])
+                logger.warning(
+                    f"Cannot listen on {taken} ({e}), attach terminals to this server with: "
+                    f"python main.py attach --port {self.address[1]}"
+                )
+        logger.info(f"CLI attach server listening on {format_address(self.address)}")
+
+    async def stop(self):
+        """Stop listening and disconnect attached terminals"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._socket_path is not None:
+            try:
+                os.unlink(self._socket_path)
+            except OSError:
+                pass
+            self._socket_path = None
+        for client in list(self._clients):
+            client.writer.close()
+
+    async def ask(self, kind: str, payload: Dict[str, Any]) -> Any:
+        """
+        Push a question to the most recently attached terminal and wait for the answer
+
+        Args:
+            kind: Question type, a key of PROMPT_HANDLERS
+            payload: Question data rendered by the terminal
+
+        Returns:
+            Answer sent back by the terminal
+
+        Raises:
+            ConnectionError: No terminal is attached or it went away before answering
+        """
+        if not self._clients:
+            raise ConnectionError("No terminal attached")
+        return await self._ask_client(self._clients[-1], kind, payload)
+
+    async def ask_spawned(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        launch: Callable[[str], None],
+        connect_timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Ask a question in a one-shot terminal started for this question only
+
+        Args:
+            kind: Question type, a key of PROMPT_HANDLERS
+            payload: Question data rendered by the terminal
+            launch: Starts the terminal, called with the token it must present
+            connect_timeout: Seconds to wait for the terminal to connect
+
+        Returns:
+            Answer sent back by the terminal
+
+        Raises:
+            asyncio.TimeoutError: The terminal did not connect within connect_timeout
+            ConnectionError: The terminal went away before answering
+        """
+        loop = asyncio.get_running_loop()
+        token = str(uuid.uuid4())
+        connected = loop.create_future()
+        self._spawn_waiters[token] = connected
+        client = None
+        try:
+            launch(token)
+            client = await asyncio.wait_for(connected, connect_timeout)
+            return await self._ask_client(client, kind, payload)
+        finally:
+            self._spawn_waiters.pop(token, None)
+            if client is not None:
+                # The terminal exits once the connection is closed
+                client.writer.close()
+
+    async def _ask_client(self, client: _AttachedClient, kind: str, payload: Dict[str, Any]) -> Any:
+        """Push a question to the given terminal and wait for the answer"""
+        request_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        client.pending[request_id] = future
+        try:
+            await write_message(client.writer, {
+                "type": "request",
+                "id": request_id,
+                "kind": kind,
+                "payload": payload
+            })
+            return await future
+        except asyncio.CancelledError:
+            # Withdraw the question, the terminal stops waiting for an answer to it
+            try:
+                await write_message(client.writer, {"type": "cancel", "id": request_id})
+            except (ConnectionError, OSError):
+                pass
+            raise
+        finally:
+            client.pending.pop(request_id, None)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one attached terminal until it disconnects"""
+        hello = await read_message(reader)
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            writer.close()
+            return
+        if not isinstance(self.address, str) and not hmac.compare_digest(str(hello.get("secret", "")), attach_secret()):
+            # Any local user can reach a TCP port, only the owner can read the secret
+            logger.warning("Rejected a terminal without the attach secret")
+            writer.close()
+            return
+
+        client = _AttachedClient(reader, writer)
+        token = hello.get("token")
+        if token is not None:
+            # One-shot terminal started for a single question
+            waiter = self._spawn_waiters.get(token)
+            if waiter is None or waiter.done():
+                writer.close()
+                return
+            waiter.set_result(client)
+        else:
+            self._clients.append(client)
+            logger.info("Terminal attached")
+        try:
+            await write_message(writer, {"type": "welcome", "version": PROTOCOL_VERSION})
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                if message.get("type") == "response":
+                    future = client.pending.get(message.get("id"))
+                    if future is not None and not future.done():
+                        future.set_result(message.get("result"))
+        except (ConnectionError, ValueError) as e:
+            logger.warning(f"Attached terminal error: {e}")
+        finally:
+            for future in client.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Attached terminal disconnected"))
+            writer.close()
+            if client in self._clients:
+                self._clients.remove(client)
+                logger.info("Terminal detached")
+
+
+# ---------------------------------------------------------------------------
+# Terminal side
+# ---------------------------------------------------------------------------
+
+class QuestionWithdrawn(Exception):
+    """The server withdrew the question whose answer is being read"""
+
+
+class _TerminalInput:
+    """
+    Lines typed in the terminal, read from the stdin descriptor with select so
+    that waiting for them ends as soon as the server withdraws the question
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._wake_read, self._wake_write = os.pipe()
+        self._withdrawn = threading.Event()
+
+    def withdraw(self):
+        """Interrupt the line being read, called from the event loop"""
+        self._withdrawn.set()
+        os.write(self._wake_write, b"x")
+
+    def reset(self):
+        """Get ready for the next question, dropping what was typed for a withdrawn one"""
+        if self._withdrawn.is_set():
+            self._withdrawn.clear()
+            while select.select([self._wake_read], [], [], 0)[0]:
+                os.read(self._wake_read, 64)
+            self._buffer = b""
+            if os.isatty(0):
+                import termios
+                termios.tcflush(0, termios.TCIFLUSH)
+
+    def readline(self, prompt: str = "") -> str:
+        """
+        Read one line like input()
+
+        Raises:
+            QuestionWithdrawn: The question was withdrawn while waiting
+            EOFError: The input was closed
+        """
+        if prompt:
+            print(prompt, end="", flush=True)
+        while b"\n" not in self._buffer:
+            if self._withdrawn.is_set():
+                raise QuestionWithdrawn()
+            readable, _, _ = select.select([0, self._wake_read], [], [])
+            if self._wake_read in readable:
+                raise QuestionWithdrawn()
+            chunk = os.read(0, 4096)
+            if not chunk:
+                if not self._buffer:
+                    raise EOFError()
+                chunk = b"\n"
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
+# select() does not work on console input on Windows, reads there cannot be interrupted
+_terminal_input = _TerminalInput() if os.name != "nt" else None
+
+
+def _input(prompt: str = "") -> str:
+    """input() that ends with QuestionWithdrawn when the server withdraws the question"""
+    if _terminal_input is None:
+        return input(prompt)
+    return _terminal_input.readline(prompt)
+
+
+def _read_multiline(end_marker: str, first_line: Optional[str] = None) -> str:
+    """Read lines until a line containing only the end marker, starting with first_line when already read"""
+    input_lines = []
+    line = _input() if first_line is None else first_line
+    while line.strip() != end_marker:
+        input_lines.append(line)
+        line = _input()
+    return "\n".join(input_lines)
+
+
+def _show_history(console, entries: List[Dict[str, Any]], ui_texts: Dict[str, str]):
+    """List earlier answers numbered for !N, by their first line"""
+    from rich.markup import escape
+
+    if not entries:
+        console.print(ui_texts.get('history_no_match', 'No earlier answers found'), style="dim")
+        return
+    for i, entry in enumerate(entries, 1):
+        answer = entry["answer"].strip()
+        first_line = answer.splitlines()[0] if answer else ""
+        console.print(f"  [bold]!{i}[/bold] {escape(first_line[:max(20, console.width - 8)])}", highlight=False)
+
+
+def _read_with_history(console, prompt: str, history: Dict[str, Any], ui_texts: Dict[str, str]) -> str:
+    """
+    Read an answer like _read_multiline, offering earlier answers: a first line
+    ?words lists those matching the words, !N answers with listed answer N
+
+    Args:
+        console: Rich console
+        prompt: Prompt being answered, its earlier answers are listed first
+        history: Path of the answer history database and number of answers listed
+        ui_texts: Texts of the information request
+
+    Returns:
+        User input information
+    """
+    from ui.answer_history import AnswerHistory
+
+    end_marker = ui_texts.get('end_marker', 'END')
+    input_prompt = f"{ui_texts.get('input_prompt', 'Input')}: "
+    try:
+        store = AnswerHistory(history['path'], max_entries=0)
+    except Exception as e:
+        logger.warning(f"Answer history unavailable: {e}")
+        print(input_prompt, end="", flush=True)
+        return _read_multiline(end_marker)
+    try:
+        limit = int(history.get('limit', 8))
+        entries = store.search("", prompt, limit)
+        if entries:
+            _show_history(console, entries, ui_texts)
+        console.print(ui_texts.get('history_tip', 'Enter ?words to search earlier answers, !N to reuse answer N'), style="dim")
+        while True:
+            print(input_prompt, end="", flush=True)
+            line = _input()
+            command = line.strip()
+            if command.startswith("?"):
+                entries = store.search(command[1:], prompt, limit)
+                _show_history(console, entries, ui_texts)
+                continue
+            if command.startswith("!") and command[1:].isdigit():
+                index = int(command[1:]) - 1
+                if 0 <= index < len(entries):
+                    console.print(entries[index]["answer"], highlight=False, markup=False)
+                    return entries[index]["answer"]
+                console.print(ui_texts.get('history_no_match', 'No earlier answers found'), style="bold red")
+                continue
+            return _read_multiline(end_marker, line)
+    finally:
+        store.close()
+
+
+def _ask_remember(ui_texts: Dict[str, str]) -> bool:
+    """Ask whether to remember the answer, only when the server offers it (answer cache enabled)"""
+    remember_prompt = ui_texts.get('remember_prompt')
+    if not remember_prompt:
+        return False
+    return _input(f"{remember_prompt} ").strip().lower() in ("y", "yes")
+
+
+def prompt_select_option(console, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render an option list in the terminal and read the user's choice
+
+    Args:
+        console: Rich console
+        payload: Question data with options, prompt and ui_texts
+
+    Returns:
+        Selection result dictionary
+    """
+    from rich.panel import Panel
+    from rich.markdown import Markdown
+
+    options = payload['options']
+    prompt = payload['prompt']
+    ui_texts = payload.get('ui_texts', {})
+    end_marker = ui_texts.get('end_marker', 'END')
+
+    md_content = f"# {prompt}\n\n"
+    for i, option in enumerate(options, 1):
+        if isinstance(option, dict):
+            title = option.get("title", option.get("name", option.get("description", f"Option {i}")))
+            description = option.get("description", "")
+            formatted_option = f"{title}"
+            if description:
+                formatted_option += f"\n   {description}"
+            md_content += f"{i}. {formatted_option}\n\n"
+        else:
+            md_content += f"{i}. {option}\n\n"
+    md_content += f"*{ui_texts.get('custom_input_tip', 'Enter 0 to provide a custom answer')}*"
+
+    console.print(Panel(Markdown(md_content), border_style="green"))
+
+    while True:
+        try:
+            user_choice = _input(f"{ui_texts.get('input_option', 'Enter your choice')}: ").strip()
+
+            if user_choice == "0":
+                console.print(ui_texts.get('custom_input', 'Enter your custom answer'))
+                console.print(ui_texts.get('multiline_tip', f'Enter {end_marker} on a separate line to finish.'))
+                result = {
+                    "selected_index": -1,
+                    "selected_option": None,
+                    "custom_input": _read_multiline(end_marker),
+                    "is_custom": True
+                }
+            else:
+                choice_index = int(user_choice) - 1
+                if not 0 <= choice_index < len(options):
+                    raise ValueError(user_choice)
+                result = {
+                    "selected_index": choice_index,
+                    "selected_option": options[choice_index],
+                    "custom_input": "",
+                    "is_custom": False
+                }
+            if _ask_remember(ui_texts):
+                result["remember"] = True
+            return result
+        except ValueError:
+            console.print(ui_texts.get('invalid_option', 'Invalid option, please try again'), style="bold red")
+
+
+def prompt_additional_info(console, payload: Dict[str, Any]) -> Union[str, Dict[str, Any]]:
+    """
+    Render an information request in the terminal and read the user's answer
+
+    Args:
+        console: Rich console
+        payload: Question data with prompt, ui_texts and, when the answer history
+            is enabled, history (path and limit)
+
+    Returns:
+        User input information, {"text": ..., "remember": True} when the user
+        asked to remember it
+    """
+    from rich.markdown import Markdown
+
+    prompt = payload['prompt']
+    ui_texts = payload.get('ui_texts', {})
+    end_marker = ui_texts.get('end_marker', 'END')
+
+    md_content = f"### {prompt}\n\n"
+    md_content += f"\n{ui_texts.get('multiline_tip', f'Enter {end_marker} on a separate line to finish.')}\n"
+    console.print(Markdown(md_content))
+
+    history = payload.get('history')
+    if history:
+        text = _read_with_history(console, prompt, history, ui_texts)
+    else:
+        print(f"{ui_texts.get('input_prompt', 'Input')}: ", end="", flush=True)
+        text = _read_multiline(end_marker)
+    if _ask_remember(ui_texts):
+        # Flagged for the answer cache
+        return {"text": text, "remember": True}
+    return text
+
+
+def prompt_questions(console, payload: Dict[str, Any]) -> List[Any]:
+    """
+    Render several questions one after another in the same terminal session
+
+    Args:
+        console: Rich console
+        payload: Questions (normalized by ui.ui.normalize_questions) with
+            select_texts, info_texts and ui_texts
+
+    Returns:
+        Answers in question order
+    """
+    questions = payload['questions']
+    ui_texts = payload.get('ui_texts', {})
+    counter = ui_texts.get('question_counter', 'Question {index} of {total}')
+
+    answers = []
+    for index, question in enumerate(questions, 1):
+        console.rule(counter.format(index=index, total=len(questions)))
+        if question["type"] == "select_option":
+            answers.append(prompt_select_option(console, {
+                'options': question['options'],
+                'prompt': question['prompt'],
+                'ui_texts': payload.get('select_texts', {})
+            }))
+        else:
+            answers.append(prompt_additional_info(console, {
+                'prompt': question['prompt'],
+                'ui_texts': payload.get('info_texts', {})
+            }))
+    return answers
+
+
+PROMPT_HANDLERS = {
+    "select_option": prompt_select_option,
+    "request_additional_info": prompt_additional_info,
+    "ask_questions": prompt_questions,
+}
+
+
+async def _receive_messages(reader: asyncio.StreamReader, queue: asyncio.Queue):
+    """Read messages into a queue, None marks the end of the connection"""
+    try:
+        while True:
+            message = await read_message(reader)
+            await queue.put(message)
+            if message is None:
+                return
+    except (ConnectionError, ValueError):
+        await queue.put(None)
+
+
+async def _serve_connection(
+    console,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    token: Optional[str] = None,
+    secret: Optional[str] = None
+):
+    """Answer questions pushed over one connection until it closes"""
+    loop = asyncio.get_running_loop()
+    hello = {"type": "hello", "version": PROTOCOL_VERSION}
+    if token is not None:
+        hello["token"] = token
+    if secret is not None:
+        hello["secret"] = secret
+    await write_message(writer, hello)
+    welcome = await read_message(reader)
+    if not isinstance(welcome, dict) or welcome.get("type") != "welcome":
+        console.print("Unexpected handshake from server", style="bold red")
+        return
+    if token is None:
+        console.print("[bold green]Attached, waiting for questions...[/bold green]")
+
+    # Keep reading while the user types, the server may withdraw the question meanwhile
+    messages = asyncio.Queue()
+    receiver = asyncio.create_task(_receive_messages(reader, messages))
+    backlog = collections.deque()  # Questions pushed while another one is answered
+    try:
+        while True:
+            message = backlog.popleft() if backlog else await messages.get()
+            if message is None:
+                return
+            if message.get("type") != "request":
+                continue
+            handler = PROMPT_HANDLERS.get(message.get("kind"))
+            if handler is None:
+                await write_message(writer, {
+                    "type": "response",
+                    "id": message["id"],
+                    "result": f"Error: unsupported question type {message.get('kind')}"
+                })
+                continue
+
+            if _terminal_input is not None:
+                _terminal_input.reset()
+            # Reading the answer blocks, keep it off the event loop
+            answer = loop.run_in_executor(None, handler, console, message.get("payload", {}))
+            withdrawn = False
+            closed = False
+            while not answer.done():
+                incoming = asyncio.ensure_future(messages.get())
+                await asyncio.wait({answer, incoming}, return_when=asyncio.FIRST_COMPLETED)
+                if not incoming.done():
+                    incoming.cancel()
+                    break
+                other = incoming.result()
+                if other is None or (other.get("type") == "cancel" and other.get("id") == message["id"]):
+                    if token is not None:
+                        # One-shot window: nothing else to answer, close it right away
+                        console.print("\nThe question was withdrawn", style="yellow")
+                        os._exit(0)
+                    if not withdrawn:
+                        if _terminal_input is not None:
+                            # Stop waiting for the answer, the next question is read afresh
+                            _terminal_input.withdraw()
+                            console.print("\nThe question was withdrawn by the server", style="yellow")
+                        else:
+                            console.print("\nThe question was withdrawn by the server, your answer will be ignored", style="yellow")
+                    withdrawn = True
+                    closed = other is None
+                    if closed:
+                        break
+                elif other.get("type") == "request":
+                    backlog.append(other)
+
+            try:
+                result: Any = await answer
+            except QuestionWithdrawn:
+                result = None
+            except (EOFError, KeyboardInterrupt):
+                raise
+            except Exception as e:
+                result = f"Error: {str(e)}"
+            if closed:
+                return
+            if not withdrawn:
+                await write_message(writer, {"type": "response", "id": message["id"], "result": result})
+            if token is not None:
+                return
+            console.rule()
+    finally:
+        receiver.cancel()
+
+
+async def run_attach_client(address: AttachAddress, retry_interval: float = 1.0, token: Optional[str] = None):
+    """
+    Run the attached terminal, reconnecting whenever the server goes away
+
+    Args:
+        address: Attach server Unix socket path or (host, port)
+        retry_interval: Seconds between connection attempts
+        token: Answer only the question identified by this token and exit,
+            used by the windows the server opens itself
+    """
+    from rich.console import Console
+
+    console = Console()
+    secret = None if isinstance(address, str) else attach_secret()
+    if token is not None:
+        reader, writer = await _open_connection(address)
+        try:
+            await _serve_connection(console, reader, writer, token, secret)
+        finally:
+            writer.close()
+        return
+
+    waiting_shown = False
+    while True:
+        try:
+            reader, writer = await _open_connection(address)
+        except OSError:
+            if not waiting_shown:
+                console.print(f"Waiting for MCP server at {format_address(address)}...", style="yellow")
+                waiting_shown = True
+            await asyncio.sleep(retry_interval)
+            continue
+
+        waiting_shown = False
+        try:
+            await _serve_connection(console, reader, writer, secret=secret)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+        console.print("Server disconnected", style="yellow")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Local IPC helpers
+Length-prefixed JSON messages exchanged over local sockets between
+the MCP server and its helper processes
+"""
+
+import json
+import struct
+import asyncio
+from typing import Any, Optional
+
+# 4-byte big-endian length header followed by a UTF-8 JSON body
+HEADER = struct.Struct(">I")
+
+# Upper bound for a single message, protects against garbage on the socket
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+def encode_message(message: Any) -> bytes:
+    """
+    Encode a message as a length-prefixed frame
+
+    Args:
+        message: JSON serializable object
+
+    Returns:
+        Frame bytes ready to be written to a stream
+    """
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    if len(body) > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message too large: {len(body)} bytes")
+    return HEADER.pack(len(body)) + body
+
+
+def decode_body(body: bytes) -> Any:
+    """Decode the body of a frame"""
+    return json.loads(body.decode("utf-8"))
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Any]:
+    """
+    Read one message from an asyncio stream
+
+    Args:
+        reader: Stream to read from
+
+    Returns:
+        Decoded message, or None if the peer closed the connection
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message too large: {length} bytes")
+    try:
+        body = await reader.readexactly(length)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return decode_body(body)
+
+
+async def write_message(writer: asyncio.StreamWriter, message: Any):
+    """
+    Write one message to an asyncio stream
+
+    Args:
+        writer: Stream to write to
+        message: JSON serializable object
+    """
+    writer.write(encode_message(message))
+    await writer.drain()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Interaction Journal
+Structured JSONL record of the interactions (questions asked, answers given,
+requests opened and closed by the backends). Recording only queues the event,
+a background thread serializes the queued events, writes them in batches and
+rotates the file by size. Payloads are cut to short previews.
+
+The journal is readable by its user only. Server processes sharing it take a
+lock file around each write, so only one of them rotates it.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from ui.private_files import private_directory, private_file
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: processes sharing a journal are not serialized
+    fcntl = None
+
+logger = logging.getLogger('Journal')
+
+# Events queued at most, further events are dropped until the writer catches up
+MAX_QUEUED = 10000
+
+
+def default_journal_path() -> str:
+    """Journal file used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "journal.jsonl")
+
+
+def preview(value: Any, limit: int) -> Any:
+    """
+    Short form of a payload
+
+    Args:
+        value: Text, number or JSON serializable structure
+        limit: Characters kept, 0 for no limit
+
+    Returns:
+        The value itself when short, otherwise its JSON text cut to limit characters
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    if limit > 0 and len(text) > limit:
+        return text[:limit] + f"... ({len(text)} chars)"
+    return value
+
+
+class Journal:
+    """JSONL journal written by a background thread"""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+        preview_chars: int = 200,
+        flush_interval: float = 1.0
+    ):
+        """
+        Initialize journal and start its writer thread
+
+        Args:
+            path: Journal file, rotated to path.1 ... path.<backups>
+            max_bytes: Size from which the file is rotated, 0 for no rotation
+            backups: Rotated files kept
+            preview_chars: Characters kept of each payload, 0 for no limit
+            flush_interval: Seconds events are gathered before they are written
+
+        Raises:
+            PermissionError: The journal is a symbolic link or belongs to another user
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.preview_chars = preview_chars
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(MAX_QUEUED)
+        self._closed = False
+        private_file(path)
+        self._thread = threading.Thread(target=self._run, name="Journal", daemon=True)
+        self._thread.start()
+
+    def record(self, event: str, **fields: Any):
+        """
+        Queue an event, never blocks
+
+        Args:
+            event: Event name, e.g. question, answer, request_opened
+            fields: Event data, payloads are cut to previews when written
+        """
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(dict(fields, ts=time.time(), event=event))
+        except queue.Full:
+            self.dropped += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Events waiting to be written and events dropped since start"""
+        return {"queued": self._queue.qsize(), "dropped": self.dropped}
+
+    def close(self):
+        """Write the queued events and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _line(self, entry: Dict[str, Any]) -> str:
+        """JSON line of an event with its payloads cut to previews"""
+        data = {"ts": round(entry.pop("ts"), 3), "event": entry.pop("event")}
+        for name, value in entry.items():
+            try:
+                data[name] = preview(value, self.preview_chars)
+            except (TypeError, ValueError, RuntimeError):
+                # Changed while serialized, or not serializable at all
+                data[name] = repr(value)[:self.preview_chars or None]
+        return json.dumps(data, ensure_ascii=False, default=str) + "\n"
+
+    def _run(self):
+        """Gather events for flush_interval, then write them in one go"""
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if batch[-1] is None or remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+                # Events queued after close was called
+                while not self._queue.empty():
+                    entry = self._queue.get_nowait()
+                    if entry is not None:
+                        batch.append(entry)
+            if batch:
+                self._write("".join(self._line(entry) for entry in batch))
+
+    @contextmanager
+    def _locked(self):
+        """Hold the journal's lock file, other server processes write the same journal"""
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(private_file(self.path + ".lock"), os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _write(self, text: str):
+        """Append to the journal, rotating it first when the text would not fit"""
+        try:
+            with self._locked():
+                # Created 0600 again after a rotation, a file of another user is refused
+                private_file(self.path)
+                size = os.path.getsize(self.path)
+                if self.max_bytes > 0 and size > 0 and size + len(text.encode("utf-8")) > self.max_bytes:
+                    self._rotate()
+                    private_file(self.path)
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_NOFOLLOW", 0))
+                with os.fdopen(fd, "a", encoding="utf-8") as f:
+                    f.write(text)
+        except OSError as e:
+            logger.error(f"Failed to write journal {self.path}: {e}")
+
+    def _rotate(self):
+        """Shift path.N-1 to path.N ... path to path.1, dropping the oldest"""
+        if self.backups <= 0:
+            os.unlink(self.path)
+            return
+        for i in range(self.backups, 0, -1):
+            source = self.path if i == 1 else f"{self.path}.{i - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i}")
+
+
+# Journal of this process, created from the journal configuration on first use
+_journal: Optional[Journal] = None
+_journal_lock = threading.Lock()
+_journal_disabled = False
+
+
+def get_journal() -> Optional[Journal]:
+    """
+    Get the journal of this process
+
+    Returns:
+        Journal instance, None when the journal is disabled
+    """
+    global _journal, _journal_disabled
+    if _journal is None and not _journal_disabled:
+        with _journal_lock:
+            if _journal is None and not _journal_disabled:
+                from config_manager import get_journal_config
+
+                journal_config = get_journal_config()
+                if not journal_config["enabled"]:
+                    _journal_disabled = True
+                    return None
+                try:
+                    _journal = Journal(
+                        journal_config["path"] or default_journal_path(),
+                        max_bytes=int(journal_config["max_bytes"]),
+                        backups=int(journal_config["backups"]),
+                        preview_chars=int(journal_config["preview_chars"]),
+                        flush_interval=float(journal_config["flush_interval"])
+                    )
+                except OSError as e:
+                    # PermissionError for a journal of another user
+                    logger.error(f"Journal disabled, cannot create it: {e}")
+                    _journal_disabled = True
+                    return None
+                atexit.register(_journal.close)
+    return _journal
+
+
+def record(event: str, **fields: Any):
+    """
+    Queue an event in the journal of this process, nothing happens when it is disabled
+
+    Args:
+        event: Event name
+        fields: Event data, payloads are cut to previews when written
+    """
+    journal = get_journal()
+    if journal is not None:
+        journal.record(event, **fields)
+
+
+def close():
+    """Write the queued events of the journal of this process and stop it, if it was created"""
+    if _journal is not None:
+        _journal.close()
+
+
+def stats() -> Dict[str, int]:
+    """Statistics of the journal of this process, empty when it was not created"""
+    return _journal.stats() if _journal is not None else {}
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Metrics
+Counters and histograms of the tool calls (where the seconds go: backend
+startup, queueing, rendering, the human, post-processing), rendered in the
+Prometheus text format for /metrics and as a dictionary for the server_stats tool
+"""
+
+import bisect
+import contextvars
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('Metrics')
+
+# Histogram buckets in seconds, human answers take up to minutes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        """Add amount to the counter of the given label values"""
+        key = tuple(str(value) for value in label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labels, key)} {_format_number(value)}"
+            for key, value in self.samples()
+        ]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.labels, key), value=value) for key, value in self.samples()]
+
+
+class Histogram:
+    """Distribution of observed durations per label combination"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [bucket counts..., count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """Record one observation for the given label values"""
+        key = tuple(str(label) for label in label_values)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def samples(self) -> List[Tuple[LabelValues, List[float]]]:
+        with self._lock:
+            return sorted((key, list(counts)) for key, counts in self._values.items())
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, counts in self.samples():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {int(counts[-2])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_number(counts[-1])}")
+        return lines
+
+    def _quantile(self, counts: List[float], q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile"""
+        total = counts[-2]
+        if not total:
+            return None
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            if cumulative >= q * total:
+                return bound
+        return math.inf
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        result = []
+        for key, counts in self.samples():
+            count = int(counts[-2])
+            p50 = self._quantile(counts, 0.5)
+            p95 = self._quantile(counts, 0.95)
+            result.append(dict(
+                zip(self.labels, key),
+                count=count,
+                sum=round(counts[-1], 6),
+                avg=round(counts[-1] / count, 6) if count else None,
+                p50_le=None if p50 in (None, math.inf) else p50,
+                p95_le=None if p95 in (None, math.inf) else p95
+            ))
+        return result
+
+
+class MetricsRegistry:
+    """Metrics of this process plus gauges read when the metrics are collected"""
+
+    def __init__(self, namespace: str = "mcp_interactive"):
+        self.namespace = namespace
+        self.started_at = time.time()
+        self._metrics: Dict[str, Any] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], Dict[str, float]]]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter, name without namespace and _total suffix"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(f"{self.namespace}_{name}", documentation, labels)
+            return self._metrics[name]
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Histogram:
+        """Get or create a histogram, name without namespace"""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(f"{self.namespace}_{name}", documentation, labels)
+            return self._metrics[name]
+
+    def gauge(self, name: str, documentation: str, collect: Callable[[], Dict[str, float]]):
+        """
+        Register gauges read when the metrics are collected
+
+        Args:
+            name: Gauge name without namespace
+            documentation: Help text
+            collect: Returns {label value of "kind": current value}
+        """
+        with self._lock:
+            self._gauges[name] = (documentation, collect)
+
+    def _collect_gauges(self) -> Dict[str, Dict[str, float]]:
+        values = {}
+        for name, (_, collect) in list(self._gauges.items()):
+            try:
+                values[name] = collect()
+            except Exception as e:
+                # One failing collector must not break the whole scrape
+                logger.warning(f"Failed to collect gauge {name}: {e}")
+                values[name] = {}
+        return values
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {self.namespace}_uptime_seconds Seconds since the server started",
+            f"# TYPE {self.namespace}_uptime_seconds gauge",
+            f"{self.namespace}_uptime_seconds {_format_number(round(time.time() - self.started_at, 3))}"
+        ]
+        for metric in list(self._metrics.values()):
+            exposed = f"{metric.name}_total" if metric.kind == "counter" else metric.name
+            lines.append(f"# HELP {exposed} {metric.documentation}")
+            lines.append(f"# TYPE {exposed} {metric.kind}")
+            lines.extend(metric.render())
+        for name, values in self._collect_gauges().items():
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {self._gauges[name][0]}")
+            lines.append(f"# TYPE {full_name} gauge")
+            for kind, value in sorted(values.items()):
+                lines.append(f'{full_name}{{kind="{_escape(kind)}"}} {_format_number(value)}')
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as a dictionary"""
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "metrics": {name: metric.snapshot() for name, metric in list(self._metrics.items())},
+            "gauges": self._collect_gauges()
+        }
+
+
+# Registry of this process
+registry = MetricsRegistry()
+
+tool_calls = registry.counter(
+    "tool_calls", "Tool calls by outcome", ("tool", "ui", "client", "outcome")
+)
+tool_call_seconds = registry.histogram(
+    "tool_call_seconds", "Duration of tool calls from arrival to result", ("tool", "ui", "client")
+)
+stage_seconds = registry.histogram(
+    "stage_seconds",
+    "Time spent per stage of a tool call: queue (waiting for a slot), interaction "
+    "(shown until answered), post (after the answer until the result)",
+    ("tool", "ui", "stage")
+)
+backend_start_seconds = registry.histogram(
+    "backend_start_seconds", "Startup of a UI backend: load (import and create) and prewarm", ("ui", "phase")
+)
+render_seconds = registry.histogram(
+    "render_seconds", "Time until a question is visible to the user", ("ui",)
+)
+
+
+class ToolCall:
+    """Timing of one tool call, recorded when it ends"""
+
+    def __init__(self, tool: str, ui: str, client: str):
+        self.tool = tool
+        self.ui = ui
+        self.client = client
+        self.started = time.perf_counter()
+        self.answered_at = None
+        self.outcome = "answered"
+
+    def record(self):
+        """Count the call with its outcome and record its duration"""
+        now = time.perf_counter()
+        tool_calls.inc(self.tool, self.ui, self.client, self.outcome)
+        tool_call_seconds.observe(now - self.started, self.tool, self.ui, self.client)
+        if self.answered_at is not None:
+            stage_seconds.observe(now - self.answered_at, self.tool, self.ui, "post")
+
+
+# Tool call being served, stages and outcome are recorded on it
+current_call: contextvars.ContextVar = contextvars.ContextVar("current_call", default=None)
+
+
+def set_outcome(outcome: str):
+    """
+    Set the outcome of the tool call being served
+
+    Args:
+        outcome: answered, auto_answered, cached, recovered, timed_out, rejected, disconnected, invalid
+    """
+    call = current_call.get()
+    if call is not None:
+        call.outcome = outcome
+
+
+def observe_render(ui: str, seconds: float):
+    """
+    Record how long a backend took to show a question
+
+    Args:
+        ui: UI type
+        seconds: From the request reaching the backend until the question is visible
+    """
+    render_seconds.observe(seconds, ui)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pending Request Store
+Questions being shown and answers not yet handed to the client, kept in a
+SQLite database so they survive a restart of the server process (IDE reload,
+crash). A restarted server adopts what a dead process left behind: it shows the
+open questions again and hands their answers to the client asking again. Only
+the client that asked a question can claim its answer, and only for a few
+minutes after it was given.
+
+Reads are served from memory. Writes are queued and committed in batches by a
+background thread (group commit), so a tool call never waits for the disk.
+"""
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from ui.private_files import private_directory, private_file
+
+logger = logging.getLogger('PendingStore')
+
+# Record states
+PENDING = "pending"
+ANSWERED = "answered"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    question TEXT NOT NULL,
+    state TEXT NOT NULL,
+    answer TEXT,
+    pid INTEGER NOT NULL,
+    created REAL NOT NULL,
+    owner TEXT NOT NULL DEFAULT '',
+    answered REAL
+)
+"""
+
+# Columns added after the first version of the table
+_ADDED_COLUMNS = {"owner": "TEXT NOT NULL DEFAULT ''", "answered": "REAL"}
+
+
+def default_store_path() -> str:
+    """Store file used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "pending.sqlite3")
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process exists, processes of other users count as alive"""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # No signal 0 on Windows. Without psutil no process can be told dead,
+        # so the records of other servers are never adopted.
+        try:
+            import psutil
+        except ImportError:
+            return True
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PendingRecord:
+    """A question shown by this process, or adopted from a dead one"""
+
+    __slots__ = ("id", "key", "tool", "question", "state", "answer", "created", "owner", "answered", "adopted")
+
+    def __init__(self, record_id: str, key: str, tool: str, question: Dict[str, Any], created: float, owner: str):
+        self.id = record_id
+        self.key = key
+        self.tool = tool
+        self.question = question
+        self.state = PENDING
+        self.answer = None
+        self.created = created
+        self.owner = owner
+        self.answered = None
+        self.adopted = False
+
+
+class PendingStore:
+    """Pending questions and undelivered answers of this process, persisted with group commit"""
+
+    def __init__(self, path: str, max_age: float = 86400.0, flush_interval: float = 0.05, claim_ttl: float = 300.0):
+        """
+        Open the store and adopt the records of server processes that are gone
+
+        Args:
+            path: SQLite database file
+            max_age: Seconds after which a left-behind record is dropped instead of adopted
+            flush_interval: Seconds writes are gathered before they are committed together
+            claim_ttl: Seconds an answer given to an adopted question can be claimed
+
+        Raises:
+            PermissionError: The database is a symbolic link or belongs to another user
+        """
+        self.path = path
+        self.max_age = max_age
+        self.flush_interval = flush_interval
+        self.claim_ttl = claim_ttl
+        self.pid = os.getpid()
+        self._records: Dict[str, PendingRecord] = {}
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._closed = False
+        # Created 0600 before SQLite opens it, its journal files get the same mode
+        private_file(path)
+        self.orphans = self._adopt()
+        self._thread = threading.Thread(target=self._run, name="PendingStore", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(_SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(pending)")}
+        for name, definition in _ADDED_COLUMNS.items():
+            if name not in columns:
+                connection.execute(f"ALTER TABLE pending ADD COLUMN {name} {definition}")
+        return connection
+
+    def _adopt(self) -> List[PendingRecord]:
+        """
+        Take over the records of dead processes, dropping questions older than
+        max_age and answers older than claim_ttl
+
+        Returns:
+            Adopted questions still waiting for an answer
+        """
+        now = time.time()
+        adopted = []
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT id, key, tool, question, state, answer, pid, created, owner, answered FROM pending"
+            ).fetchall()
+            for record_id, key, tool, question, state, answer, pid, created, owner, answered in rows:
+                if _process_alive(pid):
+                    continue
+                if created < now - self.max_age or (state == ANSWERED and (answered or 0) < now - self.claim_ttl):
+                    connection.execute("DELETE FROM pending WHERE id = ?", (record_id,))
+                    continue
+                connection.execute("UPDATE pending SET pid = ? WHERE id = ?", (self.pid, record_id))
+                record = PendingRecord(record_id, key, tool, json.loads(question), created, owner)
+                record.state = state
+                record.answer = json.loads(answer) if answer is not None else None
+                record.answered = answered
+                record.adopted = True
+                self._records[record_id] = record
+                if state == PENDING:
+                    adopted.append(record)
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        if self._records:
+            logger.warning(
+                f"Adopted {len(adopted)} unanswered questions and "
+                f"{len(self._records) - len(adopted)} undelivered answers of an earlier server process"
+            )
+        return adopted
+
+    def _write(self, sql: str, *params: Any):
+        if not self._closed:
+            self._queue.put((sql, params))
+
+    def open(self, key: str, tool: str, question: Dict[str, Any], owner: str = "") -> str:
+        """
+        Record a question being shown
+
+        Args:
+            key: question_hash of the question
+            tool: Tool name
+            question: Question data (prompt, options, questions)
+            owner: Identity of the client asking, the only one that may claim the answer
+
+        Returns:
+            Record ID
+        """
+        record = PendingRecord(uuid.uuid4().hex, key, tool, question, time.time(), owner)
+        self._records[record.id] = record
+        self._write(
+            "INSERT INTO pending (id, key, tool, question, state, pid, created, owner) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            record.id, key, tool, json.dumps(question, ensure_ascii=False), PENDING, self.pid, record.created, owner
+        )
+        return record.id
+
+    def answer(self, record_id: str, answer: Any):
+        """Record the answer of an adopted question until its client asks again"""
+        record = self._records.get(record_id)
+        if record is None:
+            return
+        record.state = ANSWERED
+        record.answer = answer
+        record.answered = time.time()
+        self._write(
+            "UPDATE pending SET state = ?, answer = ?, answered = ? WHERE id = ?",
+            ANSWERED, json.dumps(answer, ensure_ascii=False), record.answered, record_id
+        )
+
+    def discard(self, record_id: str):
+        """Forget a question nobody needs an answer to anymore"""
+        if self._records.pop(record_id, None) is not None:
+            self._write("DELETE FROM pending WHERE id = ?", record_id)
+
+    def claim(self, key: str, owner: str) -> Optional[PendingRecord]:
+        """
+        Take the answer given to an adopted question, it is removed from the store.
+        Answers older than claim_ttl are dropped instead.
+
+        Args:
+            key: question_hash of the question
+            owner: Identity of the client asking, must be the one that asked the question
+
+        Returns:
+            Answered record, None if the client has no answer waiting for the question
+        """
+        horizon = time.time() - self.claim_ttl
+        for record in list(self._records.values()):
+            if record.state != ANSWERED or not record.adopted:
+                continue
+            if record.answered < horizon:
+                self.discard(record.id)
+            elif record.key == key and record.owner == owner:
+                self.discard(record.id)
+                return record
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Records of this process per state"""
+        counts = {PENDING: 0, ANSWERED: 0}
+        for record in list(self._records.values()):
+            counts[record.state] += 1
+        return counts
+
+    def close(self):
+        """Commit the queued writes and stop, later changes are not persisted"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        """Commit the writes gathered during flush_interval in one transaction"""
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+            if not batch:
+                continue
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                for sql, params in batch:
+                    connection.execute(sql, params)
+                connection.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write pending store {self.path}: {e}")
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+        connection.close()
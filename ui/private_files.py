@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Private Files
+Per-user directory holding the stores of the server (answer cache, pending
+requests, answer history, journal, profiles). Files there, and files at
+configured paths, are only opened when they belong to the current user, and
+are kept readable by that user only, so no other local user can read or plant
+answers. Unix sockets are only used when the process listening on them runs
+as the current user.
+"""
+
+import os
+import secrets
+import socket
+import stat
+import struct
+import sys
+from typing import Optional
+
+# Directory name below the user's cache directory
+DIRECTORY_NAME = "mcp-interactive"
+
+
+def _user_cache_directory() -> str:
+    """Cache directory of the current user (XDG_CACHE_HOME, LOCALAPPDATA on Windows)"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA")
+        if base:
+            return base
+    return os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+
+def check_private(path: str):
+    """
+    Make sure an existing file or directory belongs to the current user and only
+    they can access it; a more permissive mode is tightened
+
+    Args:
+        path: File or directory, nothing is checked when it does not exist
+
+    Raises:
+        PermissionError: It is a symbolic link or owned by another user
+    """
+    if not hasattr(os, "getuid"):
+        # Windows: the user's profile directories are private already
+        return
+    try:
+        info = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if stat.S_ISLNK(info.st_mode):
+        raise PermissionError(f"Refusing to use {path}: it is a symbolic link")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"Refusing to use {path}: it is owned by another user (uid {info.st_uid})")
+    mode = 0o700 if stat.S_ISDIR(info.st_mode) else 0o600
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(path, stat.S_IMODE(info.st_mode) & mode)
+
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """
+    User ID of the process at the other end of a connected Unix socket
+
+    Args:
+        sock: Connected Unix socket
+
+    Returns:
+        User ID, None where the platform does not tell
+    """
+    try:
+        if hasattr(socket, "SO_PEERCRED"):
+            # Linux: struct ucred {pid_t pid; uid_t uid; gid_t gid;}
+            credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            return struct.unpack("3i", credentials)[1]
+        if sys.platform == "darwin" or "bsd" in sys.platform:
+            # LOCAL_PEERCRED at level SOL_LOCAL (0): struct xucred {u_int cr_version; uid_t cr_uid; ...}
+            credentials = sock.getsockopt(0, getattr(socket, "LOCAL_PEERCRED", 1), 76)
+            return struct.unpack_from("2I", credentials)[1]
+    except OSError:
+        pass
+    return None
+
+
+def check_peer(sock: socket.socket, path: str):
+    """
+    Make sure the process listening on a Unix socket runs as the current user,
+    judged by the owner of the socket file where the platform does not tell
+
+    Args:
+        sock: Socket connected to path
+        path: Socket path
+
+    Raises:
+        PermissionError: The socket belongs to another user
+    """
+    if not hasattr(os, "getuid"):
+        return
+    uid = peer_uid(sock)
+    if uid is None:
+        uid = os.lstat(path).st_uid
+    if uid != os.getuid():
+        raise PermissionError(f"Refusing to use {path}: it is served by another user (uid {uid})")
+
+
+def private_directory(*parts: str) -> str:
+    """
+    Per-user directory of the server's files, created with mode 0700
+
+    Args:
+        parts: Subdirectory below it
+
+    Returns:
+        Directory path
+
+    Raises:
+        PermissionError: The directory exists and belongs to another user
+    """
+    path = os.path.join(_user_cache_directory(), DIRECTORY_NAME)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    check_private(path)
+    for part in parts:
+        path = os.path.join(path, part)
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        check_private(path)
+    return path
+
+
+def private_file(path: str) -> str:
+    """
+    Create a file with mode 0600 unless it exists, then check it belongs to the
+    current user. Its directory is created with mode 0700 when missing.
+
+    Args:
+        path: File path
+
+    Returns:
+        The path
+
+    Raises:
+        PermissionError: The file is a symbolic link or owned by another user
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+    except FileExistsError:
+        pass
+    check_private(path)
+    return path
+
+
+def private_secret(name: str) -> str:
+    """
+    Secret shared by the current user's processes, e.g. for loopback TCP where
+    Unix sockets are unavailable. Kept in a 0600 file of the private directory
+    and created on first use.
+
+    Args:
+        name: File name in the private directory
+
+    Returns:
+        Secret text
+    """
+    path = private_file(os.path.join(private_directory(), name))
+    with open(path, encoding="utf-8") as f:
+        secret = f.read().strip()
+    if not secret:
+        secret = secrets.token_urlsafe(32)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(secret)
+    return secret
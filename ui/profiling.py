@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Per-call Profiling
+Runs tool calls under cProfile and writes one profile per call, keyed by tool,
+UI backend and request ID, to a directory that keeps the latest profiles.
+Calls that kept the event loop busy longer than a threshold are kept apart,
+so blocking code shows up in real traces.
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from ui.private_files import check_private, private_directory
+
+logger = logging.getLogger('Profiling')
+
+# Time spent in these calls is the event loop waiting for I/O, not work
+_IDLE_FUNCTIONS = re.compile(r"of 'select\.|select\.select|GetQueuedCompletionStatus")
+
+
+def default_profile_directory() -> str:
+    """Profile directory used when none is configured, in the user's private directory"""
+    return private_directory("profiles")
+
+
+def busy_seconds(stats: pstats.Stats) -> float:
+    """Seconds the profiled thread was working, waiting in the selector excluded"""
+    busy = 0.0
+    for (filename, _, name), (_, _, tt, _, _) in stats.stats.items():
+        if filename == "~" and _IDLE_FUNCTIONS.search(name):
+            continue
+        busy += tt
+    return busy
+
+
+class CallProfiler:
+    """Profiles tool calls one at a time and rotates the written profiles"""
+
+    def __init__(self, directory: str, keep: int = 50, slow_threshold: float = 0.5, keep_slow: int = 200):
+        """
+        Initialize call profiler
+
+        Args:
+            directory: Directory the profiles are written to, slow ones to its slow subdirectory
+            keep: Latest profiles kept, older ones are deleted
+            slow_threshold: Busy seconds from which a call counts as slow
+            keep_slow: Slow profiles kept
+
+        Raises:
+            PermissionError: The directory is a symbolic link or belongs to another user
+        """
+        self.directory = directory
+        self.slow_directory = os.path.join(directory, "slow")
+        self.keep = keep
+        self.slow_threshold = slow_threshold
+        self.keep_slow = keep_slow
+        self._active = False
+        # Profiles are written from executor threads, one at a time so rotation sees them all
+        self._write_lock = threading.Lock()
+        # Profiles show the call stacks of the user's sessions, only they may read them
+        for path in (directory, self.slow_directory):
+            os.makedirs(path, mode=0o700, exist_ok=True)
+            check_private(path)
+
+    async def run(self, tool: str, ui: str, request_id: Optional[str], call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a tool call under the profiler
+
+        cProfile follows the event loop thread, so other tasks running at the same
+        time appear in the profile too. While a call is profiled, calls arriving
+        meanwhile run unprofiled.
+
+        Args:
+            tool: Tool name
+            ui: UI type
+            request_id: MCP request ID, a random one is used if None
+            call: Coroutine function performing the tool call
+
+        Returns:
+            Result of call
+        """
+        if self._active:
+            return await call()
+        self._active = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            return await call()
+        finally:
+            profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{tool}-{ui}-{self._safe(request_id or uuid.uuid4().hex[:8])}.prof"
+            # Written before the result is returned, off the event loop thread
+            await asyncio.get_running_loop().run_in_executor(None, self._save, profiler, name, elapsed)
+
+    @staticmethod
+    def _safe(text: str) -> str:
+        """Text usable in a file name"""
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", str(text))[:64]
+
+    def _save(self, profiler: cProfile.Profile, name: str, elapsed: float):
+        """Write a profile, slow calls to the slow directory, then rotate"""
+        try:
+            stats = pstats.Stats(profiler)
+            busy = busy_seconds(stats)
+            slow = busy >= self.slow_threshold
+            directory = self.slow_directory if slow else self.directory
+            with self._write_lock:
+                stats.dump_stats(os.path.join(directory, name))
+                self._rotate(directory, self.keep_slow if slow else self.keep)
+            if slow:
+                logger.warning(f"Slow call kept: {name} ({busy:.3f}s busy of {elapsed:.3f}s)")
+        except OSError as e:
+            logger.error(f"Failed to write profile {name}: {e}")
+
+    @staticmethod
+    def _rotate(directory: str, keep: int):
+        """Delete all but the newest keep profiles of a directory"""
+        profiles = sorted(
+            (entry for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith(".prof")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in profiles[:max(0, len(profiles) - keep)]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Request Registry
+Requests a UI waits on for an answer submitted from elsewhere (the web
+dashboard), with explicit states. Closed requests are remembered for a while,
+so late submissions are told what happened, then swept, keeping memory bounded
+however long the server runs.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Request states
+PENDING = "pending"
+ANSWERED = "answered"
+EXPIRED = "expired"
+CANCELLED = "cancelled"
+
+STATES = (PENDING, ANSWERED, EXPIRED, CANCELLED)
+
+
+class RequestLimitError(RuntimeError):
+    """Too many requests are pending, the new one is not registered"""
+
+
+class RequestExpiredError(RuntimeError):
+    """A pending request was not answered within its time to live"""
+
+
+class _Entry:
+    """A registered request"""
+
+    __slots__ = ("id", "type", "data", "future", "state", "created_at", "closed_at", "expiry")
+
+    def __init__(self, request_id: str, data: Dict[str, Any], future: asyncio.Future):
+        self.id = request_id
+        self.type = data.get("type")
+        self.data = data
+        self.future = future
+        self.state = PENDING
+        self.created_at = time.monotonic()
+        self.closed_at = None
+        self.expiry = None
+
+
+class RequestRegistry:
+    """Pending requests and recently closed ones, bounded by count and age"""
+
+    def __init__(
+        self,
+        max_pending: int = 256,
+        pending_ttl: float = 86400.0,
+        closed_ttl: float = 300.0,
+        max_closed: int = 1024
+    ):
+        """
+        Initialize request registry
+
+        Args:
+            max_pending: Requests allowed to wait at once, 0 for no limit
+            pending_ttl: Seconds a request may wait before it expires, 0 for no limit
+            closed_ttl: Seconds a closed request is remembered for late submissions
+            max_closed: Closed requests remembered at most
+        """
+        self.max_pending = max_pending
+        self.pending_ttl = pending_ttl
+        self.closed_ttl = closed_ttl
+        self.max_closed = max_closed
+        self._pending: Dict[str, _Entry] = {}
+        self._closed: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._opened_total = 0
+        self._closed_totals = {ANSWERED: 0, EXPIRED: 0, CANCELLED: 0}
+
+    def open(self, data: Dict[str, Any], future: asyncio.Future) -> str:
+        """
+        Register a request, must be called on the event loop the future belongs to
+
+        Args:
+            data: Request data shown to the user
+            future: Resolved with the submitted answer
+
+        Returns:
+            Request ID
+
+        Raises:
+            RequestLimitError: max_pending requests are already waiting
+        """
+        self.sweep()
+        if self.max_pending > 0 and len(self._pending) >= self.max_pending:
+            raise RequestLimitError(f"Too many pending web requests ({len(self._pending)})")
+        entry = _Entry(str(uuid.uuid4()), data, future)
+        if self.pending_ttl > 0:
+            entry.expiry = future.get_loop().call_later(self.pending_ttl, self._expire, entry.id)
+        self._pending[entry.id] = entry
+        self._opened_total += 1
+        return entry.id
+
+    def _finish(self, entry: _Entry, state: str):
+        """Move a pending request to the closed ones, only its type is kept"""
+        self._pending.pop(entry.id, None)
+        if entry.expiry is not None:
+            entry.expiry.cancel()
+            entry.expiry = None
+        entry.state = state
+        entry.closed_at = time.monotonic()
+        entry.data = None
+        entry.future = None
+        self._closed[entry.id] = entry
+        self._closed_totals[state] += 1
+        while len(self._closed) > self.max_closed:
+            self._closed.popitem(last=False)
+
+    def _expire(self, request_id: str):
+        """Give up on a request nobody answered in time"""
+        entry = self._pending.get(request_id)
+        if entry is None:
+            return
+        future = entry.future
+        self._finish(entry, EXPIRED)
+        if not future.done():
+            future.set_exception(RequestExpiredError(f"Request expired after {self.pending_ttl:g}s without an answer"))
+
+    def get(self, request_id: str) -> Optional[_Entry]:
+        """Pending or remembered closed request, None if unknown"""
+        return self._pending.get(request_id) or self._closed.get(request_id)
+
+    def pending_data(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Data of a pending request, None once it is closed"""
+        entry = self._pending.get(request_id)
+        return None if entry is None else entry.data
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Pending requests with their IDs, oldest first"""
+        return [dict(entry.data, id=entry.id) for entry in list(self._pending.values())]
+
+    def resolve(self, request_id: str, result: Any) -> Optional[str]:
+        """
+        Answer a pending request
+
+        Args:
+            request_id: Request ID
+            result: Submitted answer
+
+        Returns:
+            Error message, or None if the answer was accepted
+        """
+        entry = self._pending.get(request_id)
+        if entry is None:
+            closed = self._closed.get(request_id)
+            return "Request not found" if closed is None else f"Request already {closed.state}"
+        future = entry.future
+        self._finish(entry, ANSWERED)
+        if future.done():
+            return "Request already answered"
+        future.set_result(result)
+        return None
+
+    def close(self, request_id: str):
+        """Close a request the waiting side stopped waiting for, a pending one counts as cancelled"""
+        entry = self._pending.get(request_id)
+        if entry is not None:
+            self._finish(entry, CANCELLED)
+
+    def sweep(self):
+        """Forget closed requests older than closed_ttl"""
+        horizon = time.monotonic() - self.closed_ttl
+        while self._closed:
+            entry = next(iter(self._closed.values()))
+            if entry.closed_at > horizon:
+                break
+            self._closed.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests per state currently held, and totals since start"""
+        self.sweep()
+        held = {state: 0 for state in STATES}
+        held[PENDING] = len(self._pending)
+        for entry in self._closed.values():
+            held[entry.state] += 1
+        return {
+            "held": held,
+            "opened_total": self._opened_total,
+            "closed_total": dict(self._closed_totals)
+        }
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Interaction Scheduler
+Decides which pending human interaction is shown next: a bounded number run at
+once, the rest wait by priority with sessions taking turns, and requests beyond
+the queue limits are rejected right away instead of piling up
+"""
+
+import asyncio
+import contextvars
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Hashable, List, Optional
+
+# Session and priority of the tool call being served, for backends that forward
+# requests elsewhere (the broker client)
+current_session: contextvars.ContextVar = contextvars.ContextVar("current_session", default=None)
+current_priority: contextvars.ContextVar = contextvars.ContextVar("current_priority", default=0)
+
+
+class QueueFullError(Exception):
+    """The request was rejected because too many interactions are waiting"""
+
+
+def session_key(ctx) -> Optional[Hashable]:
+    """
+    Key identifying the MCP session a tool call belongs to
+
+    Args:
+        ctx: FastMCP context object, may be None
+
+    Returns:
+        Session key, None outside of a request
+    """
+    if ctx is None:
+        return None
+    try:
+        return id(ctx.session)
+    except (AttributeError, ValueError, LookupError):
+        return None
+
+
+class _Waiter:
+    """A request waiting for a slot"""
+
+    __slots__ = ("session", "priority", "seq", "future")
+
+    def __init__(self, session: Hashable, priority: int, seq: int, future: asyncio.Future):
+        self.session = session
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+
+
+class InteractionScheduler:
+    """Bounded, priority ordered and per-session fair admission of UI requests"""
+
+    def __init__(self, max_concurrent: int = 1, max_queue: int = 32, max_queue_per_session: int = 8):
+        """
+        Initialize scheduler
+
+        Args:
+            max_concurrent: Interactions shown at the same time, 0 for no limit
+            max_queue: Requests allowed to wait in total, 0 for no limit
+            max_queue_per_session: Requests one session may have waiting, 0 for no limit
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_per_session = max_queue_per_session
+        self._running = 0
+        self._queues: Dict[Hashable, List[_Waiter]] = {}
+        self._last_granted: Dict[Hashable, int] = {}
+        self._seq = itertools.count()
+        self._grants = itertools.count(1)
+
+    @property
+    def running(self) -> int:
+        """Interactions currently shown"""
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load, for status output"""
+        return {
+            "running": self._running,
+            "queued": self.queued,
+            "sessions_waiting": len(self._queues),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue
+        }
+
+    def _has_free_slot(self) -> bool:
+        return self.max_concurrent <= 0 or self._running < self.max_concurrent
+
+    def _grant(self, session: Hashable):
+        self._running += 1
+        self._last_granted[session] = next(self._grants)
+        if len(self._last_granted) > 1024:
+            # Forget sessions that are not waiting, they start over at equal footing
+            self._last_granted = {key: value for key, value in self._last_granted.items() if key in self._queues}
+
+    def _pick(self) -> _Waiter:
+        """
+        Highest priority first. Between equal priorities the session served
+        longest ago goes first, within a session the oldest request.
+        """
+        best = None
+        best_key = None
+        for session, queue in self._queues.items():
+            head = min(queue, key=lambda waiter: (-waiter.priority, waiter.seq))
+            key = (-head.priority, self._last_granted.get(session, 0), head.seq)
+            if best_key is None or key < best_key:
+                best, best_key = head, key
+        return best
+
+    def _remove(self, waiter: _Waiter):
+        queue = self._queues.get(waiter.session)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[waiter.session]
+
+    def _dispatch(self):
+        """Hand free slots to waiting requests"""
+        while self._queues and self._has_free_slot():
+            waiter = self._pick()
+            self._remove(waiter)
+            if waiter.future.done():
+                continue
+            self._grant(waiter.session)
+            waiter.future.set_result(None)
+
+    async def acquire(self, session: Hashable = None, priority: int = 0):
+        """
+        Wait for a slot
+
+        Args:
+            session: Key of the requesting session, sessions take turns
+            priority: Higher values are served first
+
+        Raises:
+            QueueFullError: The queue limits are reached, the request is not queued
+        """
+        if not self._queues and self._has_free_slot():
+            self._grant(session)
+            return
+
+        if self.max_queue > 0 and self.queued >= self.max_queue:
+            raise QueueFullError(f"Too many pending interactions ({self.queued} waiting)")
+        if self.max_queue_per_session > 0 and len(self._queues.get(session, ())) >= self.max_queue_per_session:
+            raise QueueFullError(f"Too many pending interactions for this session ({self.max_queue_per_session} waiting)")
+
+        waiter = _Waiter(session, priority, next(self._seq), asyncio.get_running_loop().create_future())
+        self._queues.setdefault(session, []).append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted and cancelled in the same step, pass the slot on
+                self.release()
+            else:
+                self._remove(waiter)
+            raise
+
+    def release(self):
+        """Free a slot taken with acquire"""
+        self._running = max(0, self._running - 1)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, session: Hashable = None, priority: int = 0):
+        """
+        Hold a slot for the duration of an interaction
+
+        Args:
+            session: Key of the requesting session
+            priority: Higher values are served first
+
+        Raises:
+            QueueFullError: The queue limits are reached
+        """
+        await self.acquire(session, priority)
+        try:
+            yield
+        finally:
+            self.release()
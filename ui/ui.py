@@ -7,21 +7,64 @@ Provides various interface implementation options
 Including Command Line Interface, PyQt Interface and Web Interface
 """
 
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 from fastmcp import Context
 from abc import ABC, abstractmethod
+import asyncio
+import atexit
+import copy
+import functools
+import hashlib
 import importlib
+import inspect
+import json
 import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+import anyio
+
+from ui.answer_cache import AnswerCache, default_cache_path
+from ui.auto_respond import AutoResponder
+from ui import answer_history, journal, metrics
+from ui.pending_store import PendingStore, default_store_path
+from ui.profiling import CallProfiler, default_profile_directory
+from ui.scheduler import InteractionScheduler, QueueFullError, current_session, current_priority, session_key
 
 # 导入配置管理模块
 try:
-    from config_manager import is_reminder_enabled, get_reminder_text
+    from config_manager import (
+        is_reminder_enabled, get_reminder_text, get_scheduler_config, get_answer_cache_config,
+        get_auto_respond_config, reload_config_if_changed, get_deadline_config, get_metrics_config,
+        get_profiling_config, get_pending_store_config, get_answer_history_config
+    )
 except ImportError:
     # 如果配置管理模块不存在，提供默认实现
     def is_reminder_enabled():
         return True
     def get_reminder_text():
         return "**注意**：\n除非我明确说明没有新任务，否则你绝对不能终止对话，在每次任务完成后调用mcp ai-interaction, 向我请求或确认任务!"
+    def get_scheduler_config():
+        return {"max_concurrent": 1, "max_queue": 32, "max_queue_per_session": 8, "coalesce_identical": True}
+    def get_answer_cache_config():
+        return {"enabled": False, "ttl_seconds": 86400, "max_entries": 200, "path": ""}
+    def get_auto_respond_config():
+        return {"enabled": False, "rules": []}
+    def reload_config_if_changed():
+        return False
+    def get_metrics_config():
+        return {"enabled": True}
+    def get_pending_store_config():
+        return {"enabled": False, "path": "", "max_age": 86400, "flush_interval": 0.05, "reshow": True, "claim_ttl": 300}
+    def get_answer_history_config():
+        return {"enabled": False, "path": "", "max_entries": 200000, "suggestions": 8}
+    def get_profiling_config():
+        return {"enabled": False, "directory": "", "keep": 50, "slow_threshold": 0.5, "keep_slow": 200}
+    def get_deadline_config(tool=None):
+        return {"seconds": 0, "policy": "error", "default_option": 0, "text": "The user did not answer in time, continue with your best judgement"}
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, 
@@ -29,7 +72,13 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger('UI')
 
 class BaseUI(ABC):
-    """Base UI class, defines methods that must be implemented by all interfaces"""
+    """
+    Base UI class, defines methods that must be implemented by all interfaces
+    
+    When the MCP client cancels a tool call or disconnects, the awaiting coroutine
+    is cancelled. Implementations close their window and release worker threads
+    as soon as asyncio.CancelledError reaches them, then re-raise it.
+    """
     
     @abstractmethod
     async def select_option(
@@ -78,11 +127,11 @@ class PlaceholderUI(BaseUI):
     def __init__(self, ui_type: str):
         """Initialize placeholder UI with UI type name"""
         self.ui_type = ui_type
-        print(f"警告: {ui_type} UI 初始化失败，该界面类型不可用")
+        logger.warning(f"{ui_type} UI 初始化失败，该界面类型不可用")
         
     async def select_option(self, options, prompt="Please select one of the following options", ctx=None):
         """Placeholder method"""
-        print(f"错误: {self.ui_type} UI 不可用")
+        logger.error(f"{self.ui_type} UI 不可用")
         return {
             "selected_index": -1, 
             "selected_option": None, 
@@ -92,7 +141,7 @@ class PlaceholderUI(BaseUI):
         
     async def request_additional_info(self, prompt, current_info="", ctx=None):
         """Placeholder method"""
-        print(f"错误: {self.ui_type} UI 不可用")
+        logger.error(f"{self.ui_type} UI 不可用")
         return f"{self.ui_type} UI 不可用"
 
 
@@ -103,7 +152,10 @@ UI_IMPLEMENTATIONS = {
     "pyqt": ("ui.ui_pyqt", "PyQtUI"),
     "psg": ("ui.ui_psg", "PySimpleGUIUI"),
     "web": ("ui.ui_web", "WebUI"),
-    "dpg": ("ui.ui_dpg", "DearPyGuiUI")
+    "dpg": ("ui.ui_dpg", "DearPyGuiUI"),
+    "scripted": ("ui.ui_scripted", "ScriptedUI"),
+    "broker": ("ui.ui_broker", "BrokerUI"),
+    "fanout": ("ui.ui_fanout", "FanoutUI")
 }
 
 
@@ -117,7 +169,7 @@ class UIFactory:
         Create a UI instance of the specified type
         
         Args:
-            ui_type: UI type, possible values: cli, tkinter, pyqt, psg, web
+            ui_type: UI type, possible values: cli, tkinter, pyqt, psg, web, dpg, scripted, broker, fanout
             
         Returns:
             UI instance
@@ -137,40 +189,979 @@ class UIFactory:
             # 导入失败时创建占位类
             logger.warning(f"导入 {ui_type} UI 模块失败: {e}")
             return PlaceholderUI(ui_type)
+        except ValueError as e:
+            # 配置无法使用（如 fanout 没有可用的界面）时同样创建占位类
+            logger.error(f"创建 {ui_type} UI 失败: {e}")
+            return PlaceholderUI(ui_type)
 
 
 # Global UI instance
 _ui_instance = None
+_ui_type = "cli"
+_ui_lock = threading.Lock()
 
-def get_ui_instance(ui_type: str = "cli") -> BaseUI:
+def get_ui_instance(ui_type: Optional[str] = None) -> BaseUI:
     """
-    Get UI instance (singleton pattern)
+    Get UI instance (singleton pattern), created on first use
     
     Args:
-        ui_type: UI type
+        ui_type: UI type, defaults to the type set with set_ui_type
         
     Returns:
         UI instance
     """
     global _ui_instance
     if _ui_instance is None:
-        _ui_instance = UIFactory.create_ui(ui_type)
+        # The prewarm thread and the event loop may both get here first
+        with _ui_lock:
+            if _ui_instance is None:
+                started = time.perf_counter()
+                _ui_instance = UIFactory.create_ui(ui_type or _ui_type)
+                metrics.backend_start_seconds.observe(time.perf_counter() - started, ui_type or _ui_type, "load")
     return _ui_instance
 
-def set_ui_type(ui_type: str):
+async def load_ui() -> BaseUI:
+    """
+    Get UI instance without blocking the event loop while the backend module is imported
+    
+    Returns:
+        UI instance
+    """
+    if _ui_instance is not None:
+        return _ui_instance
+    return await asyncio.get_running_loop().run_in_executor(None, get_ui_instance)
+
+def set_ui_type(ui_type: str, lazy: bool = False):
     """
     Set UI type
     
     Args:
         ui_type: UI type
+        lazy: Only record the type, the UI is created on first use
     """
-    global _ui_instance
-    _ui_instance = UIFactory.create_ui(ui_type)
+    global _ui_instance, _ui_type
+    if ui_type not in UI_IMPLEMENTATIONS:
+        raise ValueError(f"不支持的UI类型: {ui_type}, 可用选项: {', '.join(UI_IMPLEMENTATIONS.keys())}")
+    with _ui_lock:
+        _ui_type = ui_type
+        _ui_instance = None if lazy else UIFactory.create_ui(ui_type)
+
+async def start_ui():
+    """
+    Start background services of the current UI on the running event loop,
+    e.g. the listener used by attached CLI terminals. Safe to call repeatedly.
+    """
+    ui = await load_ui()
+    start = getattr(ui, "start", None)
+    if start is not None:
+        await start()
+
+def prewarm_ui() -> float:
+    """
+    Do the one-time initialisation of the current UI (GUI toolkit, web server, ...)
+    so the first question opens as fast as later ones. Blocking, meant to be run
+    in a background thread.
+    
+    Returns:
+        Seconds spent
+    """
+    started = time.perf_counter()
+    ui = get_ui_instance()
+    prewarm = getattr(ui, "prewarm", None)
+    if prewarm is not None:
+        prewarm_started = time.perf_counter()
+        prewarm()
+        metrics.backend_start_seconds.observe(time.perf_counter() - prewarm_started, _ui_type, "prewarm")
+    return time.perf_counter() - started
+
+def mount_ui(server, base_url: str):
+    """
+    Let the current UI serve its pages from the MCP server's own HTTP app
+    (only meaningful for the sse and streamable-http transports)
+    
+    Args:
+        server: FastMCP server instance
+        base_url: URL the MCP server is reachable at
+    """
+    ui = get_ui_instance()
+    mount = getattr(ui, "mount", None)
+    if mount is not None:
+        mount(server, base_url)
+
+# Scheduler shared by all tool calls of this process
+_scheduler = None
+
+def get_scheduler() -> InteractionScheduler:
+    """
+    Get the interaction scheduler, created from the scheduler configuration on first use
+    
+    Returns:
+        Scheduler instance
+    """
+    global _scheduler
+    if _scheduler is None:
+        scheduler_config = get_scheduler_config()
+        _scheduler = InteractionScheduler(
+            max_concurrent=int(scheduler_config["max_concurrent"]),
+            max_queue=int(scheduler_config["max_queue"]),
+            max_queue_per_session=int(scheduler_config["max_queue_per_session"])
+        )
+    return _scheduler
+
+async def run_scheduled(ui, call, session=None, priority: int = 0):
+    """
+    Run a UI interaction once the scheduler admits it
+    
+    Backends that answer concurrently without a human in front of one screen
+    (attribute concurrent = True, e.g. scripted, broker) are not queued here.
+    
+    Args:
+        ui: UI instance the interaction runs on
+        call: Coroutine function performing the interaction
+        session: Key of the requesting session
+        priority: Higher values are shown first
+        
+    Returns:
+        Result of call
+        
+    Raises:
+        QueueFullError: Too many interactions are waiting
+    """
+    current_session.set(session)
+    current_priority.set(priority)
+    if getattr(ui, "concurrent", False):
+        return await call()
+    async with get_scheduler().slot(session, priority):
+        return await call()
+
+# Seconds between checks whether the client of a pending tool call is still connected
+DISCONNECT_POLL_INTERVAL = 1.0
+
+class ClientDisconnectedError(Exception):
+    """The MCP client went away while a question was pending"""
+
+class DeadlineExceededError(Exception):
+    """No answer arrived before the deadline of the tool call"""
+
+# Sessions a message could not be sent on because the transport was closed
+_closed_sessions = weakref.WeakSet()
+
+# Raised by the session's write stream once the transport is gone
+SESSION_CLOSED_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+def _session(ctx: Context):
+    """MCP session of a tool call, None outside a request"""
+    if ctx is None:
+        return None
+    try:
+        return ctx.session
+    except (AttributeError, ValueError, LookupError):
+        return None
+
+def note_send_error(ctx: Context, error: BaseException):
+    """Remember the session of a tool call as closed when sending to it failed for that reason"""
+    session = _session(ctx)
+    if session is not None and isinstance(error, SESSION_CLOSED_ERRORS):
+        _closed_sessions.add(session)
+
+def session_closed(ctx: Context) -> bool:
+    """
+    Whether sending to the MCP session of a tool call already failed because
+    the transport was closed
+    
+    Args:
+        ctx: FastMCP context object, may be None
+        
+    Returns:
+        True once the client is known to be gone
+    """
+    session = _session(ctx)
+    return session is not None and session in _closed_sessions
+
+async def probe_session(ctx: Context) -> bool:
+    """
+    Ping the client of a tool call to find out whether its session was closed.
+    Sending fails right away on a closed transport; a client that is slow to
+    answer or does not answer pings counts as connected.
+    
+    Args:
+        ctx: FastMCP context object, may be None
+        
+    Returns:
+        True once the client is gone
+    """
+    session = _session(ctx)
+    if session is None:
+        return False
+    if session in _closed_sessions:
+        return True
+    try:
+        await asyncio.wait_for(session.send_ping(), DISCONNECT_POLL_INTERVAL)
+    except SESSION_CLOSED_ERRORS as e:
+        note_send_error(ctx, e)
+        return True
+    except Exception:
+        pass
+    return False
+
+def question_hash(tool: str, **question) -> str:
+    """
+    Hash identifying a question, equal for questions that only differ in whitespace
+    
+    Args:
+        tool: Tool name
+        **question: Question data (prompt, options, questions)
+        
+    Returns:
+        Hex digest
+    """
+    def normalize(value):
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, list):
+            return [normalize(item) for item in value]
+        if isinstance(value, dict):
+            return {key: normalize(item) for key, item in value.items()}
+        return value
+    
+    data = json.dumps([tool, normalize(question)], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def question_key(tool: str, **question) -> Optional[str]:
+    """
+    Key under which identical in-flight questions share one interaction
+    
+    Args:
+        tool: Tool name
+        **question: Question data (prompt, options, questions)
+            
+    Returns:
+        question_hash of the question, None when coalescing is disabled in the scheduler configuration
+    """
+    if not get_scheduler_config().get("coalesce_identical", True):
+        return None
+    return question_hash(tool, **question)
+
+class FlightContext:
+    """
+    Context handed to an interaction shared by several tool calls, notifications
+    go to every caller still waiting for the answer
+    """
+    
+    def __init__(self):
+        self.contexts: List[Context] = []
+    
+    async def _notify(self, method: str, message: str):
+        for ctx in list(self.contexts):
+            if session_closed(ctx):
+                continue
+            try:
+                await getattr(ctx, method)(message)
+            except Exception as e:
+                note_send_error(ctx, e)
+                logger.debug(f"Failed to notify a waiting caller: {e}")
+    
+    async def info(self, message: str):
+        await self._notify("info", message)
+    
+    async def error(self, message: str):
+        await self._notify("error", message)
+
+class _Flight:
+    """An interaction shared by every caller that asked the same question"""
+    
+    def __init__(self):
+        self.task = None
+        self.callers = 0
+        self.context = FlightContext()
+
+# Interactions in progress by question key
+_flights: Dict[str, _Flight] = {}
+
+def _leave_flight(key: Optional[str], flight: _Flight):
+    """A caller stopped waiting, the interaction is torn down when nobody waits anymore"""
+    flight.callers -= 1
+    if flight.callers <= 0 and not flight.task.done():
+        # Forget it right away, the same question asked next opens a new interaction
+        if _flights.get(key) is flight:
+            del _flights[key]
+        flight.task.cancel()
+
+async def run_shared(key: Optional[str], start, ctx: Context = None):
+    """
+    Run an interaction once for all concurrent callers asking the same question.
+    The first caller starts it, identical callers arriving while it is open wait
+    for the same answer. It is cancelled only when every caller has left.
+    
+    Args:
+        key: Result of question_key, None to never share
+        start: Coroutine function starting the interaction, called with the FlightContext
+        ctx: FastMCP context object of the caller
+        
+    Returns:
+        Result of the interaction, a copy of its own for every caller
+        
+    Raises:
+        ClientDisconnectedError: The client disconnected before the answer
+    """
+    flight = _flights.get(key) if key is not None else None
+    if flight is None or flight.task.done():
+        flight = _Flight()
+        flight.task = asyncio.ensure_future(start(flight.context))
+        if key is not None:
+            _flights[key] = flight
+            flight.task.add_done_callback(
+                lambda _: _flights.pop(key) if _flights.get(key) is flight else None
+            )
+    else:
+        logger.info(f"Joining an identical question already shown ({flight.callers} waiting)")
+    flight.callers += 1
+    if ctx is not None:
+        flight.context.contexts.append(ctx)
+    
+    # Cancelling the waiter detaches this caller only
+    waiter = asyncio.shield(flight.task)
+    disconnected = False
+    
+    async def watch():
+        nonlocal disconnected
+        while not waiter.done():
+            await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+            if await probe_session(ctx):
+                disconnected = True
+                waiter.cancel()
+                return
+    
+    watcher = asyncio.create_task(watch()) if ctx is not None else None
+    try:
+        result = await waiter
+    except asyncio.CancelledError:
+        _leave_flight(key, flight)
+        if disconnected:
+            raise ClientDisconnectedError("Client disconnected")
+        raise
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        if ctx is not None:
+            flight.context.contexts.remove(ctx)
+    # Callers add their own reminder to the result
+    return copy.deepcopy(result) if key is not None else result
+
+async def run_interaction(
+    ui,
+    call,
+    ctx: Context = None,
+    priority: int = 0,
+    key: Optional[str] = None,
+    deadline: float = 0
+):
+    """
+    Run the interaction of a tool call through the scheduler and tear it down
+    when the call is cancelled or its deadline passes. MCP cancellation cancels
+    this coroutine; a client that disconnects is noticed here, since the MCP
+    server keeps running the handlers of a closed session.
+    
+    Args:
+        ui: UI instance the interaction runs on
+        call: Coroutine function performing the interaction, called with the
+            context to report progress to
+        ctx: FastMCP context object
+        priority: Higher values are shown first
+        key: Result of question_key, identical questions in flight share one interaction
+        deadline: Seconds until the caller stops waiting, time spent queued included,
+            0 for no deadline
+        
+    Returns:
+        Result of call
+        
+    Raises:
+        QueueFullError: Too many interactions are waiting
+        ClientDisconnectedError: The client disconnected before the answer
+        DeadlineExceededError: No answer within deadline
+    """
+    session = session_key(ctx)
+    tool_call = metrics.current_call.get()
+    queued_at = time.perf_counter()
+    
+    async def timed(context):
+        # Runs once the scheduler granted a slot
+        shown_at = time.perf_counter()
+        if tool_call is not None:
+            metrics.stage_seconds.observe(shown_at - queued_at, tool_call.tool, tool_call.ui, "queue")
+        try:
+            return await call(context)
+        finally:
+            if tool_call is not None:
+                metrics.stage_seconds.observe(time.perf_counter() - shown_at, tool_call.tool, tool_call.ui, "interaction")
+    
+    interaction = run_shared(
+        key,
+        lambda context: run_scheduled(ui, lambda: timed(context), session, priority),
+        ctx
+    )
+    if deadline <= 0:
+        result = await interaction
+    else:
+        try:
+            result = await asyncio.wait_for(interaction, deadline)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(f"No answer within {deadline:g} seconds")
+    if tool_call is not None:
+        tool_call.answered_at = time.perf_counter()
+    return result
+
+def get_deadline(tool: str, timeout: float = 0) -> Dict[str, Any]:
+    """
+    Deadline of a tool call
+    
+    Args:
+        tool: select_option, request_additional_info or ask_questions
+        timeout: Seconds requested by the caller, 0 for the configured deadline
+        
+    Returns:
+        Deadline configuration of the tool, seconds replaced by timeout when given
+    """
+    deadline = get_deadline_config(tool)
+    if timeout and timeout > 0:
+        deadline["seconds"] = timeout
+    deadline["seconds"] = float(deadline["seconds"] or 0)
+    return deadline
+
+def deadline_answer(question: Dict[str, Any], deadline: Dict[str, Any]) -> Any:
+    """
+    Answer to a question nobody answered before the deadline, following its policy:
+    "default" selects the default option (free text questions get the text),
+    "text" answers with the configured text, "error" answers with nothing
+    
+    Args:
+        question: Question as returned by normalize_questions
+        deadline: Result of get_deadline
+        
+    Returns:
+        Selection result dictionary, or the text of a free text question
+    """
+    policy = deadline["policy"]
+    if question["type"] == "request_additional_info":
+        return "" if policy == "error" else deadline["text"]
+    
+    options = question["options"]
+    index = int(deadline.get("default_option", 0))
+    if policy == "default" and 0 <= index < len(options):
+        return {
+            "selected_index": index,
+            "selected_option": options[index],
+            "custom_input": "",
+            "is_custom": False,
+            "timed_out": True
+        }
+    if policy == "error":
+        return {
+            "selected_index": -1,
+            "selected_option": None,
+            "custom_input": "",
+            "is_custom": False,
+            "timed_out": True
+        }
+    return {
+        "selected_index": -1,
+        "selected_option": None,
+        "custom_input": deadline["text"],
+        "is_custom": True,
+        "timed_out": True
+    }
+
+# Answer cache, only created when enabled in the configuration
+_answer_cache = None
+
+# Appended to request_additional_info answers served from the answer cache
+CACHED_ANSWER_NOTE = "(Remembered answer, the question was not shown again)"
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """
+    Get the answer cache, created from the answer cache configuration on first use
+    
+    Returns:
+        Cache instance, None when the answer cache is disabled
+    """
+    global _answer_cache
+    if _answer_cache is None:
+        answer_cache_config = get_answer_cache_config()
+        if not answer_cache_config["enabled"]:
+            return None
+        _answer_cache = AnswerCache(
+            answer_cache_config["path"] or default_cache_path(),
+            ttl=float(answer_cache_config["ttl_seconds"]),
+            max_entries=int(answer_cache_config["max_entries"])
+        )
+    return _answer_cache
+
+def remember_answer(tool: str, question: Dict[str, Any], result: Any) -> Any:
+    """
+    Store an answer in the answer cache when the user ticked "Remember this answer".
+    UIs flag it with "remember": True in a selection result, and answer an information
+    request with {"text": ..., "remember": True} instead of the text.
+    
+    Args:
+        tool: select_option or request_additional_info
+        question: Question data (prompt, options) the answer belongs to
+        result: Answer of the UI
+        
+    Returns:
+        The answer without the flag
+    """
+    remember = False
+    if isinstance(result, dict) and "remember" in result:
+        remember = bool(result.pop("remember"))
+        if tool == "request_additional_info":
+            result = result.get("text", "")
+    cache = get_answer_cache()
+    if remember and cache is not None:
+        cache.put(question_hash(tool, **question), tool, question, result)
+    return result
+
+# Pending request store, only created when enabled in the configuration
+_pending_store = None
+_pending_store_lock = threading.Lock()
+_pending_store_failed = False
+
+# Appended to request_additional_info answers given while the server was restarting
+RECOVERED_ANSWER_NOTE = "(Answered after the server restarted, the question was not shown again)"
+
+def get_pending_store() -> Optional[PendingStore]:
+    """
+    Get the pending request store, created from the pending store configuration on first use.
+    Creating it adopts the records of dead server processes, which reads the database.
+    
+    Returns:
+        Store instance, None when the pending store is disabled
+    """
+    global _pending_store, _pending_store_failed
+    if _pending_store is None and not _pending_store_failed:
+        pending_store_config = get_pending_store_config()
+        if not pending_store_config["enabled"]:
+            return None
+        with _pending_store_lock:
+            if _pending_store is None and not _pending_store_failed:
+                try:
+                    _pending_store = PendingStore(
+                        pending_store_config["path"] or default_store_path(),
+                        max_age=float(pending_store_config["max_age"]),
+                        flush_interval=float(pending_store_config["flush_interval"]),
+                        claim_ttl=float(pending_store_config["claim_ttl"])
+                    )
+                except (OSError, sqlite3.Error) as e:
+                    logger.error(f"Pending store disabled, cannot open it: {e}")
+                    _pending_store_failed = True
+                    return None
+                atexit.register(_pending_store.close)
+    return _pending_store
+
+def close_pending_store():
+    """Commit the pending store's queued writes, questions still open stay in it for the next server process"""
+    if _pending_store is not None:
+        _pending_store.close()
+
+def caller_identity(ctx: Context) -> str:
+    """
+    Identity of the MCP client of a tool call that survives a restart of this
+    server: the client's name and version, and the process that started this
+    server (the IDE for stdio servers)
+    
+    Args:
+        ctx: FastMCP context object, may be None
+        
+    Returns:
+        Identity the pending store ties a question to
+    """
+    version = ""
+    if ctx is not None:
+        try:
+            version = ctx.session.client_params.clientInfo.version or ""
+        except (AttributeError, ValueError, LookupError):
+            pass
+    return f"{client_name(ctx)}/{version}@{os.getppid()}"
+
+def claim_answer(tool: str, question: Dict[str, Any], ctx: Context = None) -> Optional[Any]:
+    """
+    Take the answer given to the same question of the same client after it was
+    re-shown following a restart, within pending_store.claim_ttl
+    
+    Args:
+        tool: Tool name
+        question: Question data (prompt, options, questions)
+        ctx: FastMCP context object, identifies the client
+        
+    Returns:
+        Answer, None when the store has none for this client
+    """
+    store = get_pending_store()
+    if store is None:
+        return None
+    record = store.claim(question_hash(tool, **question), caller_identity(ctx))
+    return record.answer if record is not None else None
+
+def persisted(tool: str, question: Dict[str, Any], call, ctx: Context = None, record_id: Optional[str] = None):
+    """
+    Keep an interaction in the pending store while it is shown. A caller waiting for it
+    receives the answer directly and the record is dropped; the answer of a question
+    adopted from an earlier process stays until claim_answer takes it. An interaction
+    that ends without an answer is forgotten.
+    
+    Args:
+        tool: Tool name
+        question: Question data (prompt, options, questions)
+        call: Coroutine function performing the interaction, called with the context
+        ctx: FastMCP context object of the caller, the owner of a new record
+        record_id: Record of a question adopted from an earlier process, None to create one
+        
+    Returns:
+        Coroutine function performing the interaction
+    """
+    store = get_pending_store()
+    if store is None:
+        return call
+    
+    async def run(context):
+        current = record_id or store.open(question_hash(tool, **question), tool, question, caller_identity(ctx))
+        try:
+            result = await call(context)
+        except BaseException:
+            store.discard(current)
+            raise
+        if record_id is None:
+            store.discard(current)
+        else:
+            store.answer(current, result)
+        return result
+    return run
+
+def interaction_call(ui, tool: str, question: Dict[str, Any]):
+    """
+    Interaction asking a question on a UI
+    
+    Args:
+        ui: UI instance
+        tool: select_option, request_additional_info or ask_questions
+        question: Question data (prompt, options, questions)
+        
+    Returns:
+        Coroutine function performing the interaction, called with the context to report progress to
+    """
+    if tool == "ask_questions":
+        return lambda context: ask_questions_on(ui, question["questions"], context)
+    
+    async def ask(context):
+        if tool == "select_option":
+            answer = await ui.select_option(question["options"], question["prompt"], context)
+            return remember_answer(tool, question, answer)
+        watched = ErrorWatchContext(context)
+        answer = remember_answer(tool, question, await ui.request_additional_info(question["prompt"], watched))
+        if not watched.failed:
+            record_history(question["prompt"], answer)
+        return answer
+    return ask
+
+class ErrorWatchContext:
+    """Context passed to a UI, notes whether it reported an error instead of an answer"""
+    
+    def __init__(self, context):
+        self.context = context
+        self.failed = False
+    
+    async def info(self, message: str):
+        if self.context is not None:
+            await self.context.info(message)
+    
+    async def error(self, message: str):
+        self.failed = True
+        if self.context is not None:
+            await self.context.error(message)
+
+def _add_history(prompt: str, answer: str):
+    history = answer_history.get_answer_history()
+    if history is not None:
+        history.add(prompt, answer)
+
+def record_history(prompt: str, answer: Any):
+    """
+    Add an answer the user gave to the answer history, written by an executor
+    thread so the result is not held up by the disk
+    
+    Args:
+        prompt: Prompt of the request_additional_info question
+        answer: Answer of the UI, empty answers (cancelled dialogs) are not recorded
+    """
+    if not isinstance(answer, str) or not answer.strip() or not get_answer_history_config()["enabled"]:
+        return
+    asyncio.get_running_loop().run_in_executor(None, _add_history, prompt, answer)
+
+async def resume_pending():
+    """
+    Show the questions an earlier server process left unanswered again (pending_store.reshow).
+    Nobody waits for them, their answers stay in the pending store until the client asks
+    the same question again; a client asking while one is shown joins it.
+    """
+    if not get_pending_store_config()["enabled"]:
+        return
+    store = await asyncio.get_running_loop().run_in_executor(None, get_pending_store)
+    if store is None:
+        return
+    orphans, store.orphans = store.orphans, []
+    if not orphans:
+        return
+    if not get_pending_store_config()["reshow"]:
+        for record in orphans:
+            store.discard(record.id)
+        return
+    ui = await load_ui()
+    
+    async def reshow(record):
+        call = persisted(
+            record.tool, record.question, interaction_call(ui, record.tool, record.question), record_id=record.id
+        )
+        deadline = get_deadline(record.tool)
+        try:
+            await run_interaction(
+                ui, call, None, 0, question_key(record.tool, **record.question), deadline["seconds"]
+            )
+        except (DeadlineExceededError, QueueFullError) as e:
+            logger.warning(f"Question of an earlier server process dropped: {e}")
+    
+    logger.warning(f"Showing {len(orphans)} questions of an earlier server process again")
+    await asyncio.gather(*(reshow(record) for record in orphans), return_exceptions=True)
+
+# Auto responder compiled from the auto_respond configuration
+_auto_responder = None
+
+# Appended to text answers given by an auto_respond rule
+AUTO_ANSWER_NOTE = "(Answered automatically by an auto_respond rule, the question was not shown)"
+
+def get_auto_responder() -> Optional[AutoResponder]:
+    """
+    Get the auto responder, its rules are compiled again only when config.json has changed
+    
+    Returns:
+        Auto responder, None when it is disabled or has no rules
+    """
+    global _auto_responder
+    if reload_config_if_changed() or _auto_responder is None:
+        auto_respond_config = get_auto_respond_config()
+        _auto_responder = AutoResponder(auto_respond_config["rules"] if auto_respond_config["enabled"] else [])
+        logger.info(f"Auto responder loaded {len(_auto_responder.rules)} rules")
+    return _auto_responder if _auto_responder.rules else None
+
+def client_name(ctx: Context) -> str:
+    """
+    Name the MCP client of a tool call introduced itself with
+    
+    Args:
+        ctx: FastMCP context object, may be None
+        
+    Returns:
+        Client name, empty when unknown
+    """
+    if ctx is None:
+        return ""
+    try:
+        return ctx.session.client_params.clientInfo.name or ""
+    except (AttributeError, ValueError, LookupError):
+        return ""
+
+def auto_answer(tool: str, question: Dict[str, Any], ctx: Context = None) -> Optional[Any]:
+    """
+    Answer of the first auto_respond rule that applies to a question
+    
+    Args:
+        tool: select_option or request_additional_info
+        question: Question data (prompt, options)
+        ctx: FastMCP context object, identifies the client
+        
+    Returns:
+        Selection result or text, None when the question has to be shown
+    """
+    responder = get_auto_responder()
+    if responder is None:
+        return None
+    return responder.respond(tool, question["prompt"], question.get("options"), client_name(ctx))
+
+def metrics_enabled() -> bool:
+    """Whether tool calls are measured (metrics.enabled)"""
+    return bool(get_metrics_config()["enabled"])
+
+def measured(tool: str):
+    """
+    Decorator timing a tool function and counting its outcome, set with
+    metrics.set_outcome. The signature is kept for FastMCP.
+    
+    Args:
+        tool: Tool name used as metrics label
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not metrics_enabled():
+                return await func(*args, **kwargs)
+            tool_call = metrics.ToolCall(tool, _ui_type, client_name(kwargs.get("ctx")) or "unknown")
+            token = metrics.current_call.set(tool_call)
+            try:
+                return await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                tool_call.outcome = "cancelled"
+                raise
+            except Exception:
+                tool_call.outcome = "error"
+                raise
+            finally:
+                metrics.current_call.reset(token)
+                tool_call.record()
+        return wrapper
+    return decorate
+
+# Call profiler, created when profiling is enabled in the configuration or with --profile
+_profiler = None
+_profiling_forced = False
+_profiler_failed = False
+
+def enable_profiling():
+    """Profile tool calls whatever the profiling configuration says (run --profile)"""
+    global _profiling_forced
+    _profiling_forced = True
+
+def get_profiler() -> Optional[CallProfiler]:
+    """
+    Get the call profiler, created from the profiling configuration on first use
+    
+    Returns:
+        Profiler instance, None when profiling is disabled
+    """
+    global _profiler, _profiler_failed
+    if _profiler is None and not _profiler_failed:
+        profiling_config = get_profiling_config()
+        if not (_profiling_forced or profiling_config["enabled"]):
+            return None
+        try:
+            _profiler = CallProfiler(
+                profiling_config["directory"] or default_profile_directory(),
+                keep=int(profiling_config["keep"]),
+                slow_threshold=float(profiling_config["slow_threshold"]),
+                keep_slow=int(profiling_config["keep_slow"])
+            )
+        except OSError as e:
+            logger.error(f"Profiling disabled, cannot use the profile directory: {e}")
+            _profiler_failed = True
+            return None
+        logger.warning(f"Profiling tool calls to {_profiler.directory}")
+    return _profiler
+
+def _request_id(ctx: Context) -> Optional[str]:
+    """JSON-RPC request ID of a tool call, None outside a request"""
+    if ctx is None:
+        return None
+    try:
+        return str(ctx.request_id)
+    except (AttributeError, ValueError, LookupError):
+        return None
+
+def profiled(tool: str):
+    """
+    Decorator running a tool function under the call profiler when profiling is
+    enabled. The signature is kept for FastMCP.
+    
+    Args:
+        tool: Tool name used in the profile file names
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if profiler is None:
+                return await func(*args, **kwargs)
+            ctx = kwargs.get("ctx")
+            return await profiler.run(tool, _ui_type, _request_id(ctx), lambda: func(*args, **kwargs))
+        return wrapper
+    return decorate
+
+def journaled(tool: str):
+    """
+    Decorator recording a tool call's question and answer in the interaction
+    journal. The signature is kept for FastMCP.
+    
+    Args:
+        tool: Tool name recorded with the events
+    """
+    def decorate(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if journal.get_journal() is None:
+                return await func(*args, **kwargs)
+            ctx = kwargs.get("ctx")
+            request_id = _request_id(ctx)
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            arguments.pop("ctx", None)
+            journal.record("question", tool=tool, ui=_ui_type, client=client_name(ctx), request_id=request_id, **arguments)
+            started = time.perf_counter()
+            outcome, result = "error", None
+            try:
+                result = await func(*args, **kwargs)
+                outcome = "answered"
+                return result
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                journal.record(
+                    "answer", tool=tool, ui=_ui_type, request_id=request_id, outcome=outcome,
+                    seconds=round(time.perf_counter() - started, 3), result=result
+                )
+        return wrapper
+    return decorate
+
+def _ui_request_counts() -> Dict[str, float]:
+    """Requests per state held by the UI, for backends keeping a registry (web)"""
+    stats = getattr(_ui_instance, "stats", None)
+    return dict(stats()["held"]) if stats is not None else {}
+
+metrics.registry.gauge(
+    "scheduler", "Interactions shown (running) and waiting (queued)",
+    lambda: {name: value for name, value in get_scheduler().stats().items() if name in ("running", "queued", "sessions_waiting")}
+)
+metrics.registry.gauge("flights", "Open interactions shared by identical questions", lambda: {"open": len(_flights)})
+metrics.registry.gauge("ui_requests", "Requests held by the UI backend per state", _ui_request_counts)
+metrics.registry.gauge(
+    "pending_store", "Questions of this process in the pending store: shown (pending) and answers not yet delivered (answered)",
+    lambda: _pending_store.stats() if _pending_store is not None else {}
+)
+# Collected without creating them, a scrape must not open files of disabled or unused components
+metrics.registry.gauge("answer_history", "Prompt/answer pairs in the answer history", answer_history.stats)
+metrics.registry.gauge(
+    "journal", "Journal events waiting to be written (queued) and dropped because the queue was full",
+    journal.stats
+)
+
+async def server_stats() -> Dict[str, Any]:
+    """
+    Statistics of this server: tool calls by tool, UI backend, client and outcome,
+    their durations and the time spent per stage (queue, interaction, post),
+    backend startup and render times, and the current queue depth
+    
+    Returns:
+        Metrics snapshot, histogram entries with count, sum, avg and the upper
+        bounds of the buckets holding the median and the 95th percentile
+    """
+    return metrics.registry.snapshot()
 
 # Tool function wrappers, exposed to FastMCP
+@journaled("select_option")
+@measured("select_option")
+@profiled("select_option")
 async def select_option(
     options: List[Union[str, Dict[str, Any]]],
     prompt: str = "Please select one of the following options",
+    priority: int = 0,
+    timeout: float = 0,
     ctx: Context = None
 ) -> Dict[str, Any]:
     """
@@ -179,13 +1170,60 @@ async def select_option(
     Args:
         options: List of options, can be a list of strings or dictionaries
         prompt: Prompt message displayed to the user
+        priority: Requests with a higher priority are shown first when several are waiting
+        timeout: Seconds to wait for the user, 0 for the configured deadline
         ctx: FastMCP context object
 
     Returns:
-        Dictionary containing the selection result
+        Dictionary containing the selection result, with "auto_answered": true when an
+        auto_respond rule chose it, "cached": true when it is an answer the user asked
+        to remember, "recovered": true when the user answered it while the server was
+        restarting and "timed_out": true when the deadline passed without an answer
     """
-    ui = get_ui_instance()
-    result = await ui.select_option(options, prompt, ctx)
+    question = {"prompt": prompt, "options": options}
+    automatic = auto_answer("select_option", question, ctx)
+    cache = get_answer_cache() if automatic is None else None
+    cached = cache.get(question_hash("select_option", **question)) if cache is not None else None
+    recovered = claim_answer("select_option", question, ctx) if automatic is None and cached is None else None
+    if automatic is not None:
+        metrics.set_outcome("auto_answered")
+        result = dict(automatic, auto_answered=True)
+    elif cached is not None:
+        metrics.set_outcome("cached")
+        result = dict(cached, cached=True)
+    elif recovered is not None:
+        metrics.set_outcome("recovered")
+        result = dict(recovered, recovered=True)
+    else:
+        ui = await load_ui()
+        ask = persisted("select_option", question, interaction_call(ui, "select_option", question), ctx)
+        deadline = get_deadline("select_option", timeout)
+        try:
+            result = await run_interaction(
+                ui, ask, ctx, priority, question_key("select_option", **question), deadline["seconds"]
+            )
+            # Joined a question re-shown after a restart, its answer was delivered now
+            claim_answer("select_option", question, ctx)
+        except DeadlineExceededError as e:
+            logger.warning(f"select_option timed out: {e}")
+            metrics.set_outcome("timed_out")
+            result = deadline_answer(dict(question, type="select_option"), deadline)
+            if deadline["policy"] == "error":
+                result["error"] = str(e)
+        except ClientDisconnectedError:
+            # Nobody receives the result anymore
+            logger.info("select_option abandoned, client disconnected")
+            metrics.set_outcome("disconnected")
+            return {}
+        except QueueFullError as e:
+            logger.warning(f"select_option rejected: {e}")
+            metrics.set_outcome("rejected")
+            result = {
+                "selected_index": -1,
+                "selected_option": None,
+                "custom_input": str(e),
+                "is_custom": True
+            }
 
     # 根据配置添加提醒内容
     if is_reminder_enabled():
@@ -203,24 +1241,231 @@ async def select_option(
 
     return result
 
+@journaled("request_additional_info")
+@measured("request_additional_info")
+@profiled("request_additional_info")
 async def request_additional_info(
     prompt: str,
+    priority: int = 0,
+    timeout: float = 0,
     ctx: Context = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Request user supplementary information
     Args:
         prompt: Prompt for requesting information
+        priority: Requests with a higher priority are shown first when several are waiting
+        timeout: Seconds to wait for the user, 0 for the configured deadline
     Returns:
-        The supplementary information input by the user
+        The supplementary information input by the user, followed by a note when
+        an auto_respond rule answered, it is an answer the user asked to remember or
+        the user answered it while the server was restarting.
+        When the deadline passes without an answer {"text": ..., "timed_out": true}.
     """
-    ui = get_ui_instance()
-    result = await ui.request_additional_info(prompt, ctx)
+    question = {"prompt": prompt}
+    automatic = auto_answer("request_additional_info", question, ctx)
+    cache = get_answer_cache() if automatic is None else None
+    cached = cache.get(question_hash("request_additional_info", **question)) if cache is not None else None
+    recovered = claim_answer("request_additional_info", question, ctx) if automatic is None and cached is None else None
+    if automatic is not None:
+        metrics.set_outcome("auto_answered")
+        result = f"{automatic}\n\n{AUTO_ANSWER_NOTE}"
+    elif cached is not None:
+        metrics.set_outcome("cached")
+        result = f"{cached}\n\n{CACHED_ANSWER_NOTE}"
+    elif recovered is not None:
+        metrics.set_outcome("recovered")
+        result = f"{recovered}\n\n{RECOVERED_ANSWER_NOTE}"
+    else:
+        ui = await load_ui()
+        ask = persisted("request_additional_info", question, interaction_call(ui, "request_additional_info", question), ctx)
+        deadline = get_deadline("request_additional_info", timeout)
+        try:
+            result = await run_interaction(
+                ui, ask, ctx, priority, question_key("request_additional_info", **question), deadline["seconds"]
+            )
+            # Joined a question re-shown after a restart, its answer was delivered now
+            claim_answer("request_additional_info", question, ctx)
+        except DeadlineExceededError as e:
+            logger.warning(f"request_additional_info timed out: {e}")
+            metrics.set_outcome("timed_out")
+            result = {"text": deadline_answer(dict(question, type="request_additional_info"), deadline), "timed_out": True}
+            if deadline["policy"] == "error":
+                result["error"] = str(e)
+        except ClientDisconnectedError:
+            # Nobody receives the result anymore
+            logger.info("request_additional_info abandoned, client disconnected")
+            metrics.set_outcome("disconnected")
+            return ""
+        except QueueFullError as e:
+            logger.warning(f"request_additional_info rejected: {e}")
+            metrics.set_outcome("rejected")
+            result = str(e)
 
     # 根据配置添加提醒内容
     if is_reminder_enabled():
         reminder_text = get_reminder_text()
         if result and isinstance(result, str):
             result = f"{result}\n\n{reminder_text}"
+        elif isinstance(result, dict):
+            result["reminder"] = reminder_text
 
     return result
+
+# Largest number of questions one ask_questions call may carry
+MAX_QUESTIONS = 20
+
+def normalize_questions(questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate the questions of an ask_questions call
+    
+    Args:
+        questions: Questions as passed to the tool, each {"prompt": ..., "options": [...]}
+            for a selection or {"prompt": ...} for free text
+            
+    Returns:
+        Questions as {"type": "select_option", "prompt", "options"} or
+        {"type": "request_additional_info", "prompt"}, in the given order
+        
+    Raises:
+        ValueError: The list is empty, too long or a question is malformed
+    """
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("questions must be a non-empty list")
+    if len(questions) > MAX_QUESTIONS:
+        raise ValueError(f"At most {MAX_QUESTIONS} questions can be asked at once, got {len(questions)}")
+    
+    normalized = []
+    for i, question in enumerate(questions):
+        if not isinstance(question, dict) or not isinstance(question.get("prompt"), str):
+            raise ValueError(f"Question {i + 1} needs a prompt")
+        options = question.get("options")
+        if options:
+            if not isinstance(options, list):
+                raise ValueError(f"Options of question {i + 1} must be a list")
+            normalized.append({"type": "select_option", "prompt": question["prompt"], "options": options})
+        else:
+            normalized.append({"type": "request_additional_info", "prompt": question["prompt"]})
+    return normalized
+
+async def ask_questions_in_turn(ui, questions: List[Dict[str, Any]], ctx: Context = None) -> List[Any]:
+    """
+    Ask normalized questions one after another, for backends without a combined dialog
+    
+    Args:
+        ui: UI instance
+        questions: Result of normalize_questions
+        ctx: FastMCP context object
+        
+    Returns:
+        Answers in question order
+    """
+    answers = []
+    for question in questions:
+        if question["type"] == "select_option":
+            answers.append(await ui.select_option(question["options"], question["prompt"], ctx))
+        else:
+            answers.append(await ui.request_additional_info(question["prompt"], ctx))
+    return answers
+
+async def ask_questions_on(ui, questions: List[Dict[str, Any]], ctx: Context = None) -> List[Any]:
+    """
+    Ask normalized questions together when the UI has a combined dialog
+    (method ask_questions), otherwise one after another
+    
+    Args:
+        ui: UI instance
+        questions: Result of normalize_questions
+        ctx: FastMCP context object
+        
+    Returns:
+        Answers in question order
+    """
+    ask = getattr(ui, "ask_questions", None)
+    if ask is not None:
+        return await ask(questions, ctx)
+    return await ask_questions_in_turn(ui, questions, ctx)
+
+@journaled("ask_questions")
+@measured("ask_questions")
+@profiled("ask_questions")
+async def ask_questions(
+    questions: List[Dict[str, Any]],
+    priority: int = 0,
+    timeout: float = 0,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Ask the user several independent questions at once, shown together in one interaction
+    
+    Args:
+        questions: Questions to ask, each {"prompt": "...", "options": ["...", ...]} for a
+            selection (a custom answer is always allowed) or {"prompt": "..."} for free text
+        priority: Requests with a higher priority are shown first when several are waiting
+        timeout: Seconds to wait for the user, 0 for the configured deadline
+        ctx: FastMCP context object
+        
+    Returns:
+        {"answers": [...]} in question order, a selection result dictionary for each
+        selection and the entered text for each free text question. Questions an
+        auto_respond rule answered are marked like in select_option and
+        request_additional_info, only the others are shown. "recovered": true when the
+        user answered them while the server was restarting, "timed_out": true when
+        the deadline passed, the unanswered questions then get the deadline answers.
+    """
+    try:
+        questions = normalize_questions(questions)
+    except ValueError as e:
+        metrics.set_outcome("invalid")
+        return {"answers": [], "error": str(e)}
+    
+    answers = [auto_answer(question["type"], question, ctx) for question in questions]
+    for i, answer in enumerate(answers):
+        if answer is not None:
+            answers[i] = dict(answer, auto_answered=True) if isinstance(answer, dict) else f"{answer}\n\n{AUTO_ANSWER_NOTE}"
+    remaining = [question for question, answer in zip(questions, answers) if answer is None]
+    if not remaining:
+        metrics.set_outcome("auto_answered")
+    deadline = get_deadline("ask_questions", timeout)
+    recovered = claim_answer("ask_questions", {"questions": remaining}, ctx) if remaining else None
+    try:
+        if recovered is not None:
+            metrics.set_outcome("recovered")
+            asked = iter(recovered)
+            answers = [next(asked) if answer is None else answer for answer in answers]
+        elif remaining:
+            ui = await load_ui()
+            question = {"questions": remaining}
+            asked = iter(await run_interaction(
+                ui, persisted("ask_questions", question, interaction_call(ui, "ask_questions", question), ctx), ctx, priority,
+                question_key("ask_questions", **question), deadline["seconds"]
+            ))
+            # Joined a question re-shown after a restart, its answers were delivered now
+            claim_answer("ask_questions", question, ctx)
+            answers = [next(asked) if answer is None else answer for answer in answers]
+        result = {"answers": answers, "recovered": True} if recovered is not None else {"answers": answers}
+    except DeadlineExceededError as e:
+        logger.warning(f"ask_questions timed out: {e}")
+        metrics.set_outcome("timed_out")
+        answers = [
+            deadline_answer(question, deadline) if answer is None else answer
+            for question, answer in zip(questions, answers)
+        ]
+        result = {"answers": answers, "timed_out": True}
+        if deadline["policy"] == "error":
+            result["error"] = str(e)
+    except ClientDisconnectedError:
+        # Nobody receives the result anymore
+        logger.info("ask_questions abandoned, client disconnected")
+        metrics.set_outcome("disconnected")
+        return {}
+    except QueueFullError as e:
+        logger.warning(f"ask_questions rejected: {e}")
+        metrics.set_outcome("rejected")
+        result = {"answers": [], "error": str(e)}
+    
+    # 根据配置添加提醒内容
+    if is_reminder_enabled():
+        result["reminder"] = get_reminder_text()
+    
+    return result
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Broker Interface Implementation
+Forwards questions to the shared UI broker process (python main.py broker),
+so many MCP server instances share one GUI instead of starting one each
+"""
+
+import logging
+import os
+import subprocess
+import sys
+from typing import List, Dict, Any, Union
+from fastmcp import Context
+from config_manager import get_broker_config
+from ui.broker import BrokerClient, broker_address, format_address
+from ui.scheduler import current_session, current_priority
+
+logger = logging.getLogger('BrokerUI')
+
+# Entry script used to start the broker (not used when frozen)
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+class BrokerUI:
+    """Broker Interface Implementation Class"""
+
+    # Questions are queued by the broker's scheduler, not in this process
+    concurrent = True
+
+    def __init__(self):
+        """Initialize broker interface from the broker configuration"""
+        broker_config = get_broker_config()
+        self.broker_ui = broker_config["ui"]
+        self.address = broker_address(broker_config)
+        self.client = BrokerClient(
+            self.address,
+            connect_timeout=float(broker_config["connect_timeout"]),
+            launch=self._launch_broker if broker_config["autostart"] else None
+        )
+
+    @staticmethod
+    def _payload(**payload) -> Dict[str, Any]:
+        """Question data plus what the broker's scheduler orders by"""
+        session = current_session.get()
+        payload["session"] = None if session is None else str(session)
+        payload["priority"] = current_priority.get()
+        return payload
+
+    def _launch_broker(self):
+        """Start a detached broker process that outlives this server"""
+        if getattr(sys, 'frozen', False):
+            command = [sys.executable]
+        else:
+            command = [sys.executable, MAIN_SCRIPT]
+        command += ["broker", "--ui", self.broker_ui]
+        if isinstance(self.address, str):
+            command += ["--socket-path", self.address]
+
+        kwargs = {}
+        if sys.platform == 'win32':
+            kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        # stdin/stdout may carry the MCP protocol, keep the broker off them
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **kwargs
+        )
+
+    async def select_option(
+        self,
+        options: List[Union[str, Dict[str, Any]]],
+        prompt: str = "Please select one of the following options",
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """
+        Present options through the UI broker
+
+        Args:
+            options: List of options, can be a list of strings or dictionaries
+            prompt: Prompt message
+            ctx: FastMCP context object
+
+        Returns:
+            Selection result dictionary
+        """
+        try:
+            return await self.client.ask("select_option", self._payload(options=options, prompt=prompt))
+        except (ConnectionError, RuntimeError) as e:
+            logger.error(f"UI broker at {format_address(self.address)} failed: {e}")
+            if ctx:
+                await ctx.error(str(e))
+            return {
+                "selected_index": -1,
+                "selected_option": None,
+                "custom_input": f"UI broker unavailable: {e}",
+                "is_custom": True
+            }
+
+    async def request_additional_info(
+        self,
+        prompt: str,
+        ctx: Context = None
+    ) -> str:
+        """
+        Request supplementary information through the UI broker
+
+        Args:
+            prompt: Prompt message
+            ctx: FastMCP context object
+
+        Returns:
+            User input information
+        """
+        try:
+            return await self.client.ask("request_additional_info", self._payload(prompt=prompt))
+        except (ConnectionError, RuntimeError) as e:
+            logger.error(f"UI broker at {format_address(self.address)} failed: {e}")
+            if ctx:
+                await ctx.error(str(e))
+            return f"UI broker unavailable: {e}"
+
+    async def ask_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        ctx: Context = None
+    ) -> List[Any]:
+        """
+        Ask several questions in one interaction of the UI broker
+
+        Args:
+            questions: Questions normalized by ui.ui.normalize_questions
+            ctx: FastMCP context object
+
+        Returns:
+            Answers in question order
+        """
+        try:
+            return await self.client.ask("ask_questions", self._payload(questions=questions))
+        except (ConnectionError, RuntimeError) as e:
+            logger.error(f"UI broker at {format_address(self.address)} failed: {e}")
+            if ctx:
+                await ctx.error(str(e))
+            return [
+                {
+                    "selected_index": -1,
+                    "selected_option": None,
+                    "custom_input": f"UI broker unavailable: {e}",
+                    "is_custom": True
+                } if question["type"] == "select_option" else f"UI broker unavailable: {e}"
+                for question in questions
+            ]
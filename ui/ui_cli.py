@@ -11,24 +11,149 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 import subprocess
+import shlex
 import sys
 import os
-import tempfile
-import json
 import asyncio
-import time
+import logging
 from lang_manager import get_text
+from config_manager import get_cli_config, get_answer_cache_config, get_answer_history_config
+from ui.answer_history import default_history_path
+from ui.cli_attach import AttachServer, attach_address, prompt_questions
+
+logger = logging.getLogger('CommandLineUI')
+
+# Entry script used to start the terminal in a new window (not used when frozen)
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# Seconds a new window is given to start and connect back, how long the user
+# may take to answer is decided by the deadline of the tool call (ui.ui)
+NEW_WINDOW_CONNECT_TIMEOUT = 30
 
 END_MARKER = get_text("input_end_marker")
 if END_MARKER == "NotDefined":
     END_MARKER = "END"
-print("CLI END_MARKER", END_MARKER)
+
 class CommandLineUI:
     """Command Line Interface Implementation Class"""
     
     def __init__(self):
         """Initialize command line interface"""
         self.console = Console()
+        cli_config = get_cli_config()
+        self._attach_server = AttachServer(attach_address(cli_config))
+    
+    async def start(self):
+        """Start listening for attached terminals (python main.py attach)"""
+        await self._attach_server.start()
+    
+    def _attach_command(self, token: str) -> List[str]:
+        """Command line of a one-shot terminal answering the question identified by token"""
+        if getattr(sys, 'frozen', False):
+            command = [sys.executable]
+        else:
+            command = [sys.executable, MAIN_SCRIPT]
+        address = self._attach_server.address
+        if isinstance(address, str):
+            options = ["--socket-path", address]
+        else:
+            options = ["--host", address[0], "--port", str(address[1])]
+        return command + ["attach"] + options + ["--token", token]
+    
+    def _open_window(self, token: str):
+        """Start a new command line window running a one-shot terminal"""
+        args = self._attach_command(token)
+        if sys.platform == 'win32':
+            # Windows platform
+            cmd = f'start cmd /c "{subprocess.list2cmdline(args)}"'
+            subprocess.Popen(cmd, shell=True)
+        else:
+            # Linux/Mac platform
+            command_line = shlex.join(args)
+            if sys.platform == 'darwin':  # macOS
+                script = command_line.replace('\\', '\\\\').replace('"', '\\"')
+                cmd = ['osascript', '-e', f'tell app "Terminal" to do script "{script}"']
+            else:  # Linux
+                cmd = ['x-terminal-emulator', '-e', command_line]
+            subprocess.Popen(cmd)
+    
+    async def _ask_in_new_window(self, kind: str, payload: Dict[str, Any], ctx: Context = None) -> Any:
+        """
+        Ask a question in a new command line window. The window connects back to the
+        attach server and receives the question and returns the answer over the socket,
+        so nothing is written to disk and the answer arrives as soon as it is submitted.
+        
+        Args:
+            kind: Question type, select_option, request_additional_info or ask_questions
+            payload: Question data rendered by the terminal
+            ctx: FastMCP context object
+            
+        Returns:
+            Answer entered in the new window
+        """
+        await self.start()
+        if not self._attach_server.is_running:
+            raise ConnectionError("CLI attach server is not running")
+        
+        if ctx:
+            await ctx.info("Starting new command line window...")
+        
+        return await self._attach_server.ask_spawned(
+            kind, payload, self._open_window, connect_timeout=NEW_WINDOW_CONNECT_TIMEOUT
+        )
+    
+    def _select_texts(self, allow_remember: bool = False) -> Dict[str, str]:
+        """Texts used when rendering an option list in a terminal"""
+        texts = {
+            'custom_input_tip': get_text('custom_input_tip'),
+            'input_option': get_text('input_option'),
+            'invalid_option': get_text('invalid_option'),
+            'custom_input': get_text('custom_input'),
+            'multiline_tip': get_text('multiline_tip'),
+            'end_marker': END_MARKER
+        }
+        if allow_remember:
+            # The terminal asks whether to remember the answer
+            texts['remember_prompt'] = get_text('remember_prompt')
+        return texts
+    
+    def _info_texts(self, allow_remember: bool = False) -> Dict[str, str]:
+        """Texts used when rendering an information request in a terminal"""
+        texts = {
+            'multiline_tip': get_text('multiline_tip'),
+            'current_info': get_text('current_info'),
+            'input_prompt': get_text('input_prompt'),
+            'end_marker': END_MARKER,
+            'history_tip': get_text('history_tip'),
+            'history_no_match': get_text('history_no_match')
+        }
+        if allow_remember:
+            texts['remember_prompt'] = get_text('remember_prompt')
+        return texts
+    
+    def _info_payload(self, prompt: str) -> Dict[str, Any]:
+        """Payload of a request_additional_info request rendered by a terminal"""
+        payload = {
+            'prompt': prompt,
+            'ui_texts': self._info_texts(get_answer_cache_config()["enabled"])
+        }
+        history_config = get_answer_history_config()
+        if history_config["enabled"]:
+            # The terminal runs on this machine and searches the history database itself
+            payload['history'] = {
+                'path': os.path.abspath(history_config["path"] or default_history_path()),
+                'limit': int(history_config["suggestions"])
+            }
+        return payload
+    
+    def _questions_payload(self, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Payload of an ask_questions request rendered by a terminal"""
+        return {
+            'questions': questions,
+            'select_texts': self._select_texts(),
+            'info_texts': self._info_texts(),
+            'ui_texts': {'question_counter': get_text('question_counter')}
+        }
     
     async def select_option(
         self,
@@ -57,189 +182,24 @@ class CommandLineUI:
         if ctx:
             await ctx.info("Displaying options using command line interface...")
         
-        try:
-            # Create temporary data file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as data_file:
-                data_path = data_file.name
-                # Prepare text dictionary to pass to the temporary script
-                ui_texts = {
-                    'custom_input_tip': get_text('custom_input_tip'),
-                    'input_option': get_text('input_option'),
-                    'invalid_option': get_text('invalid_option'),
-                    'custom_input': get_text('custom_input'),
-                    'multiline_tip': get_text('multiline_tip'),
-                    'end_marker': END_MARKER
-                }
-                
-                # Write options and configuration to temporary file
-                json.dump({
+        # Prefer an attached terminal, no window has to be spawned for it
+        await self.start()
+        if self._attach_server.has_clients():
+            try:
+                return await self._attach_server.ask("select_option", {
                     'options': options,
                     'prompt': prompt,
-                    'allow_custom': True,  # 始终允许自定义输入
-                    'ui_texts': ui_texts
-                }, data_file)
-            
-            # Create temporary result file path
-            result_path = f"{data_path}.result"
-            
-            # Create temporary script file
-            script_content = """
-import json
-import sys
-import os
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-
-def main():
-    console = Console()
-    
-    # Read data file
-    data_path = sys.argv[1]
-    result_path = sys.argv[2]
-    
-    with open(data_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    options = data['options']
-    prompt = data['prompt']
-    allow_custom = data['allow_custom']
-    ui_texts = data.get('ui_texts', {})
-    end_marker = ui_texts.get('end_marker', 'END')
-    
-    # Format options
-    formatted_options = []
-    for i, option in enumerate(options, 1):
-        if isinstance(option, dict):
-            # If option is a dictionary, try to get title or description
-            title = option.get("title", option.get("name", option.get("description", f"Option {i}")))
-            description = option.get("description", "")
-            formatted_option = f"{title}"
-            if description:
-                formatted_option += f"\\n   {description}"
-            formatted_options.append(formatted_option)
-        else:
-            # If option is a string, use directly
-            formatted_options.append(str(option))
-    
-    # Use Rich to display panel
-    md_content = f"# {prompt}\\n\\n"
-    for i, option in enumerate(formatted_options, 1):
-        md_content += f"{i}. {option}\\n\\n"
-    
-    if allow_custom:
-        md_content += f"*{ui_texts.get('custom_input_tip', 'Enter 0 to provide a custom answer')}*"
-    
-    console.print(Panel(Markdown(md_content), border_style="green"))
-    
-    # Get user input
-    while True:
+                    'ui_texts': self._select_texts(get_answer_cache_config()["enabled"])
+                })
+            except ConnectionError as e:
+                logger.warning(f"Attached terminal unavailable, starting new window: {e}")
+        
         try:
-            user_choice = input(f"{ui_texts.get('input_option', 'Enter your choice')}: ").strip()
-            
-            # Handle custom input
-            if user_choice == "0" and allow_custom:
-                console.print(f"{ui_texts.get('custom_input', 'Enter your custom answer')}")
-                console.print(f"{ui_texts.get('multiline_tip', 'You can enter multiple lines. Enter ' + end_marker + ' on a separate line to finish.')}")
-                
-                # Get multiline input
-                input_lines = []
-                while True:
-                    line = input()
-                    if line.strip() == end_marker:
-                        break
-                    input_lines.append(line)
-                
-                custom_input = "\\n".join(input_lines)
-                
-                user_input = {
-                    "selected_index": -1,
-                    "selected_option": None,
-                    "custom_input": custom_input,
-                    "is_custom": True
-                }
-                break
-            
-            # Handle numeric choice
-            choice_index = int(user_choice) - 1
-            if 0 <= choice_index < len(options):
-                selected_option = options[choice_index]
-                user_input = {
-                    "selected_index": choice_index,
-                    "selected_option": selected_option,
-                    "custom_input": "",
-                    "is_custom": False
-                }
-                break
-            else:
-                console.print(ui_texts.get('invalid_option', 'Invalid option, please try again'), style="bold red")
-        except ValueError:
-            console.print(ui_texts.get('invalid_option', 'Invalid option, please try again'), style="bold red")
-    
-    # Write result to file
-    with open(result_path, 'w', encoding='utf-8') as f:
-        json.dump(user_input, f)
-
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
-        data_path = sys.argv[1]
-        result_path = sys.argv[2]
-        with open(result_path, "w", encoding="utf-8") as f:
-            json.dump(f"Error: {str(e)}", f)
-    # 自动关闭窗口，不需要用户手动按回车
-"""
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as script_file:
-                script_path = script_file.name
-                script_file.write(script_content)
-            
-            if ctx:
-                await ctx.info(f"Starting new command line window...")
-            
-            # Start new command line window to execute script
-            if sys.platform == 'win32':
-                # Windows platform
-                cmd = f'start cmd /c "python {script_path} {data_path} {result_path}"'
-                process = subprocess.Popen(cmd, shell=True)
-            else:
-                # Linux/Mac platform
-                if sys.platform == 'darwin':  # macOS
-                    cmd = ['osascript', '-e', f'tell app "Terminal" to do script "python {script_path} {data_path} {result_path}"']
-                else:  # Linux
-                    cmd = ['x-terminal-emulator', '-e', f'python {script_path} {data_path} {result_path}']
-                process = subprocess.Popen(cmd)
-            
-            if ctx:
-                await ctx.info(f"Waiting for user input in new window...")
-            
-            # Wait for user input in new window
-            timeout = 300  # 5 minutes timeout
-            start_time = time.time()
-            
-            # Wait for result file to appear
-            while not os.path.exists(result_path):
-                await asyncio.sleep(0.5)
-                if time.time() - start_time > timeout:
-                    raise TimeoutError("Timeout waiting for user input")
-            
-            # Wait for file writing to complete
-            await asyncio.sleep(0.5)
-            
-            # Read results
-            with open(result_path, 'r', encoding='utf-8') as f:
-                result = json.load(f)
-            
-            # Clean up temporary files
-            try:
-                os.remove(script_path)
-                os.remove(data_path)
-                os.remove(result_path)
-            except:
-                pass
-            
-            return result
+            return await self._ask_in_new_window("select_option", {
+                'options': options,
+                'prompt': prompt,
+                'ui_texts': self._select_texts(get_answer_cache_config()["enabled"])
+            }, ctx)
             
         except Exception as e:
             if ctx:
@@ -326,135 +286,16 @@ if __name__ == "__main__":
         if ctx:
             await ctx.info("Requesting information using command line interface...")
         
-        try:
-            # Create temporary data file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as data_file:
-                data_path = data_file.name
-                # Prepare text dictionary to pass to the temporary script
-                ui_texts = {
-                    'multiline_tip': get_text('multiline_tip'),
-                    'current_info': get_text('current_info'),
-                    'input_prompt': get_text('input_prompt'),
-                    'end_marker': END_MARKER
-                }
-                
-                # Write options and configuration to temporary file
-                json.dump({
-                    'prompt': prompt,
-                    'ui_texts': ui_texts
-                }, data_file)
-            
-            # Create temporary result file path
-            result_path = f"{data_path}.result"
-            
-            # Create temporary script file
-            script_content = """
-import json
-import sys
-import os
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-
-def main():
-    console = Console()
-    
-    # Read data file
-    data_path = sys.argv[1]
-    result_path = sys.argv[2]
-    
-    with open(data_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    prompt = data['prompt']
-    ui_texts = data.get('ui_texts', {})
-    end_marker = ui_texts.get('end_marker', 'END')
-
-    # Build markdown content
-    md_content = f"### {prompt}\\n\\n"
-    
-    # Add multiline input tip
-    md_content += f"\\n{ui_texts.get('multiline_tip', 'You can enter multiple lines. Enter ' + end_marker + ' on a separate line to finish.')}\\n"
-    
-    # Display content
-    console.print(Markdown(md_content))
-    
-    # Get user input (multiline)
-    print(f"{ui_texts.get('input_prompt', 'Input')}: ", end="", flush=True)
-    
-    input_lines = []
-    while True:
-        line = input()
-        if line.strip() == end_marker:
-            break
-        input_lines.append(line)
-    
-    user_input = "\\n".join(input_lines)
-    
-    # Write result to file
-    with open(result_path, 'w', encoding='utf-8') as f:
-        json.dump(user_input, f)
-
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
-        data_path = sys.argv[1]
-        result_path = sys.argv[2]
-        with open(result_path, "w", encoding="utf-8") as f:
-            json.dump(f"Error: {str(e)}", f)
-    # 自动关闭窗口，不需要用户手动按回车
-"""
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False, encoding='utf-8') as script_file:
-                script_path = script_file.name
-                script_file.write(script_content)
-            
-            if ctx:
-                await ctx.info(f"Starting new command line window...")
-            
-            # Start new command line window to execute script
-            if sys.platform == 'win32':
-                # Windows platform
-                cmd = f'start cmd /c "python {script_path} {data_path} {result_path}"'
-                process = subprocess.Popen(cmd, shell=True)
-            else:
-                # Linux/Mac platform
-                if sys.platform == 'darwin':  # macOS
-                    cmd = ['osascript', '-e', f'tell app "Terminal" to do script "python {script_path} {data_path} {result_path}"']
-                else:  # Linux
-                    cmd = ['x-terminal-emulator', '-e', f'python {script_path} {data_path} {result_path}']
-                process = subprocess.Popen(cmd)
-            
-            if ctx:
-                await ctx.info(f"Waiting for user input in new window...")
-            
-            # Wait for user input in new window
-            timeout = 300  # 5 minutes timeout
-            start_time = time.time()
-            
-            # Wait for result file to appear
-            while not os.path.exists(result_path):
-                await asyncio.sleep(0.5)
-                if time.time() - start_time > timeout:
-                    raise TimeoutError("Timeout waiting for user input")
-            
-            # Wait for file writing to complete
-            await asyncio.sleep(0.5)
-            
-            # Read results
-            with open(result_path, 'r', encoding='utf-8') as f:
-                result = json.load(f)
-            
-            # Clean up temporary files
+        # Prefer an attached terminal, no window has to be spawned for it
+        await self.start()
+        if self._attach_server.has_clients():
             try:
-                os.remove(script_path)
-                os.remove(data_path)
-                os.remove(result_path)
-            except:
-                pass
-            
-            return result
+                return await self._attach_server.ask("request_additional_info", self._info_payload(prompt))
+            except ConnectionError as e:
+                logger.warning(f"Attached terminal unavailable, starting new window: {e}")
+        
+        try:
+            return await self._ask_in_new_window("request_additional_info", self._info_payload(prompt), ctx)
             
         except Exception as e:
             if ctx:
@@ -485,3 +326,41 @@ if __name__ == "__main__":
                 input_lines.append(line)
             
             return "\n".join(input_lines)
+    
+    async def ask_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        ctx: Context = None
+    ) -> List[Any]:
+        """
+        Ask several questions in one terminal session, one after another without
+        a new window per question
+
+        Args:
+            questions: Questions normalized by ui.ui.normalize_questions
+            ctx: FastMCP context object
+
+        Returns:
+            Answers in question order
+        """
+        if ctx:
+            await ctx.info("Asking questions using command line interface...")
+        
+        # Prefer an attached terminal, no window has to be spawned for it
+        await self.start()
+        if self._attach_server.has_clients():
+            try:
+                return await self._attach_server.ask("ask_questions", self._questions_payload(questions))
+            except ConnectionError as e:
+                logger.warning(f"Attached terminal unavailable, starting new window: {e}")
+        
+        try:
+            return await self._ask_in_new_window("ask_questions", self._questions_payload(questions), ctx)
+            
+        except Exception as e:
+            if ctx:
+                await ctx.error(f"Failed to start new window: {str(e)}")
+            
+            # Fall back to the current window
+            self.console.print(f"Failed to start new window, falling back to current window: {str(e)}", style="bold red")
+            return prompt_questions(self.console, self._questions_payload(questions))
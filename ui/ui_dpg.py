@@ -8,31 +8,26 @@ DearPyGui Interface Implementation
 import asyncio
 import sys
 import logging
+import threading
 import traceback
 from typing import List, Dict, Any, Optional, Union
 from fastmcp import Context
+from ui import journal
+
+logger = logging.getLogger('DearPyGuiUI')
 
 # Import DearPyGui modules (if available)
 try:
     import dearpygui.dearpygui as dpg
     import sys
     # DearPyGui 2.0版本不再有__version__属性，改用其他方式检测
-    print(f"DearPyGui successfully imported")
-    print(f"Python version: {sys.version}")
     DPG_AVAILABLE = True
 except ImportError:
-    print("DearPyGui import error: package not installed")
     DPG_AVAILABLE = False
 except Exception as e:
-    print(f"DearPyGui initialization error: {e}")
+    logger.error(f"DearPyGui initialization error: {e}")
     DPG_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                   handlers=[logging.StreamHandler()])
-logger = logging.getLogger('DearPyGuiUI')
-
 # Define Context type alias, making it optional
 ContextType = Optional[Context]
 
@@ -43,12 +38,12 @@ if not DPG_AVAILABLE:
         
         def __init__(self):
             """Initialize DearPyGui interface"""
-            print("Warning: DearPyGui not installed, DearPyGui interface will not be available")
+            logger.warning("DearPyGui not installed, DearPyGui interface will not be available")
             self._dpg_available = False
         
         async def select_option(self, options, prompt="Please select one of the following options", ctx=None):
             """Placeholder method"""
-            print("Error: Cannot use DearPyGui interface, DearPyGui not installed")
+            logger.error("Cannot use DearPyGui interface, DearPyGui not installed")
             return {
                 "selected_index": -1,
                 "selected_option": None,
@@ -58,7 +53,7 @@ if not DPG_AVAILABLE:
         
         async def request_additional_info(self, prompt, ctx=None):
             """Placeholder method"""
-            print("Error: Cannot use DearPyGui interface, DearPyGui not installed")
+            logger.error("Cannot use DearPyGui interface, DearPyGui not installed")
             return "DearPyGui not installed, interface unavailable"
             
     # Assign placeholder class to DearPyGuiUI
@@ -84,6 +79,15 @@ else:
                     dpg.create_context()
                     self._context_created = True
         
+        def prewarm(self):
+            """Create the DPG context ahead of the first request"""
+            self._ensure_context()
+        
+        def _render_until_closed(self, cancelled: threading.Event):
+            """Run the render loop until the window is submitted or the request is cancelled"""
+            while dpg.is_dearpygui_running() and not cancelled.is_set():
+                dpg.render_dearpygui_frame()
+        
         async def select_option(
             self,
             options: List[Union[str, Dict[str, Any]]],
@@ -102,7 +106,7 @@ else:
                 Selection result dictionary
             """
             if not self._dpg_available:
-                print("Error: Cannot use DearPyGui interface, DearPyGui not installed")
+                logger.error("Cannot use DearPyGui interface, DearPyGui not installed")
                 return {
                     "selected_index": -1,
                     "selected_option": None,
@@ -111,25 +115,25 @@ else:
                 }
             
             logger.debug(f"select_option called: options count={len(options)}")
-            print("DearPyGui select_option called with options:", options)
             
             # Create event object for synchronization
             event = asyncio.Event()
             result_container = [None]  # Use list to store result for modification in callback
+            cancelled = threading.Event()  # Set when the tool call is cancelled
             
             # Define callback function, called when window closes with result
             def on_selection_completed(selection_result):
-                print("Selection completed with result:", selection_result)
+                journal.record("dialog_closed", ui="dpg", dialog="selection", result=selection_result)
                 result_container[0] = selection_result
                 event.set()
             
             # Run DPG window in separate thread
             def run_dpg_window():
                 try:
-                    print("Starting DPG window thread")
+                    logger.debug("Starting DPG window thread")
                     # Ensure context is created
                     self._ensure_context()
-                    print("DPG context created")
+                    logger.debug("DPG context created")
                     
                     # Store selection result
                     selection_result = {
@@ -142,17 +146,17 @@ else:
                     # Create viewport if not exists
                     try:
                         if not dpg.does_item_exist("viewport"):
-                            print("Creating DPG viewport")
+                            logger.debug("Creating DPG viewport")
                             dpg.create_viewport(title="Select Option", width=600, height=400)
-                            print("Setting up DearPyGui")
+                            logger.debug("Setting up DearPyGui")
                             dpg.setup_dearpygui()
-                            print("DearPyGui setup completed")
+                            logger.debug("DearPyGui setup completed")
                     except Exception as viewport_error:
-                        print(f"Error creating viewport: {viewport_error}")
+                        logger.error(f"Error creating viewport: {viewport_error}")
                         raise
                     
                     # Create main window with selection dialog
-                    print("Creating selection window")
+                    logger.debug("Creating selection window")
                     try:
                         with dpg.window(label="Select Option", width=580, height=380, pos=(10, 10), 
                                       no_collapse=True, no_close=True, no_move=True, tag="selection_window"):
@@ -165,7 +169,6 @@ else:
                             
                             # Helper function to handle option selection
                             def select_radio(sender, app_data, user_data):
-                                print(f"Radio option selected: {user_data}")
                                 selected_option["value"] = user_data
                             
                             # Add option group
@@ -181,7 +184,6 @@ else:
                                     else:
                                         text = str(opt)
                                     
-                                    print(f"Adding option {i}: {text}")
                                     dpg.add_radio_button(items=[text], callback=select_radio, user_data=i)
                             
                             dpg.add_separator()
@@ -199,7 +201,7 @@ else:
                             
                             # Add submit button
                             def submit_callback():
-                                print("Submit button clicked")
+                                logger.debug("Submit button clicked")
                                 # Check if custom input is selected
                                 if dpg.get_value("custom_input") and dpg.is_item_enabled("custom_input"):
                                     # User chose custom input
@@ -207,24 +209,24 @@ else:
                                     selection_result["selected_option"] = None
                                     selection_result["custom_input"] = dpg.get_value("custom_input")
                                     selection_result["is_custom"] = True
-                                    print("Custom input selected:", selection_result["custom_input"])
+                                    logger.debug("Custom input selected")
                                 elif selected_option["value"] >= 0:
                                     # User chose predefined option
                                     selection_result["selected_index"] = selected_option["value"]
                                     selection_result["selected_option"] = options[selected_option["value"]]
                                     selection_result["custom_input"] = ""
                                     selection_result["is_custom"] = False
-                                    print("Predefined option selected:", selection_result["selected_index"])
+                                    logger.debug(f"Predefined option selected: {selection_result['selected_index']}")
                                 else:
                                     # User didn't select any option
                                     selection_result["selected_index"] = -1
                                     selection_result["selected_option"] = None
                                     selection_result["custom_input"] = "No option selected"
                                     selection_result["is_custom"] = True
-                                    print("No option selected")
+                                    logger.debug("No option selected")
                                 
                                 # Close window and return result
-                                print("Closing window and returning result")
+                                logger.debug("Closing window and returning result")
                                 dpg.delete_item("selection_window")
                                 dpg.stop_dearpygui()
                                 on_selection_completed(selection_result)
@@ -233,34 +235,31 @@ else:
                                 dpg.add_spacer(width=450)
                                 dpg.add_button(label="Submit", callback=submit_callback)
                     except Exception as window_error:
-                        print(f"Error creating window: {window_error}")
+                        logger.error(f"Error creating window: {window_error}")
                         raise
                     
                     # Show viewport and start DearPyGui
-                    print("Showing viewport and starting DearPyGui")
+                    logger.debug("Showing viewport and starting DearPyGui")
                     try:
                         dpg.show_viewport()
-                        print("Viewport shown, starting main loop")
-                        dpg.start_dearpygui()
-                        print("DearPyGui stopped")
+                        journal.record("dialog_shown", ui="dpg", dialog="selection")
+                        self._render_until_closed(cancelled)
+                        logger.debug("DearPyGui stopped")
                     except Exception as run_error:
-                        print(f"Error running DearPyGui: {run_error}")
+                        logger.error(f"Error running DearPyGui: {run_error}")
                         raise
                     
                     # Cleanup resources after window is closed
                     try:
                         dpg.destroy_context()
                         self._context_created = False
-                        print("DPG context destroyed")
+                        logger.debug("DPG context destroyed")
                     except Exception as cleanup_error:
-                        print(f"Error cleaning up DPG context: {cleanup_error}")
+                        logger.error(f"Error cleaning up DPG context: {cleanup_error}")
                     
                 except Exception as e:
-                    print(f"DearPyGui window error: {e}")
-                    print(f"Error type: {type(e)}")
                     import traceback
                     error_trace = traceback.format_exc()
-                    print(f"Error traceback: {error_trace}")
                     logger.error(f"DearPyGui window error: {e}")
                     logger.error(error_trace)
                     on_selection_completed({
@@ -270,7 +269,7 @@ else:
                         "is_custom": True
                     })
                     
-                print("DPG window thread completed")
+                logger.debug("DPG window thread completed")
             
             # Execute DPG window in thread pool
             try:
@@ -280,7 +279,12 @@ else:
                     
                 # Start thread
                 loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, run_dpg_window)
+                try:
+                    await loop.run_in_executor(None, run_dpg_window)
+                except asyncio.CancelledError:
+                    # End the render loop so the window closes and the worker thread is freed
+                    cancelled.set()
+                    raise
                 
                 # Wait for event
                 await event.wait()
@@ -325,14 +329,15 @@ else:
                 User input information
             """
             if not self._dpg_available:
-                print("Error: Cannot use DearPyGui interface, DearPyGui not installed")
+                logger.error("Cannot use DearPyGui interface, DearPyGui not installed")
                 return "DearPyGui not installed, interface unavailable"
             
-            logger.debug(f"request_additional_info called: prompt={prompt}, current_info={current_info}")
+            logger.debug("request_additional_info called")
             
             # Create event object for synchronization
             event = asyncio.Event()
             result = [""]  # Use list to store result for modification in callback
+            cancelled = threading.Event()  # Set when the tool call is cancelled
             
             # Define callback function, called when window closes with result
             def on_input_completed(text):
@@ -387,7 +392,7 @@ else:
                     
                     # Show viewport and start DearPyGui
                     dpg.show_viewport()
-                    dpg.start_dearpygui()
+                    self._render_until_closed(cancelled)
                     
                     # Cleanup resources after window is closed
                     dpg.destroy_context()
@@ -406,7 +411,12 @@ else:
                     
                 # Start thread
                 loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, run_dpg_window)
+                try:
+                    await loop.run_in_executor(None, run_dpg_window)
+                except asyncio.CancelledError:
+                    # End the render loop so the window closes and the worker thread is freed
+                    cancelled.set()
+                    raise
                 
                 # Wait for event
                 await event.wait()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Fan-out Interface Implementation
+Shows every question on several interfaces at once (e.g. the PyQt dialog, the
+web dashboard and an attached terminal), the first answer wins and the other
+interfaces close the question. Channels can join late, when the question is
+still unanswered after a delay. A channel whose dialog is closed without an
+answer resigns, the question stays open on the others.
+"""
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Union, Callable, Awaitable
+from fastmcp import Context
+from config_manager import get_fanout_config
+from lang_manager import get_text
+
+logger = logging.getLogger('FanoutUI')
+
+
+class _Channel:
+    """An interface questions are shown on"""
+
+    def __init__(self, name: str, ui, after: float):
+        self.name = name
+        self.ui = ui
+        self.after = after
+
+
+class _ChannelContext:
+    """
+    Context handed to one channel. Interfaces report a question they could not
+    get answered (timeout, interface unavailable) with ctx.error, such an answer
+    does not win, so the error is held back instead of reaching the caller.
+    """
+
+    def __init__(self, ctx: Context):
+        self.ctx = ctx
+        self.errors: List[str] = []
+
+    def __getattr__(self, name: str):
+        return getattr(self.ctx, name)
+
+    async def info(self, message: str):
+        if self.ctx is not None:
+            await self.ctx.info(message)
+
+    async def error(self, message: str):
+        self.errors.append(message)
+
+
+def _unavailable(ui) -> bool:
+    """Whether an interface could not be loaded and only answers with an error"""
+    from ui.ui import PlaceholderUI
+
+    if isinstance(ui, PlaceholderUI):
+        return True
+    # Interfaces with missing dependencies flag themselves, e.g. _pyqt_available
+    return any(name.endswith("_available") and value is False for name, value in vars(ui).items())
+
+
+def _resigned(result: Any) -> bool:
+    """Whether an answer only says the question was closed without answering it"""
+    if result is None or result == "":
+        return True
+    if isinstance(result, list):
+        return all(_resigned(answer) for answer in result)
+    if isinstance(result, dict):
+        if "text" in result:
+            # Information answer flagged for the answer cache
+            return _resigned(result["text"])
+        return result.get("selected_index") == -1 and result.get("custom_input") in (
+            "", None, get_text("user_cancelled_selection")
+        )
+    return False
+
+
+class FanoutUI:
+    """Fan-out Interface Implementation Class"""
+
+    def __init__(self):
+        """Initialize fan-out interface from the fanout configuration"""
+        from ui.ui import UIFactory
+
+        self.channels: List[_Channel] = []
+        for channel in get_fanout_config()["channels"]:
+            name = channel["ui"]
+            if name == "fanout":
+                raise ValueError("A fanout channel cannot be the fanout interface itself")
+            ui = UIFactory.create_ui(name)
+            if _unavailable(ui):
+                logger.warning(f"Leaving out the {name} channel, the interface is not available")
+                continue
+            self.channels.append(_Channel(name, ui, float(channel.get("after", 0))))
+        if not self.channels:
+            raise ValueError("No fanout channel is available")
+        logger.info("Fan-out channels: " + ", ".join(
+            f"{channel.name} (after {channel.after:g}s)" if channel.after else channel.name
+            for channel in self.channels
+        ))
+
+    @property
+    def concurrent(self) -> bool:
+        """Questions are only left unqueued when every channel handles them in parallel"""
+        return all(getattr(channel.ui, "concurrent", False) for channel in self.channels)
+
+    async def start(self):
+        """Start background services of the channels"""
+        for channel in self.channels:
+            start = getattr(channel.ui, "start", None)
+            if start is not None:
+                await start()
+
+    def prewarm(self):
+        """Initialise every channel ahead of the first request"""
+        for channel in self.channels:
+            prewarm = getattr(channel.ui, "prewarm", None)
+            if prewarm is not None:
+                prewarm()
+
+    def mount(self, server, base_url: str):
+        """Let channels serve their pages from the MCP server's HTTP app"""
+        for channel in self.channels:
+            mount = getattr(channel.ui, "mount", None)
+            if mount is not None:
+                mount(server, base_url)
+
+    async def _first_answer(self, ask: Callable[[Any, Any], Awaitable[Any]], ctx: Context = None) -> Any:
+        """
+        Ask on all channels and return the first answer, the other channels are cancelled.
+        A channel closed without an answer resigns and the others keep the question.
+
+        Args:
+            ask: Coroutine function asking one interface, called as ask(ui, context)
+            ctx: FastMCP context object
+
+        Returns:
+            First answer. When every channel resigned or failed, the answer of the first
+            channel that resigned, else the last failed answer with its errors passed on to ctx
+        """
+        async def run(channel: _Channel, context: _ChannelContext):
+            if channel.after > 0:
+                await asyncio.sleep(channel.after)
+                logger.info(f"No answer after {channel.after:g}s, also asking on {channel.name}")
+            return await ask(channel.ui, context)
+
+        tasks = {}
+        for channel in self.channels:
+            context = _ChannelContext(ctx)
+            tasks[asyncio.create_task(run(channel, context))] = (channel, context)
+
+        pending = set(tasks)
+        failure = None
+        resigned = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    channel, context = tasks[task]
+                    if task.exception() is not None:
+                        logger.warning(f"{channel.name} channel failed: {task.exception()}")
+                        failure = failure or task.exception()
+                    elif context.errors:
+                        logger.warning(f"{channel.name} channel got no answer: {'; '.join(context.errors)}")
+                        failure = (task.result(), context.errors)
+                    elif _resigned(task.result()):
+                        logger.info(f"{channel.name} channel was closed without an answer")
+                        if resigned is None:
+                            resigned = (task.result(),)
+                    else:
+                        logger.info(f"Answered on the {channel.name} channel")
+                        return task.result()
+        finally:
+            # Close the question on the channels that lost
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if resigned is not None:
+            return resigned[0]
+        if isinstance(failure, BaseException):
+            raise failure
+        result, errors = failure
+        if ctx is not None:
+            for message in errors:
+                await ctx.error(message)
+        return result
+
+    async def select_option(
+        self,
+        options: List[Union[str, Dict[str, Any]]],
+        prompt: str = "Please select one of the following options",
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """
+        Present options on all channels
+
+        Args:
+            options: List of options, can be a list of strings or dictionaries
+            prompt: Prompt message
+            ctx: FastMCP context object
+
+        Returns:
+            Selection result dictionary of the channel answering first
+        """
+        return await self._first_answer(lambda ui, context: ui.select_option(options, prompt, ctx=context), ctx)
+
+    async def request_additional_info(
+        self,
+        prompt: str,
+        ctx: Context = None
+    ) -> str:
+        """
+        Request supplementary information on all channels
+
+        Args:
+            prompt: Prompt message
+            ctx: FastMCP context object
+
+        Returns:
+            User input information of the channel answering first
+        """
+        return await self._first_answer(lambda ui, context: ui.request_additional_info(prompt, ctx=context), ctx)
+
+    async def ask_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        ctx: Context = None
+    ) -> List[Any]:
+        """
+        Ask several questions on all channels
+
+        Args:
+            questions: Questions normalized by ui.ui.normalize_questions
+            ctx: FastMCP context object
+
+        Returns:
+            Answers in question order of the channel answering first
+        """
+        from ui.ui import ask_questions_on
+
+        return await self._first_answer(lambda ui, context: ask_questions_on(ui, questions, context), ctx)
@@ -8,13 +8,11 @@ PySimpleGUI Interface Implementation
 import asyncio
 import sys
 import logging
+import threading
 from typing import List, Dict, Any, Optional, Union
 from fastmcp import Context
+from ui import journal
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                   handlers=[logging.StreamHandler()])
 logger = logging.getLogger('PySimpleGUIUI')
 
 try:
@@ -26,12 +24,12 @@ except ImportError:
         
         def __init__(self):
             """Initialize PySimpleGUI interface"""
-            print("Warning: PySimpleGUI not installed, PySimpleGUI interface will not be available")
+            logger.warning("PySimpleGUI not installed, PySimpleGUI interface will not be available")
             self._psg_available = False
         
         async def select_option(self, options, prompt="Please select one of the following options", ctx=None):
             """Placeholder method"""
-            print("Error: Cannot use PySimpleGUI interface, PySimpleGUI not installed")
+            logger.error("Cannot use PySimpleGUI interface, PySimpleGUI not installed")
             return {
                 "selected_index": -1,
                 "selected_option": None,
@@ -41,7 +39,7 @@ except ImportError:
         
         async def request_additional_info(self, prompt, ctx=None):
             """Placeholder method"""
-            print("Error: Cannot use PySimpleGUI interface, PySimpleGUI not installed")
+            logger.error("Cannot use PySimpleGUI interface, PySimpleGUI not installed")
             return "PySimpleGUI not installed, interface unavailable"
             
     # Assign placeholder class to PySimpleGUIUI
@@ -73,7 +71,7 @@ else:
                 Selection result dictionary
             """
             if not self._psg_available:
-                print("Error: Cannot use PySimpleGUI interface, PySimpleGUI not installed")
+                logger.error("Cannot use PySimpleGUI interface, PySimpleGUI not installed")
                 return {
                     "selected_index": -1,
                     "selected_option": None,
@@ -86,6 +84,7 @@ else:
             # Create event object for synchronization
             event = asyncio.Event()
             result_container = [None]  # Use list to store result for modification in callback
+            cancelled = threading.Event()  # Set when the tool call is cancelled
             
             # Define callback function
             def run_psg_window():
@@ -115,10 +114,24 @@ else:
                     
                     # Create window
                     window = sg.Window('Select Option', layout)
+                    journal.record("dialog_shown", ui="psg", dialog="selection")
                     
                     # Event loop
                     while True:
-                        event, values = window.read()
+                        # Wake up regularly to notice a cancelled tool call
+                        event, values = window.read(timeout=200)
+                        
+                        if cancelled.is_set():
+                            result = {
+                                "selected_index": -1,
+                                "selected_option": None,
+                                "custom_input": "Request cancelled",
+                                "is_custom": True
+                            }
+                            break
+                        
+                        if event == sg.TIMEOUT_KEY:
+                            continue
                         
                         if event == sg.WIN_CLOSED or event == 'Cancel':
                             # User cancelled
@@ -180,7 +193,12 @@ else:
                     
                 # Start thread
                 loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, run_psg_window)
+                try:
+                    await loop.run_in_executor(None, run_psg_window)
+                except asyncio.CancelledError:
+                    # Close the window so the worker thread is freed
+                    cancelled.set()
+                    raise
                 
                 # Wait for event
                 await event.wait()
@@ -225,14 +243,15 @@ else:
                 User input information
             """
             if not self._psg_available:
-                print("Error: Cannot use PySimpleGUI interface, PySimpleGUI not installed")
+                logger.error("Cannot use PySimpleGUI interface, PySimpleGUI not installed")
                 return "PySimpleGUI not installed, interface unavailable"
             
-            logger.debug(f"request_additional_info called: prompt={prompt}, current_info={current_info}")
+            logger.debug("request_additional_info called")
             
             # Create event object for synchronization
             event = asyncio.Event()
             result = [""]  # Use list to store result for modification in callback
+            cancelled = threading.Event()  # Set when the tool call is cancelled
             
             # Define function for PySimpleGUI window
             def run_psg_window():
@@ -252,10 +271,19 @@ else:
                     
                     # Create window
                     window = sg.Window("Information Input", layout)
+                    journal.record("dialog_shown", ui="psg", dialog="input")
                     
                     # Event loop
                     while True:
-                        event, values = window.read()
+                        # Wake up regularly to notice a cancelled tool call
+                        event, values = window.read(timeout=200)
+                        
+                        if cancelled.is_set():
+                            result[0] = ""
+                            break
+                        
+                        if event == sg.TIMEOUT_KEY:
+                            continue
                         
                         if event == sg.WIN_CLOSED or event == "Cancel":
                             # User cancelled
@@ -284,7 +312,12 @@ else:
                     
                 # Start thread
                 loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, run_psg_window)
+                try:
+                    await loop.run_in_executor(None, run_psg_window)
+                except asyncio.CancelledError:
+                    # Close the window so the worker thread is freed
+                    cancelled.set()
+                    raise
                 
                 # Wait for event
                 await event.wait()
@@ -301,6 +334,137 @@ else:
                     await ctx.error(f"PySimpleGUI UI error: {e}")
                 return f"PySimpleGUI interface error: {str(e)}"
         
+        async def ask_questions(
+            self,
+            questions: List[Dict[str, Any]],
+            ctx: Context = None
+        ) -> List[Any]:
+            """
+            Ask several questions in one PySimpleGUI window
+
+            Args:
+                questions: Questions normalized by ui.ui.normalize_questions
+                ctx: FastMCP context
+
+            Returns:
+                Answers in question order
+            """
+            def answers_for(message):
+                # Same shapes as the single question windows return when not answered
+                return [
+                    {
+                        "selected_index": -1,
+                        "selected_option": None,
+                        "custom_input": message,
+                        "is_custom": True
+                    } if question["type"] == "select_option" else ""
+                    for question in questions
+                ]
+            
+            if not self._psg_available:
+                logger.error("Cannot use PySimpleGUI interface, PySimpleGUI not installed")
+                return answers_for("PySimpleGUI not installed, interface unavailable")
+            
+            logger.debug(f"ask_questions called: questions count={len(questions)}")
+            
+            cancelled = threading.Event()  # Set when the tool call is cancelled
+            
+            def read_answers(values):
+                """Answers from the window values, None while a question is unanswered"""
+                answers = []
+                for q, question in enumerate(questions):
+                    if question["type"] != "select_option":
+                        text = values[f"Q{q}_TEXT"].strip()
+                        if not text:
+                            return None
+                        answers.append(text)
+                        continue
+                    selected = [i for i in range(len(question["options"])) if values[f"Q{q}_OPT{i}"]]
+                    if selected:
+                        answers.append({
+                            "selected_index": selected[0],
+                            "selected_option": question["options"][selected[0]],
+                            "custom_input": "",
+                            "is_custom": False
+                        })
+                    elif values[f"Q{q}_CUSTOM"] and values[f"Q{q}_CUSTOM_INPUT"].strip():
+                        answers.append({
+                            "selected_index": -1,
+                            "selected_option": None,
+                            "custom_input": values[f"Q{q}_CUSTOM_INPUT"].strip(),
+                            "is_custom": True
+                        })
+                    else:
+                        return None
+                return answers
+            
+            def run_psg_window():
+                # One frame per question, radio groups keep the selections apart
+                layout = []
+                for q, question in enumerate(questions):
+                    rows = [[sg.Text(question["prompt"])]]
+                    if question["type"] == "select_option":
+                        for i, opt in enumerate(question["options"]):
+                            if isinstance(opt, dict):
+                                display_text = opt.get('title', opt.get('name', ''))
+                                if opt.get('description'):
+                                    display_text += f" - {opt['description']}"
+                            else:
+                                display_text = str(opt)
+                            rows.append([sg.Radio(display_text, f"Q{q}", key=f"Q{q}_OPT{i}")])
+                        rows.append([sg.Radio("Custom input:", f"Q{q}", key=f"Q{q}_CUSTOM"), sg.Input(key=f"Q{q}_CUSTOM_INPUT")])
+                    else:
+                        rows.append([sg.Multiline(key=f"Q{q}_TEXT", size=(60, 4))])
+                    layout.append([sg.Frame(f"Question {q + 1} of {len(questions)}", rows)])
+                layout.append([sg.Button("Submit"), sg.Button("Cancel")])
+                
+                window = sg.Window("Questions", layout)
+                journal.record("dialog_shown", ui="psg", dialog="questions")
+                try:
+                    while True:
+                        # Wake up regularly to notice a cancelled tool call
+                        window_event, values = window.read(timeout=200)
+                        
+                        if cancelled.is_set():
+                            return answers_for("Request cancelled")
+                        
+                        if window_event == sg.TIMEOUT_KEY:
+                            continue
+                        
+                        if window_event == sg.WIN_CLOSED or window_event == "Cancel":
+                            return answers_for("User cancelled selection")
+                        
+                        if window_event == "Submit":
+                            answers = read_answers(values)
+                            if answers is not None:
+                                return answers
+                            sg.popup_error("Please answer every question")
+                finally:
+                    window.close()
+            
+            try:
+                if ctx:
+                    await ctx.info("Asking questions using PySimpleGUI interface...")
+                
+                loop = asyncio.get_running_loop()
+                try:
+                    result = await loop.run_in_executor(None, run_psg_window)
+                except asyncio.CancelledError:
+                    # Close the window so the worker thread is freed
+                    cancelled.set()
+                    raise
+                
+                if ctx:
+                    await ctx.info("User answered the questions")
+                
+                return result
+                
+            except Exception as e:
+                logger.error(f"PySimpleGUI UI error: {e}")
+                if ctx:
+                    await ctx.error(f"PySimpleGUI UI error: {e}")
+                return answers_for(f"PySimpleGUI interface error: {str(e)}")
+        
         def cleanup(self):
             """Clean up resources"""
             # PySimpleGUI will automatically clean up resources
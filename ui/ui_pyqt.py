@@ -6,11 +6,18 @@ PyQt Interface Implementation
 """
 
 import asyncio
+import atexit
+import queue
 import sys
+import threading
+import time
 import logging
 import traceback
 from typing import List, Dict, Any, Optional, Union
 from fastmcp import Context
+from config_manager import get_answer_cache_config, get_answer_history_config
+from ui.metrics import observe_render
+from ui import answer_history, journal
 
 # Import language manager
 try:
@@ -27,15 +34,11 @@ try:
         QListWidget, QListWidgetItem, QCheckBox, QLineEdit, QTextEdit, QPlainTextEdit,
         QGroupBox, QRadioButton, QButtonGroup, QScrollArea, QWidget, QDesktopWidget
     )
-    from PyQt5.QtCore import QObject, pyqtSignal, Qt
+    from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, Qt, QTimer
     PYQT_AVAILABLE = True
 except ImportError:
     PYQT_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                   handlers=[logging.StreamHandler()])
 logger = logging.getLogger('PyQtUI')
 
 # Define Context type alias, making it optional
@@ -48,12 +51,12 @@ if not PYQT_AVAILABLE:
         
         def __init__(self):
             """Initialize PyQt interface"""
-            print(f"Warning: {get_text('pyqt_not_installed')}")
+            logger.warning(get_text('pyqt_not_installed'))
             self._pyqt_available = False
         
         async def select_option(self, options, prompt="Please select one of the following options", ctx=None):
             """Placeholder method"""
-            print(get_text("pyqt_not_installed"))
+            logger.error(get_text("pyqt_not_installed"))
             return {
                 "selected_index": -1,
                 "selected_option": None,
@@ -63,32 +66,618 @@ if not PYQT_AVAILABLE:
         
         async def request_additional_info(self, prompt, ctx=None):
             """Placeholder method"""
-            print(get_text("pyqt_not_installed"))
+            logger.error(get_text("pyqt_not_installed"))
             return get_text("pyqt_interface_unavailable")
-            
+    
     # Assign placeholder class to PyQtUI
     PyQtUI = PyQtUIMissingDeps  # type: ignore
 else:
     # If PyQt5 is installed, provide full implementation
-    class ResultEmitter(QObject):
-        """Used to emit signals in PyQt threads"""
-        result_ready = pyqtSignal(object)
+    class OptionDialog(QDialog):
+        """Option selection dialog"""
+        
+        def __init__(self, options, prompt, allow_remember=False):
+            super().__init__()
+            
+            # Get available screen size (excludes taskbar, etc.)
+            desktop = QDesktopWidget()
+            available_rect = desktop.availableGeometry()  # Use available area instead of full screen
+            window_height = max(600, int(available_rect.height() * 0.7))  # Use 70% of available height, max 600px
+            window_width = max(800, int(available_rect.width() * 0.6))  # Max 800px or 60% of available width
+            
+            # Set window properties with fixed size
+            self.setWindowTitle(get_text("select_dialog_title"))
+            self.setFixedSize(window_width, window_height)  # Use fixed size for consistency
+            
+            # Center the window on screen
+            self.move(
+                available_rect.x() + (available_rect.width() - window_width) // 2,
+                available_rect.y() + (available_rect.height() - window_height) // 2
+            )
+            
+            # Options list
+            self.options = options
+            
+            # Create main layout
+            main_layout = QVBoxLayout()
+            
+            # Create scrollable content area
+            scroll_area = QScrollArea()
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            
+            # Create content widget for scrollable area
+            content_widget = QWidget()
+            content_layout = QVBoxLayout()
+            
+            # Add prompt label
+            prompt_label = QLabel(prompt)
+            prompt_label.setWordWrap(True)
+            prompt_label.setStyleSheet("font-weight: bold; font-size: 12pt; margin: 10px;")
+            content_layout.addWidget(prompt_label)
+            
+            # Options group
+            self.option_group = QButtonGroup(self)
+            self.option_group.setExclusive(True)  # Radio selection
+            
+            option_container = QGroupBox(get_text("available_options"))
+            option_layout = QVBoxLayout()
+            
+            # Add predefined options
+            for i, opt in enumerate(options):
+                if isinstance(opt, dict):
+                    title = opt.get('title', f"Option {i+1}")
+                    desc = opt.get('description', '')
+                    text = title
+                    if desc:
+                        text += f" - {desc}"
+                else:
+                    text = str(opt)
+                
+                option_button = QRadioButton(text)
+                # Note: QRadioButton doesn't have setWordWrap, but text will wrap naturally in layout
+                self.option_group.addButton(option_button, i)
+                option_layout.addWidget(option_button)
+            
+            option_container.setLayout(option_layout)
+            content_layout.addWidget(option_container)
+            
+            # Custom input area (always allowed)
+            custom_group = QGroupBox(get_text("custom_input_group"))
+            custom_layout = QVBoxLayout()
+            
+            self.custom_radio = QRadioButton(get_text("custom_answer"))
+            self.option_group.addButton(self.custom_radio, -1)
+            custom_layout.addWidget(self.custom_radio)
+            
+            # Changed from QLineEdit to QPlainTextEdit for multi-line input
+            self.custom_input = QPlainTextEdit()
+            self.custom_input.setPlaceholderText(get_text("custom_input_placeholder"))
+            self.custom_input.setEnabled(False)  # Initially disabled
+            self.custom_input.setMinimumHeight(100)  # Set minimum height for multi-line input
+            self.custom_input.setMaximumHeight(150)  # Limit height to prevent excessive growth
+            
+            # Connect custom radio button event
+            self.custom_radio.toggled.connect(self.toggle_custom_input)
+            
+            custom_layout.addWidget(self.custom_input)
+            custom_group.setLayout(custom_layout)
+            content_layout.addWidget(custom_group)
+            
+            # Set content widget layout and add to scroll area
+            content_widget.setLayout(content_layout)
+            scroll_area.setWidget(content_widget)
+            
+            # Add scroll area to main layout
+            main_layout.addWidget(scroll_area)
+            
+            # Button area - fixed at bottom
+            button_layout = QHBoxLayout()
+            # Offered when the answer cache is enabled
+            self.remember_box = QCheckBox(get_text("remember_answer")) if allow_remember else None
+            if self.remember_box is not None:
+                button_layout.addWidget(self.remember_box)
+            submit_button = QPushButton(get_text("submit_button"))
+            submit_button.clicked.connect(self.accept)
+            submit_button.setMinimumHeight(35)  # Ensure button is easily clickable
+            button_layout.addStretch()
+            button_layout.addWidget(submit_button)
+            
+            main_layout.addLayout(button_layout)
+            
+            # Set main layout
+            self.setLayout(main_layout)
+        
+        def toggle_custom_input(self, enabled):
+            """Enable/disable custom input field"""
+            self.custom_input.setEnabled(enabled)
+            if enabled:
+                self.custom_input.setFocus()
+        
+        def get_selection(self):
+            """Get user selection"""
+            selected_id = self.option_group.checkedId()
+            
+            if selected_id == -1 and self.custom_radio.isChecked():
+                # User chose custom input - get text from QPlainTextEdit
+                result = {
+                    "selected_index": -1,
+                    "selected_option": None,
+                    "custom_input": self.custom_input.toPlainText(),
+                    "is_custom": True
+                }
+            elif selected_id >= 0:
+                # User chose predefined option
+                result = {
+                    "selected_index": selected_id,
+                    "selected_option": self.options[selected_id],
+                    "custom_input": "",
+                    "is_custom": False
+                }
+            else:
+                # User didn't select any option
+                return {
+                    "selected_index": -1,
+                    "selected_option": None,
+                    "custom_input": get_text("no_option_selected"),
+                    "is_custom": True
+                }
+            
+            if self.remember_box is not None and self.remember_box.isChecked():
+                result["remember"] = True
+            return result
+    
+    class InputDialog(QDialog):
+        """Information input dialog"""
+        
+        # Height of the earlier answers search box and list
+        HISTORY_AREA_HEIGHT = 170
+        
+        def __init__(self, prompt, current_info="", allow_remember=False, allow_history=False):
+            super().__init__()
+            self.prompt = prompt
+            
+            # Get available screen size (excludes taskbar, etc.)
+            desktop = QDesktopWidget()
+            available_rect = desktop.availableGeometry()  # Use available area instead of full screen
+            window_height = max(600, int(available_rect.height() * 0.7))  # Use 70% of available height, max 600px
+            window_width = max(800, int(available_rect.width() * 0.6))  # Max 800px or 60% of available width
+            
+            # Set window properties with fixed size
+            self.setWindowTitle(get_text("info_request_title"))
+            self.setFixedSize(window_width, window_height)  # Use fixed size for consistency
+            
+            # Center the window on screen
+            self.move(
+                available_rect.x() + (available_rect.width() - window_width) // 2,
+                available_rect.y() + (available_rect.height() - window_height) // 2
+            )
+            
+            # Create main layout
+            main_layout = QVBoxLayout()
+            main_layout.setSpacing(10)  # Set spacing between groups
+            main_layout.setContentsMargins(15, 15, 15, 15)  # Set margins
+            
+            # Calculate available height for each group (minus button area and spacing)
+            button_area_height = 50  # Button area height
+            total_spacing = 3 * 10 + 30  # Total spacing (3 spacings + margins)
+            available_height = window_height - button_area_height - total_spacing
+            if allow_history:
+                available_height -= self.HISTORY_AREA_HEIGHT
+            group_height = available_height // 2  # Divide into two equal groups
+            
+            # First group: Prompt information
+            prompt_label = QLabel(get_text("prompt_label") + ":")
+            prompt_label.setStyleSheet("font-weight: bold; font-size: 10pt;")
+            prompt_label.setFixedHeight(25)  # Fixed height for small label
+            main_layout.addWidget(prompt_label)
+            
+            self.prompt_edit = QPlainTextEdit(prompt)
+            self.prompt_edit.setReadOnly(True)
+            self.prompt_edit.setFixedHeight(group_height - 25)  # Minus label height
+            self.prompt_edit.setStyleSheet("background-color: #f5f5f5; border: 1px solid #ccc;")
+            main_layout.addWidget(self.prompt_edit)
+            
+            # Second group: User input
+            input_label = QLabel(get_text("user_input_label") + ":")
+            input_label.setStyleSheet("font-weight: bold; font-size: 10pt; color: #2c5aa0;")
+            input_label.setFixedHeight(25)  # Fixed height for small label
+            main_layout.addWidget(input_label)
+            
+            self.input_field = QPlainTextEdit()
+            self.input_field.setPlaceholderText(get_text("input_placeholder"))
+            self.input_field.setFixedHeight(group_height - 25)  # Minus label height
+            self.input_field.setStyleSheet("border: 2px solid #2c5aa0; border-radius: 4px;")
+            self.input_field.setFocus()  # Default focus on input field
+            main_layout.addWidget(self.input_field)
+            
+            # Earlier answers, offered when the answer history is enabled
+            self.history_search = None
+            if allow_history:
+                self._add_history_area(main_layout)
+            
+            # Add buttons - fixed at bottom
+            button_layout = QHBoxLayout()
+            # Offered when the answer cache is enabled
+            self.remember_box = QCheckBox(get_text("remember_answer")) if allow_remember else None
+            if self.remember_box is not None:
+                button_layout.addWidget(self.remember_box)
+            submit_button = QPushButton(get_text("submit_button"))
+            submit_button.clicked.connect(self.accept)
+            submit_button.setMinimumHeight(35)  # Ensure button is easily clickable
+            submit_button.setStyleSheet("QPushButton { background-color: #2c5aa0; color: white; font-weight: bold; border-radius: 4px; } QPushButton:hover { background-color: #1e3d6f; }")
+            button_layout.addStretch()
+            button_layout.addWidget(submit_button)
+            
+            main_layout.addLayout(button_layout)
+            
+            # Apply main layout
+            self.setLayout(main_layout)
+        
+        def _add_history_area(self, layout):
+            """Search box and list of earlier answers, clicking one puts it in the input field"""
+            history_label = QLabel(get_text("history_label") + ":")
+            history_label.setFixedHeight(25)
+            layout.addWidget(history_label)
+            
+            self.history_search = QLineEdit()
+            self.history_search.setPlaceholderText(get_text("history_search_placeholder"))
+            self.history_search.setFixedHeight(30)
+            self.history_search.textChanged.connect(self._show_history)
+            layout.addWidget(self.history_search)
+            
+            self.history_list = QListWidget()
+            self.history_list.setFixedHeight(self.HISTORY_AREA_HEIGHT - 25 - 30 - 2 * 10)
+            self.history_list.itemClicked.connect(self._use_history)
+            self.history_list.itemActivated.connect(self._use_history)
+            layout.addWidget(self.history_list)
+            
+            # Filled once the dialog is shown, opening the history does not delay it
+            QTimer.singleShot(0, lambda: self._show_history(""))
+        
+        def _show_history(self, text):
+            """List the earlier answers matching the search text, those for this prompt when empty"""
+            self.history_list.clear()
+            for entry in answer_history.search(text, self.prompt):
+                first_line = entry["answer"].strip().splitlines()[0] if entry["answer"].strip() else ""
+                item = QListWidgetItem(first_line[:200])
+                item.setToolTip(entry["answer"])
+                item.setData(Qt.UserRole, entry["answer"])
+                self.history_list.addItem(item)
+        
+        def _use_history(self, item):
+            """Put an earlier answer in the input field"""
+            self.input_field.setPlainText(item.data(Qt.UserRole))
+            self.input_field.setFocus()
+        
+        def get_input(self):
+            """Get user input from the text field"""
+            return self.input_field.toPlainText()
+        
+        def get_answer(self):
+            """Get user input, flagged for the answer cache when Remember this answer is ticked"""
+            if self.remember_box is not None and self.remember_box.isChecked():
+                return {"text": self.get_input(), "remember": True}
+            return self.get_input()
+    
+    class QuestionsDialog(QDialog):
+        """Dialog asking several questions, answered with one submit"""
+        
+        def __init__(self, questions):
+            super().__init__()
+            
+            # Same geometry as the single question dialogs
+            desktop = QDesktopWidget()
+            available_rect = desktop.availableGeometry()
+            window_height = max(600, int(available_rect.height() * 0.7))
+            window_width = max(800, int(available_rect.width() * 0.6))
+            
+            self.setWindowTitle(get_text("questions_dialog_title"))
+            self.setFixedSize(window_width, window_height)
+            self.move(
+                available_rect.x() + (available_rect.width() - window_width) // 2,
+                available_rect.y() + (available_rect.height() - window_height) // 2
+            )
+            
+            self.questions = questions
+            # Per question: (button group, custom radio, custom input) for a selection, text edit for free text
+            self._fields = []
+            
+            main_layout = QVBoxLayout()
+            
+            scroll_area = QScrollArea()
+            scroll_area.setWidgetResizable(True)
+            content_widget = QWidget()
+            content_layout = QVBoxLayout()
+            
+            for index, question in enumerate(questions):
+                group = QGroupBox(get_text("question_counter").format(index=index + 1, total=len(questions)))
+                group_layout = QVBoxLayout()
+                
+                prompt_label = QLabel(question["prompt"])
+                prompt_label.setWordWrap(True)
+                prompt_label.setStyleSheet("font-weight: bold; font-size: 11pt; margin: 5px;")
+                group_layout.addWidget(prompt_label)
+                
+                if question["type"] == "select_option":
+                    button_group = QButtonGroup(self)
+                    button_group.setExclusive(True)
+                    for i, opt in enumerate(question["options"]):
+                        if isinstance(opt, dict):
+                            text = opt.get('title', f"Option {i+1}")
+                            if opt.get('description'):
+                                text += f" - {opt['description']}"
+                        else:
+                            text = str(opt)
+                        option_button = QRadioButton(text)
+                        button_group.addButton(option_button, i)
+                        group_layout.addWidget(option_button)
+                    
+                    # Custom input, always allowed
+                    custom_radio = QRadioButton(get_text("custom_answer"))
+                    button_group.addButton(custom_radio, -1)
+                    group_layout.addWidget(custom_radio)
+                    custom_input = QPlainTextEdit()
+                    custom_input.setPlaceholderText(get_text("custom_input_placeholder"))
+                    custom_input.setEnabled(False)
+                    custom_input.setMaximumHeight(80)
+                    custom_radio.toggled.connect(custom_input.setEnabled)
+                    group_layout.addWidget(custom_input)
+                    self._fields.append((button_group, custom_radio, custom_input))
+                else:
+                    input_field = QPlainTextEdit()
+                    input_field.setPlaceholderText(get_text("input_placeholder"))
+                    input_field.setMinimumHeight(80)
+                    input_field.setMaximumHeight(150)
+                    group_layout.addWidget(input_field)
+                    self._fields.append(input_field)
+                
+                group.setLayout(group_layout)
+                content_layout.addWidget(group)
+            
+            content_layout.addStretch()
+            content_widget.setLayout(content_layout)
+            scroll_area.setWidget(content_widget)
+            main_layout.addWidget(scroll_area)
+            
+            # Button area - fixed at bottom
+            button_layout = QHBoxLayout()
+            self.error_label = QLabel("")
+            self.error_label.setStyleSheet("color: #c0392b;")
+            button_layout.addWidget(self.error_label)
+            button_layout.addStretch()
+            submit_button = QPushButton(get_text("submit_button"))
+            submit_button.clicked.connect(self.submit)
+            submit_button.setMinimumHeight(35)
+            button_layout.addWidget(submit_button)
+            main_layout.addLayout(button_layout)
+            
+            self.setLayout(main_layout)
+        
+        def submit(self):
+            """Accept the dialog once every question is answered"""
+            for field in self._fields:
+                if isinstance(field, tuple):
+                    button_group, custom_radio, custom_input = field
+                    answered = button_group.checkedId() >= 0 or (
+                        custom_radio.isChecked() and custom_input.toPlainText().strip())
+                else:
+                    answered = field.toPlainText().strip()
+                if not answered:
+                    self.error_label.setText(get_text("unanswered_questions"))
+                    return
+            self.accept()
+        
+        def get_answers(self):
+            """Get the answers in question order"""
+            answers = []
+            for question, field in zip(self.questions, self._fields):
+                if not isinstance(field, tuple):
+                    answers.append(field.toPlainText())
+                    continue
+                button_group, custom_radio, custom_input = field
+                selected_id = button_group.checkedId()
+                if selected_id >= 0:
+                    answers.append({
+                        "selected_index": selected_id,
+                        "selected_option": question["options"][selected_id],
+                        "custom_input": "",
+                        "is_custom": False
+                    })
+                else:
+                    answers.append({
+                        "selected_index": -1,
+                        "selected_option": None,
+                        "custom_input": custom_input.toPlainText(),
+                        "is_custom": True
+                    })
+            return answers
+    
+    class _JobDispatcher(QObject):
+        """Lives on the Qt GUI thread and runs queued dialog jobs there"""
+        wakeup = pyqtSignal()
+        
+        def __init__(self, jobs: "queue.Queue"):
+            super().__init__()
+            self._jobs = jobs
+            # Emitted from other threads, so the slot is queued to the GUI thread
+            self.wakeup.connect(self._run_jobs)
+        
+        @pyqtSlot()
+        def _run_jobs(self):
+            """Run all queued jobs"""
+            while True:
+                try:
+                    job = self._jobs.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    job()
+                except Exception as e:
+                    logger.error(f"{get_text('pyqt_dialog_error')}: {e}")
+                    logger.error(traceback.format_exc())
+    
+    class QtGuiThread:
+        """
+        Resident thread owning the QApplication for the whole process.
+        All Qt objects are created on this thread, other threads hand it
+        jobs through a thread-safe queue.
+        """
+        
+        def __init__(self):
+            """Start the GUI thread and wait until its event loop is ready"""
+            self._jobs = queue.Queue()
+            self._ready = threading.Event()
+            self._dispatcher = None
+            self._thread = threading.Thread(target=self._run, name="QtGuiThread", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+        
+        def _run(self):
+            """GUI thread main function"""
+            app = QApplication.instance() or QApplication([])
+            # Keep the event loop running between dialogs
+            app.setQuitOnLastWindowClosed(False)
+            self._dispatcher = _JobDispatcher(self._jobs)
+            self._ready.set()
+            app.exec_()
+            # Release Qt objects on this thread, Qt refuses to destroy them from another one
+            self._dispatcher = None
+            del app
+        
+        def stop(self, timeout: float = 2.0):
+            """
+            Quit the Qt event loop and wait for the GUI thread to finish
+            
+            Args:
+                timeout: Seconds to wait for the thread
+            """
+            if self._thread.is_alive():
+                self.submit(QApplication.quit)
+                self._thread.join(timeout)
+        
+        def submit(self, job):
+            """
+            Run a job on the GUI thread
+            
+            Args:
+                job: Callable without arguments
+            """
+            self._jobs.put(job)
+            self._dispatcher.wakeup.emit()
+    
+    _gui_thread = None
+    _gui_thread_lock = threading.Lock()
+    
+    def get_gui_thread() -> QtGuiThread:
+        """Get the process-wide Qt GUI thread, starting it on first use"""
+        global _gui_thread
+        with _gui_thread_lock:
+            if _gui_thread is None:
+                _gui_thread = QtGuiThread()
+                atexit.register(_gui_thread.stop)
+            return _gui_thread
     
     class PyQtUI:
         """PyQt Interface Implementation Class"""
         
         def __init__(self):
             """Initialize PyQt interface"""
-            self._app = None
             self._pyqt_available = True
-            self._emitter = ResultEmitter()
+            self._dialogs = set()  # Open dialogs, only touched on the GUI thread
         
-        def _ensure_app(self):
-            """Ensure QApplication is created"""
-            if QApplication.instance() is None:
-                self._app = QApplication(sys.argv)
-            else:
-                self._app = QApplication.instance()
+        def prewarm(self):
+            """Start the Qt GUI thread and build the dialogs once ahead of the first request"""
+            done = threading.Event()
+            
+            def job():
+                try:
+                    # Loads styles and fonts, later dialogs reuse them
+                    for dialog in (OptionDialog([], ""), InputDialog(""), QuestionsDialog([])):
+                        dialog.deleteLater()
+                finally:
+                    done.set()
+            
+            get_gui_thread().submit(job)
+            done.wait()
+        
+        async def _run_dialog(self, create_dialog, get_result, cancelled_result):
+            """
+            Show a dialog on the Qt GUI thread and wait until it is closed.
+            Dialogs are opened non-modally, so concurrent requests each get their own window.
+            
+            Args:
+                create_dialog: Creates the dialog, called on the GUI thread
+                get_result: Reads the result from an accepted dialog
+                cancelled_result: Result when the dialog is closed without submitting
+            
+            Returns:
+                Dialog result
+            """
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            requested_at = time.perf_counter()
+            # Only touched on the GUI thread
+            state = {"dialog": None, "cancelled": False}
+            
+            def resolve(result=None, error=None):
+                def set_future():
+                    if future.done():
+                        return
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+                loop.call_soon_threadsafe(set_future)
+            
+            def job():
+                if state["cancelled"]:
+                    return
+                try:
+                    dialog = create_dialog()
+                except Exception as e:
+                    logger.error(f"{get_text('pyqt_dialog_error')}: {e}")
+                    logger.error(traceback.format_exc())
+                    resolve(error=e)
+                    return
+                
+                def on_finished(code):
+                    self._dialogs.discard(dialog)
+                    journal.record("dialog_closed", ui="pyqt", dialog=type(dialog).__name__, accepted=code == QDialog.Accepted)
+                    try:
+                        result = get_result(dialog) if code == QDialog.Accepted else cancelled_result
+                    except Exception as e:
+                        resolve(error=e)
+                    else:
+                        resolve(result)
+                    finally:
+                        dialog.deleteLater()
+                
+                self._dialogs.add(dialog)
+                state["dialog"] = dialog
+                dialog.finished.connect(on_finished)
+                dialog.open()
+                dialog.raise_()
+                dialog.activateWindow()
+                rendered = time.perf_counter() - requested_at
+                observe_render("pyqt", rendered)
+                journal.record("dialog_shown", ui="pyqt", dialog=type(dialog).__name__, seconds=round(rendered, 3))
+            
+            def close():
+                # Runs after job on the GUI thread, the dialog either exists or will not be created
+                state["cancelled"] = True
+                if state["dialog"] is not None and state["dialog"] in self._dialogs:
+                    state["dialog"].reject()
+            
+            gui_thread = get_gui_thread()
+            gui_thread.submit(job)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                # The tool call was cancelled or the client went away, nobody waits for the answer
+                gui_thread.submit(close)
+                raise
         
         async def select_option(
             self,
@@ -98,17 +687,17 @@ else:
         ) -> Dict[str, Any]:
             """
             Present options to the user and get selection using PyQt interface
-
+            
             Args:
                 options: List of options
                 prompt: Prompt message
                 ctx: FastMCP context
-
+            
             Returns:
                 Selection result dictionary
             """
             if not self._pyqt_available:
-                print(get_text("pyqt_not_installed"))
+                logger.error(get_text("pyqt_not_installed"))
                 return {
                     "selected_index": -1,
                     "selected_option": None,
@@ -116,214 +705,23 @@ else:
                     "is_custom": True
                 }
             
-            logger.debug(f"select_option called: options count={len(options)}")
-            
-            # Create event object for synchronization
-            event = asyncio.Event()
-            result_container = [None]  # Use list to store result for modification in callback
-            
-            # Define callback function, called when QT window closes
-            def on_selection_completed(selection_result):
-                result_container[0] = selection_result
-                event.set()
-            
-            # Run QT window in separate thread
-            def run_qt_dialog():
-                try:
-                    app = None
-                    if not QApplication.instance():
-                        app = QApplication([])
-                    
-                    class OptionDialog(QDialog):
-                        def __init__(self, options, prompt):
-                            super().__init__()
-                            
-                            # Get available screen size (excludes taskbar, etc.)
-                            desktop = QDesktopWidget()
-                            available_rect = desktop.availableGeometry()  # Use available area instead of full screen
-                            window_height = max(600, int(available_rect.height() * 0.7))  # Use 70% of available height, max 600px
-                            window_width = max(800, int(available_rect.width() * 0.6))  # Max 800px or 60% of available width
-                            
-                            # Set window properties with fixed size
-                            self.setWindowTitle(get_text("select_dialog_title"))
-                            self.setFixedSize(window_width, window_height)  # Use fixed size for consistency
-                            
-                            # Center the window on screen
-                            self.move(
-                                available_rect.x() + (available_rect.width() - window_width) // 2,
-                                available_rect.y() + (available_rect.height() - window_height) // 2
-                            )
-                            
-                            # Options list
-                            self.options = options
-                            
-                            # Create main layout
-                            main_layout = QVBoxLayout()
-                            
-                            # Create scrollable content area
-                            scroll_area = QScrollArea()
-                            scroll_area.setWidgetResizable(True)
-                            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-                            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-                            
-                            # Create content widget for scrollable area
-                            content_widget = QWidget()
-                            content_layout = QVBoxLayout()
-                            
-                            # Add prompt label
-                            prompt_label = QLabel(prompt)
-                            prompt_label.setWordWrap(True)
-                            prompt_label.setStyleSheet("font-weight: bold; font-size: 12pt; margin: 10px;")
-                            content_layout.addWidget(prompt_label)
-                            
-                            # Options group
-                            self.option_group = QButtonGroup(self)
-                            self.option_group.setExclusive(True)  # Radio selection
-                            
-                            option_container = QGroupBox(get_text("available_options"))
-                            option_layout = QVBoxLayout()
-                            
-                            # Add predefined options
-                            for i, opt in enumerate(options):
-                                if isinstance(opt, dict):
-                                    title = opt.get('title', f"Option {i+1}")
-                                    desc = opt.get('description', '')
-                                    text = title
-                                    if desc:
-                                        text += f" - {desc}"
-                                else:
-                                    text = str(opt)
-                                    
-                                option_button = QRadioButton(text)
-                                # Note: QRadioButton doesn't have setWordWrap, but text will wrap naturally in layout
-                                self.option_group.addButton(option_button, i)
-                                option_layout.addWidget(option_button)
-                                
-                            option_container.setLayout(option_layout)
-                            content_layout.addWidget(option_container)
-                            
-                            # Custom input area (always allowed)
-                            custom_group = QGroupBox(get_text("custom_input_group"))
-                            custom_layout = QVBoxLayout()
-                            
-                            self.custom_radio = QRadioButton(get_text("custom_answer"))
-                            self.option_group.addButton(self.custom_radio, -1)
-                            custom_layout.addWidget(self.custom_radio)
-                            
-                            # Changed from QLineEdit to QPlainTextEdit for multi-line input
-                            self.custom_input = QPlainTextEdit()
-                            self.custom_input.setPlaceholderText(get_text("custom_input_placeholder"))
-                            self.custom_input.setEnabled(False)  # Initially disabled
-                            self.custom_input.setMinimumHeight(100)  # Set minimum height for multi-line input
-                            self.custom_input.setMaximumHeight(150)  # Limit height to prevent excessive growth
-                            
-                            # Connect custom radio button event
-                            self.custom_radio.toggled.connect(self.toggle_custom_input)
-                            
-                            custom_layout.addWidget(self.custom_input)
-                            custom_group.setLayout(custom_layout)
-                            content_layout.addWidget(custom_group)
-                            
-                            # Set content widget layout and add to scroll area
-                            content_widget.setLayout(content_layout)
-                            scroll_area.setWidget(content_widget)
-                            
-                            # Add scroll area to main layout
-                            main_layout.addWidget(scroll_area)
-                            
-                            # Button area - fixed at bottom
-                            button_layout = QHBoxLayout()
-                            submit_button = QPushButton(get_text("submit_button"))
-                            submit_button.clicked.connect(self.accept)
-                            submit_button.setMinimumHeight(35)  # Ensure button is easily clickable
-                            button_layout.addStretch()
-                            button_layout.addWidget(submit_button)
-                            
-                            main_layout.addLayout(button_layout)
-                            
-                            # Set main layout
-                            self.setLayout(main_layout)
-                        
-                        def toggle_custom_input(self, enabled):
-                            """Enable/disable custom input field"""
-                            self.custom_input.setEnabled(enabled)
-                            if enabled:
-                                self.custom_input.setFocus()
-                                
-                        def get_selection(self):
-                            """Get user selection"""
-                            selected_id = self.option_group.checkedId()
-                            
-                            if selected_id == -1 and self.custom_radio.isChecked():
-                                # User chose custom input - get text from QPlainTextEdit
-                                return {
-                                    "selected_index": -1,
-                                    "selected_option": None,
-                                    "custom_input": self.custom_input.toPlainText(),
-                                    "is_custom": True
-                                }
-                            elif selected_id >= 0:
-                                # User chose predefined option
-                                return {
-                                    "selected_index": selected_id,
-                                    "selected_option": self.options[selected_id],
-                                    "custom_input": "",
-                                    "is_custom": False
-                                }
-                            else:
-                                # User didn't select any option
-                                return {
-                                    "selected_index": -1,
-                                    "selected_option": None,
-                                    "custom_input": get_text("no_option_selected"),
-                                    "is_custom": True
-                                }
-                    
-                    # Create dialog
-                    dialog = OptionDialog(options, prompt)
-                    
-                    # Show dialog and get result
-                    if dialog.exec_():
-                        selection_result = dialog.get_selection()
-                        on_selection_completed(selection_result)
-                    else:
-                        # User cancelled dialog
-                        on_selection_completed({
-                            "selected_index": -1,
-                            "selected_option": None,
-                            "custom_input": get_text("user_cancelled_selection"),
-                            "is_custom": True
-                        })
-                    
-                    # Clean up resources
-                    if app:
-                        app.quit()
-                    
-                except Exception as e:
-                    logger.error(f"{get_text('pyqt_dialog_error')}: {e}")
-                    logger.error(traceback.format_exc())
-                    on_selection_completed({
-                        "selected_index": -1,
-                        "selected_option": None,
-                        "custom_input": f"{get_text('pyqt_dialog_error')}: {str(e)}",
-                        "is_custom": True
-                    })
-            
-            # Execute QT dialog in thread pool
             try:
                 # Notify context
                 if ctx:
                     await ctx.info(get_text("wait_user_select"))
-                    
-                # Start thread
-                loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, run_qt_dialog)
-                
-                # Wait for event
-                await event.wait()
                 
-                # Get result
-                result = result_container[0]
+                # Show dialog on the GUI thread and wait for it to be closed
+                allow_remember = get_answer_cache_config()["enabled"]
+                result = await self._run_dialog(
+                    lambda: OptionDialog(options, prompt, allow_remember),
+                    lambda dialog: dialog.get_selection(),
+                    {
+                        "selected_index": -1,
+                        "selected_option": None,
+                        "custom_input": get_text("user_cancelled_selection"),
+                        "is_custom": True
+                    }
+                )
                 
                 # Notify context
                 if ctx:
@@ -333,7 +731,7 @@ else:
                         await ctx.info(f"{get_text('user_selected')} {result['selected_index'] + 1}")
                 
                 return result
-                
+            
             except Exception as e:
                 logger.error(f"{get_text('pyqt_ui_error')}: {e}")
                 if ctx:
@@ -352,151 +750,97 @@ else:
         ) -> str:
             """
             Request supplementary information from the user using PyQt interface
-
+            
             Args:
                 prompt: Prompt message
-                current_info: Current information
                 ctx: FastMCP context
-
+            
             Returns:
                 User input information
             """
             if not self._pyqt_available:
-                print(get_text("pyqt_not_installed"))
+                logger.error(get_text("pyqt_not_installed"))
                 return get_text("pyqt_interface_unavailable")
             
-            logger.debug(f"request_additional_info called: prompt={prompt}, current_info={current_info}")
+            try:
+                # Notify context
+                if ctx:
+                    await ctx.info(get_text("wait_user_input"))
+                
+                # Show dialog on the GUI thread, cancelling returns an empty string
+                allow_remember = get_answer_cache_config()["enabled"]
+                allow_history = get_answer_history_config()["enabled"]
+                result = await self._run_dialog(
+                    lambda: InputDialog(prompt, allow_remember=allow_remember, allow_history=allow_history),
+                    lambda dialog: dialog.get_answer(),
+                    ""
+                )
+                
+                # Return result
+                if ctx:
+                    await ctx.info(get_text("user_provided_info"))
+                
+                return result
             
-            # Create event object for synchronization
-            event = asyncio.Event()
-            result = [""]  # Use list to store result for modification in callback
+            except Exception as e:
+                logger.error(f"{get_text('pyqt_ui_error')}: {e}")
+                if ctx:
+                    await ctx.error(f"{get_text('pyqt_ui_error')}: {e}")
+                return f"{get_text('pyqt_interface_error')}: {str(e)}"
+        
+        async def ask_questions(
+            self,
+            questions: List[Dict[str, Any]],
+            ctx: Context = None
+        ) -> List[Any]:
+            """
+            Ask several questions in one PyQt dialog
             
-            # Define callback function, called when QT window closes
-            def on_input_completed(text):
-                result[0] = text
-                event.set()
+            Args:
+                questions: Questions normalized by ui.ui.normalize_questions
+                ctx: FastMCP context
             
-            # Run QT window in separate thread
-            def run_qt_dialog():
-                try:
-                    app = None
-                    if not QApplication.instance():
-                        app = QApplication([])
-                    
-                    class InputDialog(QDialog):
-                        def __init__(self, prompt, current_info=""):
-                            super().__init__()
-                            
-                            # Get available screen size (excludes taskbar, etc.)
-                            desktop = QDesktopWidget()
-                            available_rect = desktop.availableGeometry()  # Use available area instead of full screen
-                            window_height = max(600, int(available_rect.height() * 0.7))  # Use 70% of available height, max 600px
-                            window_width = max(800, int(available_rect.width() * 0.6))  # Max 800px or 60% of available width
-                            
-                            # Set window properties with fixed size
-                            self.setWindowTitle(get_text("info_request_title"))
-                            self.setFixedSize(window_width, window_height)  # Use fixed size for consistency
-                            
-                            # Center the window on screen
-                            self.move(
-                                available_rect.x() + (available_rect.width() - window_width) // 2,
-                                available_rect.y() + (available_rect.height() - window_height) // 2
-                            )
-                            
-                            # Create main layout
-                            main_layout = QVBoxLayout()
-                            main_layout.setSpacing(10)  # Set spacing between groups
-                            main_layout.setContentsMargins(15, 15, 15, 15)  # Set margins
-                            
-                            # Calculate available height for each group (minus button area and spacing)
-                            button_area_height = 50  # Button area height
-                            total_spacing = 3 * 10 + 30  # Total spacing (3 spacings + margins)
-                            available_height = window_height - button_area_height - total_spacing
-                            group_height = available_height // 2  # Divide into two equal groups
-                            
-                            # First group: Prompt information
-                            prompt_label = QLabel(get_text("prompt_label") + ":")
-                            prompt_label.setStyleSheet("font-weight: bold; font-size: 10pt;")
-                            prompt_label.setFixedHeight(25)  # Fixed height for small label
-                            main_layout.addWidget(prompt_label)
-                            
-                            self.prompt_edit = QPlainTextEdit(prompt)
-                            self.prompt_edit.setReadOnly(True)
-                            self.prompt_edit.setFixedHeight(group_height - 25)  # Minus label height
-                            self.prompt_edit.setStyleSheet("background-color: #f5f5f5; border: 1px solid #ccc;")
-                            main_layout.addWidget(self.prompt_edit)
-                            
-                            # Second group: User input
-                            input_label = QLabel(get_text("user_input_label") + ":")
-                            input_label.setStyleSheet("font-weight: bold; font-size: 10pt; color: #2c5aa0;")
-                            input_label.setFixedHeight(25)  # Fixed height for small label
-                            main_layout.addWidget(input_label)
-                            
-                            self.input_field = QPlainTextEdit()
-                            self.input_field.setPlaceholderText(get_text("input_placeholder"))
-                            self.input_field.setFixedHeight(group_height - 25)  # Minus label height
-                            self.input_field.setStyleSheet("border: 2px solid #2c5aa0; border-radius: 4px;")
-                            self.input_field.setFocus()  # Default focus on input field
-                            main_layout.addWidget(self.input_field)
-                            
-                            # Add buttons - fixed at bottom
-                            button_layout = QHBoxLayout()
-                            submit_button = QPushButton(get_text("submit_button"))
-                            submit_button.clicked.connect(self.accept)
-                            submit_button.setMinimumHeight(35)  # Ensure button is easily clickable
-                            submit_button.setStyleSheet("QPushButton { background-color: #2c5aa0; color: white; font-weight: bold; border-radius: 4px; } QPushButton:hover { background-color: #1e3d6f; }")
-                            button_layout.addStretch()
-                            button_layout.addWidget(submit_button)
-                            
-                            main_layout.addLayout(button_layout)
-                            
-                            # Apply main layout
-                            self.setLayout(main_layout)
-                        
-                        def get_input(self):
-                            """Get user input from the text field"""
-                            return self.input_field.toPlainText()
-                    
-                    dialog = InputDialog(prompt, current_info)
-                    if dialog.exec_():
-                        user_input = dialog.get_input()
-                        on_input_completed(user_input)
-                    else:
-                        # User cancelled, return empty string
-                        on_input_completed("")
-                        
-                    if app:
-                        app.quit()
-                    
-                except Exception as e:
-                    logger.error(f"{get_text('pyqt_dialog_error')}: {e}")
-                    logger.error(traceback.format_exc())
-                    on_input_completed(f"{get_text('pyqt_dialog_error')}: {str(e)}")
+            Returns:
+                Answers in question order
+            """
+            def answers_for(selection_text, info_text):
+                # Same shapes as the single question dialogs return when not answered
+                return [
+                    {
+                        "selected_index": -1,
+                        "selected_option": None,
+                        "custom_input": selection_text,
+                        "is_custom": True
+                    } if question["type"] == "select_option" else info_text
+                    for question in questions
+                ]
+            
+            if not self._pyqt_available:
+                logger.error(get_text("pyqt_not_installed"))
+                return answers_for(get_text("pyqt_interface_unavailable"), get_text("pyqt_interface_unavailable"))
             
-            # Execute QT dialog in thread pool
             try:
-                # Notify context
                 if ctx:
                     await ctx.info(get_text("wait_user_input"))
-                    
-                # Start thread
-                loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, run_qt_dialog)
                 
-                # Wait for event
-                await event.wait()
+                # Closing the dialog leaves every question unanswered
+                result = await self._run_dialog(
+                    lambda: QuestionsDialog(questions),
+                    lambda dialog: dialog.get_answers(),
+                    answers_for(get_text("user_cancelled_selection"), "")
+                )
                 
-                # Return result
                 if ctx:
                     await ctx.info(get_text("user_provided_info"))
                 
-                return result[0]
-                
+                return result
+            
             except Exception as e:
                 logger.error(f"{get_text('pyqt_ui_error')}: {e}")
                 if ctx:
                     await ctx.error(f"{get_text('pyqt_ui_error')}: {e}")
-                return f"{get_text('pyqt_interface_error')}: {str(e)}"
+                message = f"{get_text('pyqt_interface_error')}: {str(e)}"
+                return answers_for(message, message)
         
         def cleanup(self):
             """Clean up resources"""
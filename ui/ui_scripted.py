@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Scripted Interface Implementation
+Answers questions without a human, from a rules file or a Python callable,
+so the tools can be driven through the real server in CI and benchmarks
+"""
+
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import random
+import re
+from typing import List, Dict, Any, Optional, Union, Callable
+from fastmcp import Context
+from config_manager import get_scripted_config
+from ui.auto_respond import option_title
+
+logger = logging.getLogger('ScriptedUI')
+
+# Answer to request_additional_info when no rule matches
+DEFAULT_ANSWER = "OK"
+
+# Tool names rules can be restricted to
+TOOLS = ("select_option", "request_additional_info")
+
+
+class ScriptedRule:
+    """
+    One entry of a rules file, e.g.
+    {"tool": "select_option", "match": "deploy", "select": 1, "think_time": 0.5}
+
+    Keys:
+        tool: select_option or request_additional_info, any tool if omitted
+        match: Regular expression searched in the prompt, matches all prompts if omitted
+        select: Index or text of the option to choose (select_option)
+        custom_input: Custom answer instead of an option (select_option)
+        answer: Text returned by request_additional_info
+        think_time: Seconds to wait before answering, overrides the configured think time
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.tool = data.get("tool")
+        if self.tool not in (None, "*") + TOOLS:
+            raise ValueError(f"Unknown tool in scripted rule: {self.tool}")
+        self.pattern = re.compile(data["match"]) if data.get("match") else None
+        self.select = data.get("select")
+        self.custom_input = data.get("custom_input")
+        self.answer = data.get("answer")
+        self.think_time = data.get("think_time")
+
+    def matches(self, tool: str, prompt: str) -> bool:
+        """Whether the rule applies to a question"""
+        if self.tool not in (None, "*") and self.tool != tool:
+            return False
+        return self.pattern is None or self.pattern.search(prompt) is not None
+
+
+def load_rules(path: str) -> List[ScriptedRule]:
+    """
+    Load a rules file, either a list of rules or an object with a "rules" list
+
+    Args:
+        path: Path of the JSON rules file
+
+    Returns:
+        Rules in file order, the first matching rule answers
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    return [ScriptedRule(rule) for rule in data]
+
+
+def load_handler(spec: str) -> Callable:
+    """
+    Import a handler given as "package.module:function"
+
+    The handler is called as handler(tool, payload) with payload holding the
+    prompt (and options for select_option). It may be a coroutine function and
+    returns the tool result, or None to fall back to the rules.
+    """
+    module_path, _, name = spec.partition(":")
+    if not module_path or not name:
+        raise ValueError(f"Scripted handler must look like module:function, got {spec}")
+    return getattr(importlib.import_module(module_path), name)
+
+
+class ScriptedUI:
+    """Scripted Interface Implementation Class"""
+
+    # Answers questions in parallel, the scheduler does not queue them
+    concurrent = True
+
+    def __init__(self):
+        """Initialize scripted interface from the scripted configuration"""
+        scripted_config = get_scripted_config()
+        self.think_time = float(scripted_config["think_time"])
+        self.think_time_jitter = float(scripted_config["think_time_jitter"])
+        self.rules = load_rules(scripted_config["rules_file"]) if scripted_config["rules_file"] else []
+        self.handler = load_handler(scripted_config["handler"]) if scripted_config["handler"] else None
+        logger.info(f"Scripted UI loaded {len(self.rules)} rules, handler: {scripted_config['handler'] or 'none'}")
+
+    def _find_rule(self, tool: str, prompt: str) -> Optional[ScriptedRule]:
+        """First rule matching the question"""
+        for rule in self.rules:
+            if rule.matches(tool, prompt):
+                return rule
+        return None
+
+    async def _think(self, rule: Optional[ScriptedRule] = None):
+        """Simulate the time a human needs to answer"""
+        delay = self.think_time if rule is None or rule.think_time is None else float(rule.think_time)
+        if self.think_time_jitter:
+            delay += random.uniform(0, self.think_time_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _call_handler(self, tool: str, payload: Dict[str, Any]) -> Any:
+        """Ask the handler, None when there is none or it passes"""
+        if self.handler is None:
+            return None
+        result = self.handler(tool, payload)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    @staticmethod
+    def _selection(options: List[Union[str, Dict[str, Any]]], rule: Optional[ScriptedRule]) -> Dict[str, Any]:
+        """Build the selection result a rule describes, the first option by default"""
+        if rule is not None and rule.custom_input is not None:
+            return {
+                "selected_index": -1,
+                "selected_option": None,
+                "custom_input": rule.custom_input,
+                "is_custom": True
+            }
+
+        index = 0
+        if rule is not None and rule.select is not None:
+            if isinstance(rule.select, int):
+                index = rule.select
+            else:
+                titles = [option_title(option) for option in options]
+                index = titles.index(rule.select) if rule.select in titles else -1
+
+        if 0 <= index < len(options):
+            return {
+                "selected_index": index,
+                "selected_option": options[index],
+                "custom_input": "",
+                "is_custom": False
+            }
+        return {
+            "selected_index": -1,
+            "selected_option": None,
+            "custom_input": f"No option matches {rule.select!r}" if rule is not None else "",
+            "is_custom": True
+        }
+
+    async def _answer_selection(
+        self,
+        options: List[Union[str, Dict[str, Any]]],
+        prompt: str,
+        rule: Optional[ScriptedRule]
+    ) -> Dict[str, Any]:
+        """Selection result from the handler, else from the rule"""
+        result = await self._call_handler("select_option", {"options": options, "prompt": prompt})
+        if result is None:
+            result = self._selection(options, rule)
+        return result
+
+    async def _answer_info(self, prompt: str, rule: Optional[ScriptedRule]) -> str:
+        """Information answer from the handler, else from the rule"""
+        result = await self._call_handler("request_additional_info", {"prompt": prompt})
+        if result is None:
+            result = rule.answer if rule is not None and rule.answer is not None else DEFAULT_ANSWER
+        return result
+
+    async def select_option(
+        self,
+        options: List[Union[str, Dict[str, Any]]],
+        prompt: str = "Please select one of the following options",
+        ctx: Context = None
+    ) -> Dict[str, Any]:
+        """
+        Answer an option selection from the handler or the first matching rule
+
+        Args:
+            options: List of options, can be a list of strings or dictionaries
+            prompt: Prompt message
+            ctx: FastMCP context object
+
+        Returns:
+            Selection result dictionary
+        """
+        rule = self._find_rule("select_option", prompt)
+        await self._think(rule)
+        return await self._answer_selection(options, prompt, rule)
+
+    async def request_additional_info(
+        self,
+        prompt: str,
+        ctx: Context = None
+    ) -> str:
+        """
+        Answer an information request from the handler or the first matching rule
+
+        Args:
+            prompt: Prompt message
+            ctx: FastMCP context object
+
+        Returns:
+            Scripted answer
+        """
+        rule = self._find_rule("request_additional_info", prompt)
+        await self._think(rule)
+        return await self._answer_info(prompt, rule)
+
+    async def ask_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        ctx: Context = None
+    ) -> List[Any]:
+        """
+        Answer several questions after thinking once, like a human filling in one form
+
+        Args:
+            questions: Questions normalized by ui.ui.normalize_questions
+            ctx: FastMCP context object
+
+        Returns:
+            Answers in question order
+        """
+        rules = [self._find_rule(question["type"], question["prompt"]) for question in questions]
+        await self._think(next((rule for rule in rules if rule is not None), None))
+        answers = []
+        for question, rule in zip(questions, rules):
+            if question["type"] == "select_option":
+                answers.append(await self._answer_selection(question["options"], question["prompt"], rule))
+            else:
+                answers.append(await self._answer_info(question["prompt"], rule))
+        return answers
@@ -3,31 +3,64 @@
 
 """
 Web Interface Implementation
-Using Flask and SocketIO to implement a web-based interactive interface
+When the MCP server runs an HTTP transport (sse / streamable-http) the pages are
+mounted on the MCP server itself and served by its event loop. Otherwise (stdio)
+a standalone Flask + SocketIO server is started in a background thread.
 """
 
 import asyncio
+import json
+import os
+import socket
 import threading
+import time
 import webbrowser
+import logging
 from typing import List, Dict, Any, Optional, Union
 from fastmcp import Context
+from config_manager import get_answer_cache_config, get_answer_history_config, get_web_config
+from ui.request_registry import RequestRegistry, PENDING
+from ui.metrics import observe_render
+from ui import answer_history, journal
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
 
 try:
     from flask import Flask, render_template, request, jsonify
-    from flask_socketio import SocketIO
+    from flask_socketio import SocketIO, emit
+    FLASK_AVAILABLE = True
 except ImportError:
-    # If Flask is not installed, provide a placeholder class
+    FLASK_AVAILABLE = False
+
+# Template folder shared by both server modes
+TEMPLATE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web_templates")
+
+# Path prefix of the pages when mounted on the MCP server
+MOUNT_PREFIX = "/ui"
+
+# Seconds a freshly opened browser is given to connect its dashboard
+# before another one would be opened
+DASHBOARD_CONNECT_GRACE = 10
+
+# Seconds between keep-alive comments on the dashboard event stream
+EVENT_STREAM_KEEPALIVE = 15
+
+if jinja2 is None:
+    # If the template engine is not installed, provide a placeholder class
     class WebUI:
         """Web Interface Implementation Class (Flask not installed)"""
         
         def __init__(self):
             """Initialize Web interface"""
-            print("Warning: Flask or Flask-SocketIO not installed, Web interface will not be available")
+            logging.getLogger('WebUI').warning("Flask or Flask-SocketIO not installed, Web interface will not be available")
             self._web_available = False
         
         async def select_option(self, options, prompt="Please select one of the following options", allow_custom=True, ctx=None):
             """Placeholder method"""
-            print("Error: Cannot use Web interface, Flask or Flask-SocketIO not installed")
+            logging.getLogger('WebUI').error("Cannot use Web interface, Flask or Flask-SocketIO not installed")
             return {
                 "selected_index": -1,
                 "selected_option": None,
@@ -37,10 +70,10 @@ except ImportError:
         
         async def request_additional_info(self, prompt, ctx=None):
             """Placeholder method"""
-            print("Error: Cannot use Web interface, Flask or Flask-SocketIO not installed")
+            logging.getLogger('WebUI').error("Cannot use Web interface, Flask or Flask-SocketIO not installed")
             return "Flask or Flask-SocketIO not installed, interface unavailable"
 else:
-    # If Flask is installed, provide full implementation
+    # If the template engine is installed, provide full implementation
     class WebUI:
         """Web Interface Implementation Class"""
         
@@ -51,15 +84,193 @@ else:
             self._socketio = None
             self._server_thread = None
             self._server_running = False
+            self._server_lock = threading.Lock()
             self._port = 5000
             self._host = "127.0.0.1"
             
-            # Store requests and results with IDs for concurrent handling
-            import uuid
-            self._request_lock = asyncio.Lock()
-            self._requests = {}  # request_id -> request_data
-            self._results = {}   # request_id -> result_data
-            self._events = {}    # request_id -> asyncio.Event
+            # Set when the pages are served by the MCP server (see mount)
+            self._mounted = False
+            self._base_url = None
+            self._templates = None
+            
+            # Event loop the tool calls run on, submissions are resolved on it
+            self._loop = None
+            
+            # Pending requests with their futures, closed ones are remembered for a while
+            web_config = get_web_config()
+            self._registry = RequestRegistry(
+                max_pending=int(web_config["max_pending"]),
+                pending_ttl=float(web_config["pending_ttl"]),
+                closed_ttl=float(web_config["closed_ttl"]),
+                max_closed=int(web_config["max_closed"])
+            )
+            
+            # Connected dashboards, requests are pushed to them
+            self._event_queues = set()       # asyncio.Queue per dashboard event stream (mounted mode)
+            self._socket_dashboards = set()  # Socket.IO session IDs (standalone mode)
+            self._dashboard_opened_at = 0.0
+        
+        def mount(self, server, base_url: str):
+            """
+            Serve the pages from the MCP server's own HTTP app instead of a separate Flask server
+            
+            Args:
+                server: FastMCP server instance, must be run with an HTTP transport
+                base_url: URL the MCP server is reachable at, e.g. http://127.0.0.1:7888
+            """
+            from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+            
+            self._templates = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(TEMPLATE_FOLDER),
+                autoescape=jinja2.select_autoescape(["html"])
+            )
+            
+            def render(name: str, **context) -> HTMLResponse:
+                template = self._templates.get_template(name)
+                return HTMLResponse(template.render(channel="http", base_path=MOUNT_PREFIX, **context))
+            
+            @server.custom_route(MOUNT_PREFIX, methods=["GET"], include_in_schema=False)
+            async def index(request):
+                return render('index.html')
+            
+            @server.custom_route(MOUNT_PREFIX + "/select/{request_id}", methods=["GET"], include_in_schema=False)
+            async def select_page(request):
+                return render('select.html', request_id=request.path_params["request_id"])
+            
+            @server.custom_route(MOUNT_PREFIX + "/info/{request_id}", methods=["GET"], include_in_schema=False)
+            async def info_page(request):
+                return render('info.html', request_id=request.path_params["request_id"])
+            
+            @server.custom_route(MOUNT_PREFIX + "/api/request/{request_id}", methods=["GET"], include_in_schema=False)
+            async def get_request(request):
+                request_data = self._registry.pending_data(request.path_params["request_id"])
+                if request_data is not None:
+                    return JSONResponse(request_data)
+                return JSONResponse({"error": "Request not found"}, status_code=404)
+            
+            @server.custom_route(MOUNT_PREFIX + "/api/history", methods=["GET"], include_in_schema=False)
+            async def history(request):
+                # The first search opens the history database, keep it off the event loop
+                entries = await asyncio.get_running_loop().run_in_executor(
+                    None, answer_history.search, request.query_params.get("q", ""), request.query_params.get("prompt")
+                )
+                return JSONResponse({"entries": entries})
+            
+            @server.custom_route(MOUNT_PREFIX + "/api/events", methods=["GET"], include_in_schema=False)
+            async def events(request):
+                queue = asyncio.Queue()
+                self._event_queues.add(queue)
+                
+                async def stream():
+                    try:
+                        yield self._format_event('snapshot', self._snapshot())
+                        while True:
+                            try:
+                                event, data = await asyncio.wait_for(queue.get(), EVENT_STREAM_KEEPALIVE)
+                            except asyncio.TimeoutError:
+                                yield ": keepalive\n\n"
+                                continue
+                            yield self._format_event(event, data)
+                    finally:
+                        self._event_queues.discard(queue)
+                
+                return StreamingResponse(stream(), media_type="text/event-stream",
+                                         headers={"Cache-Control": "no-cache"})
+            
+            @server.custom_route(MOUNT_PREFIX + "/api/submit_selection", methods=["POST"], include_in_schema=False)
+            async def submit_selection(request):
+                error = self._accept_submission('select_option', await request.json())
+                return JSONResponse({"ok": error is None, "error": error}, status_code=200 if error is None else 400)
+            
+            @server.custom_route(MOUNT_PREFIX + "/api/submit_info", methods=["POST"], include_in_schema=False)
+            async def submit_info(request):
+                error = self._accept_submission('request_info', await request.json())
+                return JSONResponse({"ok": error is None, "error": error}, status_code=200 if error is None else 400)
+            
+            @server.custom_route(MOUNT_PREFIX + "/api/submit_answers", methods=["POST"], include_in_schema=False)
+            async def submit_answers(request):
+                error = self._accept_submission('ask_questions', await request.json())
+                return JSONResponse({"ok": error is None, "error": error}, status_code=200 if error is None else 400)
+            
+            self._mounted = True
+            self._base_url = base_url.rstrip("/") + MOUNT_PREFIX
+            logging.getLogger('WebUI').info(f"Web interface mounted at {self._base_url}")
+        
+        @staticmethod
+        def _format_event(event: str, data: Any) -> str:
+            """Format a server-sent event"""
+            return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        
+        def _snapshot(self) -> List[Dict[str, Any]]:
+            """Pending requests, sent to a dashboard when it connects"""
+            return self._registry.snapshot()
+        
+        def stats(self) -> Dict[str, Any]:
+            """Requests per state, for status output and metrics"""
+            return self._registry.stats()
+        
+        def _has_dashboard(self) -> bool:
+            """Whether a dashboard is connected or a browser was opened for one moments ago"""
+            if self._event_queues or self._socket_dashboards:
+                return True
+            return time.monotonic() - self._dashboard_opened_at < DASHBOARD_CONNECT_GRACE
+        
+        def _broadcast(self, event: str, data: Any):
+            """Push an event to all connected dashboards"""
+            for queue in list(self._event_queues):
+                queue.put_nowait((event, data))
+            if self._socketio is not None and self._socket_dashboards:
+                self._socketio.emit(event, data)
+        
+        def _accept_submission(self, request_type: str, data: Dict[str, Any]) -> Optional[str]:
+            """
+            Store a submitted answer and wake up the waiting tool call.
+            Must run on the event loop the tool call is waiting on.
+            
+            Args:
+                request_type: Expected request type, select_option, request_info or ask_questions
+                data: Submitted data including request_id
+            
+            Returns:
+                Error message, or None if the answer was accepted
+            """
+            logger = logging.getLogger('WebUI')
+            
+            request_id = data.get('request_id') if isinstance(data, dict) else None
+            journal.record("submitted", ui="web", type=request_type, request_id=request_id, data=data)
+            if not request_id:
+                logger.error(f"No request_id in submitted data: {data}")
+                return "No request_id"
+            
+            entry = self._registry.get(request_id)
+            if entry is None:
+                logger.error(f"Request ID not found: {request_id}")
+                return "Request not found"
+            
+            if entry.type != request_type:
+                logger.error(f"Wrong request type: {entry.type}")
+                return "Wrong request type"
+            
+            if entry.state != PENDING:
+                logger.error(f"Late submission for {entry.state} request: {request_id}")
+                return f"Request already {entry.state}"
+            
+            if request_type == 'select_option':
+                # Remove request_id from the data before storing result
+                result = {k: v for k, v in data.items() if k != 'request_id'}
+            elif request_type == 'ask_questions':
+                result = data.get('answers')
+                if not isinstance(result, list) or len(result) != len(entry.data['questions']):
+                    logger.error(f"Answers do not match the questions of request: {request_id}")
+                    return "Every question needs an answer"
+            else:
+                # Store the input text directly
+                result = data.get('text', '')
+                if data.get('remember'):
+                    # Flagged for the answer cache
+                    result = {"text": result, "remember": True}
+            
+            return self._registry.resolve(request_id, result)
         
         def _find_available_port(self, start_port=5000, max_attempts=10):
             """Find an available port starting from start_port"""
@@ -77,159 +288,187 @@ else:
             import random
             return random.randint(8000, 9000)
         
+        def prewarm(self):
+            """Start the standalone web server ahead of the first request"""
+            if self._mounted:
+                # Compile the templates, the pages are served by the MCP server
+                for name in ('index.html', 'select.html', 'info.html'):
+                    self._templates.get_template(name)
+                return
+            self._ensure_server()
+        
         def _ensure_server(self):
             """Ensure Web server is started"""
-            if self._server_running:
+            if self._mounted or self._server_running:
                 return
-                
+            
+            # Called from both the prewarm thread and the event loop
+            with self._server_lock:
+                if not self._server_running:
+                    self._start_server()
+        
+        def _start_server(self):
+            """Start the standalone Flask + SocketIO server and wait until it accepts connections"""
+            if not FLASK_AVAILABLE:
+                raise RuntimeError("Flask or Flask-SocketIO not installed, start the MCP server with an HTTP transport instead")
+            
             # Find available port
             self._port = self._find_available_port()
             
-            import os
-            import logging
             logger = logging.getLogger('WebUI')
             logger.info(f"Starting web server on port {self._port}")
             
-            # Create Flask application
-            import os
-            
             # Determine absolute paths for template and static folders
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            base_dir = os.path.dirname(current_dir)
-            template_folder = os.path.join(base_dir, "web_templates")
+            base_dir = os.path.dirname(TEMPLATE_FOLDER)
             static_folder = os.path.join(base_dir, "web_static")
             
-            self._app = Flask(__name__, 
-                             template_folder=template_folder,
+            self._app = Flask(__name__,
+                             template_folder=TEMPLATE_FOLDER,
                              static_folder=static_folder)
             self._socketio = SocketIO(self._app, cors_allowed_origins="*")
             
             # Create necessary directories
-            os.makedirs(template_folder, exist_ok=True)
+            os.makedirs(TEMPLATE_FOLDER, exist_ok=True)
             os.makedirs(static_folder, exist_ok=True)
             
             # Register routes
             @self._app.route('/')
             def index():
-                return render_template('index.html')
+                return render_template('index.html', channel='socketio', base_path='')
             
             @self._app.route('/select/<request_id>')
             def select_page(request_id):
-                return render_template('select.html', request_id=request_id)
+                return render_template('select.html', request_id=request_id, channel='socketio', base_path='')
             
             @self._app.route('/info/<request_id>')
             def info_page(request_id):
-                return render_template('info.html', request_id=request_id)
+                return render_template('info.html', request_id=request_id, channel='socketio', base_path='')
             
             @self._app.route('/api/request/<request_id>', methods=['GET'])
             def get_request(request_id):
-                if request_id in self._requests:
-                    return jsonify(self._requests[request_id])
+                request_data = self._registry.pending_data(request_id)
+                if request_data is not None:
+                    return jsonify(request_data)
                 return jsonify({"error": "Request not found"}), 404
             
+            @self._app.route('/api/history', methods=['GET'])
+            def history():
+                return jsonify({"entries": answer_history.search(request.args.get('q', ''), request.args.get('prompt'))})
+            
             # Register SocketIO events
             @self._socketio.on('connect')
-            def handle_connect():
-                print("Client connected")
+            def handle_connect(auth=None):
                 logging.getLogger('WebUI').info("Client connected")
+                if request.args.get('dashboard'):
+                    self._socket_dashboards.add(request.sid)
+                    emit('snapshot', self._snapshot())
             
             @self._socketio.on('disconnect')
-            def handle_disconnect():
-                print("Client disconnected")
+            def handle_disconnect(reason=None):
                 logging.getLogger('WebUI').info("Client disconnected")
+                self._socket_dashboards.discard(request.sid)
             
+            # SocketIO handlers run on the server thread, hand the answer over to the event loop
             @self._socketio.on('submit_selection')
             def handle_selection(data):
-                print(f"Received selection data: {data}")
-                logging.getLogger('WebUI').info(f"Received selection data: {data}")
-                
-                request_id = data.get('request_id')
-                if not request_id:
-                    logging.getLogger('WebUI').error(f"No request_id in selection data: {data}")
-                    return
-                    
-                if request_id not in self._requests:
-                    logging.getLogger('WebUI').error(f"Request ID not found: {request_id}")
-                    return
-                    
-                if self._requests[request_id]['type'] != 'select_option':
-                    logging.getLogger('WebUI').error(f"Wrong request type: {self._requests[request_id]['type']}")
-                    return
-                
-                # Remove request_id from the data before storing result
-                result_data = {k: v for k, v in data.items() if k != 'request_id'}
-                self._results[request_id] = result_data
-                
-                # Set event to signal that result is available
-                if request_id in self._events:
-                    logging.getLogger('WebUI').info(f"Setting event for request: {request_id}")
-                    self._events[request_id].set()
-                else:
-                    logging.getLogger('WebUI').error(f"No event for request: {request_id}")
-                
-                # Send confirmation to client
-                self._socketio.emit(f'selection_received_{request_id}')
-                logging.getLogger('WebUI').info(f"Sent confirmation for request: {request_id}")
+                self._loop.call_soon_threadsafe(self._accept_submission, 'select_option', data)
+                return {"ok": True}
             
             @self._socketio.on('submit_info')
             def handle_info(data):
-                print(f"Received info data: {data}")
-                logging.getLogger('WebUI').info(f"Received info data: {data}")
-                
-                request_id = data.get('request_id')
-                if not request_id:
-                    logging.getLogger('WebUI').error(f"No request_id in info data: {data}")
-                    return
-                    
-                if request_id not in self._requests:
-                    logging.getLogger('WebUI').error(f"Request ID not found: {request_id}")
-                    return
-                    
-                if self._requests[request_id]['type'] != 'request_info':
-                    logging.getLogger('WebUI').error(f"Wrong request type: {self._requests[request_id]['type']}")
-                    return
-                
-                # Store the input text directly
-                self._results[request_id] = data.get('text', '')
-                
-                # Set event to signal that result is available
-                if request_id in self._events:
-                    logging.getLogger('WebUI').info(f"Setting event for request: {request_id}")
-                    self._events[request_id].set()
-                else:
-                    logging.getLogger('WebUI').error(f"No event for request: {request_id}")
-                
-                # Send confirmation to client
-                self._socketio.emit(f'info_received_{request_id}')
-                logging.getLogger('WebUI').info(f"Sent confirmation for request: {request_id}")
+                self._loop.call_soon_threadsafe(self._accept_submission, 'request_info', data)
+                return {"ok": True}
+            
+            @self._socketio.on('submit_answers')
+            def handle_answers(data):
+                self._loop.call_soon_threadsafe(self._accept_submission, 'ask_questions', data)
+                return {"ok": True}
             
             # Start server thread
             def run_server():
                 try:
                     self._socketio.run(self._app, host=self._host, port=self._port, debug=False, use_reloader=False)
                 except Exception as e:
-                    import logging
                     logging.getLogger('WebUI').error(f"Failed to start web server: {e}")
             
             self._server_thread = threading.Thread(target=run_server, daemon=True)
             self._server_thread.start()
-            self._server_running = True
+            self._base_url = f"http://{self._host}:{self._port}"
             
             # Wait for server to start
-            import time
-            time.sleep(1)
+            if not self._wait_until_listening():
+                raise RuntimeError(f"Web server failed to start on port {self._port}")
+            self._server_running = True
         
+        def _wait_until_listening(self, timeout: float = 5.0) -> bool:
+            """
+            Wait until the standalone server accepts connections
+            
+            Args:
+                timeout: Seconds to wait before giving up
+            
+            Returns:
+                Whether the server is accepting connections
+            """
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline and self._server_thread.is_alive():
+                try:
+                    with socket.create_connection((self._host, self._port), timeout=0.5):
+                        return True
+                except OSError:
+                    time.sleep(0.05)
+            return False
+
 # 模板文件已抽离到web_templates目录中，不再在代码中存储
-        
-        def _open_browser(self, path):
+
+        def _open_browser(self, path=""):
             """Open browser to access specified path"""
-            url = f"http://{self._host}:{self._port}{path}"
-            print(f"Opening browser at: {url}")
-            import logging
+            url = f"{self._base_url}{path}"
             logger = logging.getLogger('WebUI')
             logger.info(f"Opening browser at: {url}")
             webbrowser.open(url)
         
+        async def _wait_for_result(self, request_data: Dict[str, Any]) -> Any:
+            """
+            Register a request, push it to the dashboard and wait for the submitted answer.
+            How long to wait is decided by the deadline of the tool call (ui.ui).
+            
+            Args:
+                request_data: Request data rendered by the dashboard
+            
+            Returns:
+                Submitted answer
+            
+            Raises:
+                RequestLimitError: Too many requests are pending
+                RequestExpiredError: Nobody answered within the registry's time to live
+            """
+            self._loop = asyncio.get_running_loop()
+            requested_at = time.perf_counter()
+            
+            # Ensure server is started
+            self._ensure_server()
+            
+            future = self._loop.create_future()
+            request_id = self._registry.open(request_data, future)
+            journal.record("request_opened", ui="web", type=request_data["type"], request_id=request_id)
+            try:
+                if self._has_dashboard():
+                    self._broadcast('new_request', dict(request_data, id=request_id))
+                    observe_render("web", time.perf_counter() - requested_at)
+                else:
+                    # The dashboard picks up pending requests when it connects
+                    self._dashboard_opened_at = time.monotonic()
+                    self._loop.run_in_executor(None, self._open_browser)
+                
+                return await future
+            finally:
+                # Still pending when the tool call stopped waiting (cancelled, deadline)
+                self._registry.close(request_id)
+                entry = self._registry.get(request_id)
+                journal.record("request_closed", ui="web", request_id=request_id, state=entry.state if entry else None)
+                self._broadcast('request_closed', {"id": request_id})
+        
         async def select_option(
             self,
             options: List[Union[str, Dict[str, Any]]],
@@ -239,85 +478,40 @@ else:
         ) -> Dict[str, Any]:
             """
             Present options to the user and get selection using Web interface
-
+            
             Args:
                 options: List of options
                 prompt: Prompt message
                 allow_custom: 已废弃，现在所有选择均默认允许自定义输入
                 ctx: FastMCP context
-
+            
             Returns:
                 Selection result dictionary
             """
-            import logging
             logger = logging.getLogger('WebUI')
             
-            logger.info("select_option called")
-            if not self._web_available:
-                logger.error("Web UI not available")
-                if ctx:
-                    await ctx.error("Flask or Flask-SocketIO not installed, Web interface unavailable")
-                return {
-                    "selected_index": -1,
-                    "selected_option": None,
-                    "custom_input": "Flask or Flask-SocketIO not installed, interface unavailable",
-                    "is_custom": True
-                }
-            
             if ctx:
                 await ctx.info("Displaying options using Web interface...")
             
-            # Ensure server is started
-            self._ensure_server()
-            
-            # Create a unique request ID
-            import uuid
-            request_id = str(uuid.uuid4())
-            logger.info(f"Created request ID: {request_id}")
-            
-            # Create event object for waiting for result
-            event = asyncio.Event()
-            
-            # Store request data and event
-            async with self._request_lock:
-                self._requests[request_id] = {
+            try:
+                result = await self._wait_for_result({
                     "type": "select_option",
                     "options": options,
                     "prompt": prompt,
-                    "allow_custom": True  # 强制允许自定义
-                }
-                self._events[request_id] = event
-                logger.info(f"Stored request data and event for ID: {request_id}")
-            
-            # Open browser with the request ID in the URL
-            asyncio.get_event_loop().run_in_executor(None, self._open_browser, f"/select/{request_id}")
-            
-            # Wait for result
-            logger.info(f"Waiting for event to be set for request ID: {request_id}")
-            try:
-                await asyncio.wait_for(event.wait(), timeout=60)
-                logger.info(f"Event was set for request ID: {request_id}")
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout waiting for selection result for request ID: {request_id}")
+                    "allow_custom": True,  # 强制允许自定义
+                    "allow_remember": get_answer_cache_config()["enabled"]
+                })
+            except RuntimeError as e:
+                logger.error(f"Web UI not available: {e}")
                 if ctx:
-                    await ctx.error("Timeout waiting for selection result")
+                    await ctx.error(str(e))
                 return {
                     "selected_index": -1,
                     "selected_option": None,
-                    "custom_input": "Timeout waiting for selection result",
+                    "custom_input": str(e),
                     "is_custom": True
                 }
             
-            # Get result
-            result = None
-            async with self._request_lock:
-                if request_id in self._results:
-                    result = self._results[request_id]
-                    # Clean up
-                    del self._results[request_id]
-                    del self._requests[request_id]
-                    del self._events[request_id]
-            
             if not result:
                 if ctx:
                     await ctx.error("Failed to get selection result")
@@ -334,7 +528,6 @@ else:
                 else:
                     await ctx.info(f"User selected option {result['selected_index'] + 1}")
             
-            logger.info(f"Returning result from select_option: {result}")
             return result
         
         async def request_additional_info(
@@ -344,75 +537,31 @@ else:
         ) -> str:
             """
             Request supplementary information from the user using Web interface
-
+            
             Args:
                 prompt: Prompt message
                 ctx: FastMCP context
-
+            
             Returns:
                 User input information
             """
-            import logging
             logger = logging.getLogger('WebUI')
             
-            logger.info("request_additional_info called")
-            
-            if not self._web_available:
-                logger.error("Web UI not available")
-                if ctx:
-                    await ctx.error("Flask or Flask-SocketIO not installed, Web interface unavailable")
-                return "Flask or Flask-SocketIO not installed, interface unavailable"
-            
             if ctx:
                 await ctx.info("Requesting supplementary information using Web interface...")
             
-            # Ensure server is started
-            self._ensure_server()
-            
-            # Create a unique request ID
-            import uuid
-            request_id = str(uuid.uuid4())
-            logger.info(f"Created request ID: {request_id}")
-            
-            # Create event object for waiting for result
-            event = asyncio.Event()
-            
-            # Store request data and event
-            async with self._request_lock:
-                self._requests[request_id] = {
-                    "type": "request_info",
-                    "prompt": prompt
-                }
-                self._events[request_id] = event
-                logger.info(f"Stored request data and event for ID: {request_id}")
-            
-            # Open browser with the request ID in the URL
-            asyncio.get_event_loop().run_in_executor(None, self._open_browser, f"/info/{request_id}")
-            
-            # Wait for result
-            logger.info(f"Waiting for event to be set for request ID: {request_id}")
             try:
-                await asyncio.wait_for(event.wait(), timeout=60)
-                logger.info(f"Event was set for request ID: {request_id}")
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout waiting for info result for request ID: {request_id}")
+                result = await self._wait_for_result({
+                    "type": "request_info",
+                    "prompt": prompt,
+                    "allow_remember": get_answer_cache_config()["enabled"],
+                    "allow_history": get_answer_history_config()["enabled"]
+                })
+            except RuntimeError as e:
+                logger.error(f"Web UI not available: {e}")
                 if ctx:
-                    await ctx.error("Timeout waiting for user input")
-                return "Timeout waiting for user input"
-            
-            # Get result
-            result = None
-            async with self._request_lock:
-                if request_id in self._results:
-                    result = self._results[request_id]
-                    logger.info(f"Got result for request ID: {request_id}, result: {result}")
-                    # Clean up
-                    del self._results[request_id]
-                    del self._requests[request_id]
-                    del self._events[request_id]
-                    logger.info(f"Cleaned up request data for ID: {request_id}")
-                else:
-                    logger.error(f"No result found for request ID: {request_id}")
+                    await ctx.error(str(e))
+                return str(e)
             
             if result is None:
                 if ctx:
@@ -422,9 +571,53 @@ else:
             if ctx:
                 await ctx.info("User provided supplementary information")
             
-            logger.info(f"Returning result from request_additional_info: {result}")
             return result
         
+        async def ask_questions(
+            self,
+            questions: List[Dict[str, Any]],
+            ctx: Context = None
+        ) -> List[Any]:
+            """
+            Ask several questions on one dashboard card, answered with a single submit
+            
+            Args:
+                questions: Questions normalized by ui.ui.normalize_questions
+                ctx: FastMCP context
+            
+            Returns:
+                Answers in question order
+            """
+            logger = logging.getLogger('WebUI')
+            
+            if ctx:
+                await ctx.info("Asking questions using Web interface...")
+            
+            try:
+                answers = await self._wait_for_result({
+                    "type": "ask_questions",
+                    "questions": questions
+                })
+            except RuntimeError as e:
+                logger.error(f"Web UI not available: {e}")
+                if ctx:
+                    await ctx.error(str(e))
+                error = str(e)
+                return [
+                    {
+                        "selected_index": -1,
+                        "selected_option": None,
+                        "custom_input": error,
+                        "is_custom": True
+                    } if question["type"] == "select_option" else error
+                    for question in questions
+                ]
+            
+            if ctx:
+                await ctx.info("User answered all questions")
+            
+            return answers
+        
         def cleanup(self):
             """Clean up resources"""
             # Web server will automatically close when program exits
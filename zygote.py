@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pre-fork daemon (zygote) for stdio server launches
+The daemon keeps fastmcp and the UI modules imported. A shim started by the
+IDE hands it its stdin/stdout/stderr over a Unix socket and gets a forked
+worker serving the stdio session, so no session imports anything from scratch.
+Only available where os.fork and socket.send_fds exist (Linux, macOS).
+
+Kept free of third-party imports, the shim runs on every IDE launch.
+"""
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+from typing import Callable, List, Optional
+
+from ui.private_files import check_peer, private_directory
+
+# Message length prefix, followed by a JSON body
+HEADER = struct.Struct(">I")
+
+# Largest launch message accepted (arguments, working directory, environment)
+MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+# Seconds a shim may take to send its launch message, the zygote accepts one connection at a time
+LAUNCH_TIMEOUT = 5.0
+
+PROTOCOL_VERSION = 1
+
+# Entry script of the server (not used when frozen)
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def is_supported() -> bool:
+    """Whether the platform can fork and pass file descriptors"""
+    return hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+
+def default_socket_path() -> str:
+    """Socket path used when none is configured, in the user's private directory"""
+    return os.path.join(private_directory(), "zygote.sock")
+
+
+def resolve_socket_path() -> str:
+    """Socket path from MCP_ZYGOTE_SOCKET, zygote.socket_path in config.json, or the default"""
+    path = os.environ.get("MCP_ZYGOTE_SOCKET")
+    if not path:
+        from config_manager import get_zygote_config
+        path = get_zygote_config()["socket_path"]
+    return path or default_socket_path()
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes, raises ConnectionError on EOF"""
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        data += chunk
+    return data
+
+
+def _send_line(sock: socket.socket, message: dict):
+    """Send a status line to the shim"""
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Shim side
+# ---------------------------------------------------------------------------
+
+def _exec_server(args: List[str]):
+    """Replace the shim with a regular stdio server"""
+    if getattr(sys, 'frozen', False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, MAIN_SCRIPT]
+    command += ["run", "--transport", "stdio"] + args
+    os.execv(command[0], command)
+
+
+def run_shim(args: List[str], socket_path: Optional[str] = None) -> int:
+    """
+    Serve a stdio session through the zygote, or start a regular server when
+    no zygote of the current user is running
+
+    Args:
+        args: Arguments for main.py run, --transport stdio is implied
+        socket_path: Zygote socket path, resolved with resolve_socket_path if None
+
+    Returns:
+        Exit code of the worker
+    """
+    if not is_supported():
+        _exec_server(args)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        socket_path = socket_path or resolve_socket_path()
+        sock.connect(socket_path)
+        # The session's stdio and environment only go to a zygote of the same user
+        check_peer(sock, socket_path)
+    except OSError as e:
+        if isinstance(e, PermissionError):
+            print(f"Not using the zygote: {e}", file=sys.stderr)
+        sock.close()
+        _exec_server(args)
+
+    body = json.dumps({
+        "version": PROTOCOL_VERSION,
+        "args": args,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ)
+    }).encode("utf-8")
+    # The descriptors travel with the length prefix, the body follows
+    socket.send_fds(sock, [HEADER.pack(len(body))], [0, 1, 2])
+    sock.sendall(body)
+
+    # Forward termination to the worker, it owns the session now
+    worker_pid = None
+
+    def forward(sig, frame):
+        if worker_pid is not None:
+            os.kill(worker_pid, sig)
+        else:
+            sys.exit(128 + sig)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    exit_code = 1
+    with sock.makefile("r", encoding="utf-8") as status:
+        for line in status:
+            message = json.loads(line)
+            if "pid" in message:
+                worker_pid = message["pid"]
+            if "exit" in message:
+                exit_code = message["exit"]
+    return exit_code
+
+
+# ---------------------------------------------------------------------------
+# Daemon side
+# ---------------------------------------------------------------------------
+
+def _reap_children(sig, frame):
+    """Collect exited workers"""
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _run_worker(conn: socket.socket, launch: dict, fds: List[int], serve: Callable[[List[str]], int]):
+    """Forked worker: take over the shim's stdio and serve the session, never returns"""
+    exit_code = 1
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        # The inherited stream objects were set up for the daemon's own stdio
+        # (buffering, seekability), open fresh ones on the shim's descriptors
+        for target, name in enumerate(("stdin", "stdout", "stderr")):
+            stream = getattr(sys, name)
+            setattr(sys, name, open(
+                target, "r" if target == 0 else "w",
+                encoding=getattr(stream, "encoding", None) or "utf-8",
+                errors=getattr(stream, "errors", None),
+                buffering=1 if target == 2 else -1,
+                closefd=False
+            ))
+        os.chdir(launch["cwd"])
+        os.environ.clear()
+        os.environ.update(launch["env"])
+        _send_line(conn, {"pid": os.getpid()})
+        exit_code = serve(launch["args"])
+    except BaseException as e:
+        print(f"Zygote worker failed: {e}", file=sys.stderr)
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            _send_line(conn, {"exit": exit_code})
+        except Exception:
+            pass
+        # Skip the daemon's cleanup handlers
+        os._exit(exit_code)
+
+
+def serve_forever(socket_path: str, serve: Callable[[List[str]], int], on_ready: Callable[[], None] = None):
+    """
+    Accept shim connections and fork a worker for each of them
+
+    Args:
+        socket_path: Path of the Unix socket to listen on
+        serve: Runs a stdio session in the worker with the given run arguments,
+            returns the exit code. Called after the fork.
+        on_ready: Called once the socket is listening
+    """
+    if not is_supported():
+        raise RuntimeError("The zygote needs os.fork and socket.send_fds (Linux or macOS)")
+
+    if os.path.exists(socket_path):
+        # Refuse to take over a live zygote, remove a stale socket
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            probe.close()
+            raise RuntimeError(f"A zygote is already listening on {socket_path}")
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Bound with mode 0600, other users cannot connect between bind and a chmod
+    umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(umask)
+    server.listen(16)
+    signal.signal(signal.SIGCHLD, _reap_children)
+    # Leave through the finally block below so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda sig, frame: sys.exit(0))
+    if on_ready:
+        on_ready()
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            # A stalled shim must not hold up the launches behind it
+            conn.settimeout(LAUNCH_TIMEOUT)
+            fds = []
+            try:
+                header, fds, _, _ = socket.recv_fds(conn, HEADER.size, 3)
+                if len(header) < HEADER.size:
+                    header += _recv_exact(conn, HEADER.size - len(header))
+                (length,) = HEADER.unpack(header)
+                if length > MAX_MESSAGE_SIZE or len(fds) != 3:
+                    raise ValueError("Invalid launch message")
+                launch = json.loads(_recv_exact(conn, length).decode("utf-8"))
+                if launch.get("version") != PROTOCOL_VERSION:
+                    raise ValueError(f"Unsupported shim version {launch.get('version')}")
+                conn.settimeout(None)
+            except (OSError, ValueError) as e:
+                # socket.timeout is an OSError
+                print(f"Rejected zygote connection: {e}", file=sys.stderr)
+                for fd in fds:
+                    os.close(fd)
+                conn.close()
+                continue
+
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                _run_worker(conn, launch, fds, serve)
+
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)